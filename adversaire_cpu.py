@@ -0,0 +1,127 @@
+import math
+import random
+import logging
+from dataclasses import dataclass, field
+from etats import EtatMutable
+from regles_tennis_table import obtenir_parametres_cpu
+
+logger = logging.getLogger('tennis_table')
+
+@dataclass(slots=True, eq=False)
+class AdversaireCpu(EtatMutable):
+    regles: dict = field(repr=False)
+    nom_raquette: str
+    joueur: int
+    niveau: int
+    delai_reaction: float
+    erreur_visee: float
+    delai_service: int
+    trajectoire: int = -1
+    y_cible: float = None
+    temps_changement: int = None
+    debut_attente_service: int = None
+    predictions: int = 0
+    generateur: random.Random = field(default=None, repr=False)
+
+def creer_adversaire_cpu(regles, niveau, nom_raquette='raquette_bleue', generateur=None):
+    """Adversaire contrôlé par l'ordinateur pour la raquette `nom_raquette`"""
+    try:
+        parametres = obtenir_parametres_cpu(regles, niveau)
+        adversaire = AdversaireCpu(
+            regles=regles,
+            nom_raquette=nom_raquette,
+            joueur=2 if nom_raquette == 'raquette_bleue' else 1,
+            niveau=niveau,
+            delai_reaction=parametres['delai_reaction'],
+            erreur_visee=parametres['erreur_visee'],
+            delai_service=regles['DELAI_SERVICE_CPU'],
+            generateur=generateur or random.Random()
+        )
+        logger.debug("Adversaire CPU créé: %s", adversaire)
+        return adversaire
+    except Exception as e:
+        logger.error("Erreur lors de la création de l'adversaire CPU: %s", e, exc_info=True)
+        raise
+
+def position_y_apres(y, dy, images, hauteur):
+    """Position verticale de la balle après `images` appels entiers à balle.deplacer.
+
+    deplacer ramène la balle exactement sur le bord à chaque rebond: après le premier
+    rebond, la balle va d'un bord à l'autre en floor(hauteur / |dy|) + 1 images."""
+    if dy == 0 or images <= 0:
+        return y
+
+    vitesse = abs(dy)
+    if dy > 0:
+        avant_rebond = math.floor((hauteur - y) / vitesse) + 1
+        bord, sens = hauteur, -1
+    else:
+        avant_rebond = math.floor(y / vitesse) + 1
+        bord, sens = 0, 1
+    if images < avant_rebond:
+        return y + images * dy
+
+    traversees, reste = divmod(images - avant_rebond, math.floor(hauteur / vitesse) + 1)
+    if traversees % 2:
+        bord, sens = hauteur - bord, -sens
+    return bord + sens * reste * vitesse
+
+def predire_interception(balle, x_interception, hauteur):
+    """Ordonnée du centre de la balle lorsqu'elle atteindra x_interception, ou None
+    si elle ne s'en approche pas. Calcul en forme close, rebonds compris."""
+    if balle.dx == 0 or (x_interception - balle.x) * balle.dx <= 0:
+        return None
+
+    images = (x_interception - balle.x) / balle.dx
+    entieres = math.floor(images)
+    y_avant = position_y_apres(balle.y, balle.dy, entieres, hauteur)
+    y_apres = position_y_apres(balle.y, balle.dy, entieres + 1, hauteur)
+    return y_avant + (y_apres - y_avant) * (images - entieres)
+
+def calculer_cible(adversaire, raquette, balle):
+    """Nouvelle ordonnée visée par la zone de frappe après un changement de trajectoire"""
+    regles = adversaire.regles
+    zone = raquette.zone_collision
+    repos = raquette.y_initial + (zone.y - raquette.rect.y) + zone.height / 2
+    if balle.au_service:
+        return repos
+
+    if raquette.est_raquette_gauche:
+        x_interception = zone.right + balle.rayon
+    else:
+        x_interception = zone.left - balle.rayon
+    y_impact = predire_interception(balle, x_interception, regles['HAUTEUR_FENETRE'])
+    adversaire.predictions += 1
+    if y_impact is None:
+        return repos
+    return y_impact + adversaire.generateur.uniform(-adversaire.erreur_visee, adversaire.erreur_visee)
+
+def piloter(adversaire, raquette, balle, serveur_actuel, temps_actuel):
+    """Choisir le déplacement de la raquette CPU pour ce pas et s'il faut servir.
+
+    La prédiction n'est recalculée que lorsque la trajectoire de la balle change
+    (frappe ou service); entre deux, le coût par pas se limite à une comparaison."""
+    try:
+        if balle.trajectoire != adversaire.trajectoire:
+            adversaire.trajectoire = balle.trajectoire
+            adversaire.y_cible = calculer_cible(adversaire, raquette, balle)
+            adversaire.temps_changement = temps_actuel
+            logger.debug("CPU: nouvelle cible %s", adversaire.y_cible)
+
+        doit_servir = False
+        if balle.au_service and serveur_actuel == adversaire.joueur:
+            if adversaire.debut_attente_service is None:
+                adversaire.debut_attente_service = temps_actuel
+            doit_servir = temps_actuel - adversaire.debut_attente_service >= adversaire.delai_service
+        else:
+            adversaire.debut_attente_service = None
+
+        dy = 0
+        if temps_actuel - adversaire.temps_changement >= adversaire.delai_reaction:
+            ecart = adversaire.y_cible - raquette.zone_collision.centery
+            if abs(ecart) > raquette.vitesse / 2:
+                dy = 1 if ecart > 0 else -1
+        return dy, doit_servir
+    except Exception as e:
+        logger.error("Erreur lors du pilotage de l'adversaire CPU: %s", e, exc_info=True)
+        return 0, False
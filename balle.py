@@ -1,254 +1,271 @@
 import pygame
 import math
-import random
 import time
+import random
 import logging
+from dataclasses import dataclass, field
+from etats import EtatMutable
 from regles_tennis_table import creer_regles
 
 logger = logging.getLogger('tennis_table')
 
-def creer_balle(vitesse=None):
+@dataclass(slots=True, eq=False)
+class Balle(EtatMutable):
+    regles: dict = field(repr=False)
+    rayon: int
+    couleur: tuple
+    vitesse: float
+    x: float
+    y: float
+    au_service: bool = True
+    active: bool = True
+    etat: str = None
+    dx: float = 0
+    dy: float = 0
+    # Liste des événements sonores de file_audio, vidée par distribuer_sons (None: muet)
+    evenements_audio: list = field(default=None, repr=False)
+    cible_x: float = None
+    cible_y: float = None
+    service_depuis_gauche: bool = None
+    x_precedent: float = None
+    y_precedent: float = None
+    fraction_rebond: float = None
+    # Incrémenté à chaque changement de trajectoire hors rebonds (service, frappe)
+    trajectoire: int = 0
+    # Flux aléatoire du match (random.Random), partagé avec les autres états
+    generateur: random.Random = field(default=None, repr=False)
+
+def creer_balle(vitesse=None, regles=None, generateur=None):
     try:
-        regles = creer_regles()
+        regles = regles or creer_regles()
         vitesse = vitesse if vitesse is not None else regles['VITESSE_BALLE_MIN']
-        logger.debug(f"Création d'une nouvelle balle avec vitesse={vitesse}")
+        logger.debug("Création d'une nouvelle balle avec vitesse=%s", vitesse)
         
-        balle = {
-            'regles': regles,
-            'rayon': regles['RAYON_BALLE'],
-            'couleur': regles['BLANC'],
-            'vitesse': vitesse,
-            'x': regles['LARGEUR_FENETRE'] // 2,
-            'y': regles['HAUTEUR_FENETRE'] // 2,
-            'au_service': True,
-            'active': True,
-            'etat': regles['ETATS_JEU']['PRET_A_SERVIR'],
-            'dx': 0,
-            'dy': 0,
-            'son_coup_gauche': None,
-            'son_coup_droit': None,
-            'son_service': None,
-            'cible_x': None,
-            'cible_y': None
-        }
+        x = regles['LARGEUR_FENETRE'] // 2
+        y = regles['HAUTEUR_FENETRE'] // 2
+        balle = Balle(
+            regles=regles,
+            rayon=regles['RAYON_BALLE'],
+            couleur=regles['BLANC'],
+            vitesse=vitesse,
+            x=x,
+            y=y,
+            etat=regles['ETATS_JEU']['PRET_A_SERVIR'],
+            x_precedent=x,
+            y_precedent=y,
+            generateur=generateur or random.Random()
+        )
         
-        logger.debug(f"Balle créée: {balle}")
+        logger.debug("Balle créée: %s", balle)
         return balle
     except Exception as e:
-        logger.error(f"Erreur lors de la création de la balle: {e}", exc_info=True)
+        logger.error("Erreur lors de la création de la balle: %s", e, exc_info=True)
         raise RuntimeError("Impossible de créer la balle") from e
 
-def definir_sons(balle, son_gauche, son_droit, son_service):
+def definir_file_audio(balle, file_audio):
     try:
-        if not isinstance(balle, dict):
-            raise ValueError("La balle doit être un dictionnaire")
+        if not isinstance(balle, Balle):
+            raise ValueError("La balle doit être une Balle")
             
-        nouvelle_balle = {
-            **balle,
-            'son_coup_gauche': son_gauche,
-            'son_coup_droit': son_droit,
-            'son_service': son_service
-        }
-        logger.debug("Sons de la balle définis")
-        return nouvelle_balle
+        balle.evenements_audio = file_audio['evenements'] if file_audio else None
+        logger.debug("File audio de la balle définie")
+        return balle
     except Exception as e:
-        logger.error(f"Erreur lors de la définition des sons: {e}", exc_info=True)
+        logger.error("Erreur lors de la définition de la file audio: %s", e, exc_info=True)
         return balle 
+
+def emettre_son(balle, nom):
+    """Signaler un son; il est joué par distribuer_sons, hors de la mise à jour physique"""
+    if balle.evenements_audio is not None:
+        balle.evenements_audio.append((nom, balle.x, time.perf_counter()))
     
 def reinitialiser(balle):
     try:
         logger.debug("Réinitialisation de la balle")
-        if not isinstance(balle, dict) or 'regles' not in balle:
+        if not isinstance(balle, Balle):
             raise ValueError("Balle invalide")
 
-        regles = balle['regles']
-        nouvelle_balle = {
-            **balle,
-            'x': regles['LARGEUR_FENETRE'] // 2,
-            'y': regles['HAUTEUR_FENETRE'] // 2,
-            'dx': 0,
-            'dy': 0,
-            'au_service': True,
-            'active': True,
-            'etat': regles['ETATS_JEU']['PRET_A_SERVIR'],
-            'cible_x': None,
-            'cible_y': None
-        }
-        logger.debug(f"Balle réinitialisée: {nouvelle_balle}")
-        return nouvelle_balle
+        regles = balle.regles
+        balle.x = balle.x_precedent = regles['LARGEUR_FENETRE'] // 2
+        balle.y = balle.y_precedent = regles['HAUTEUR_FENETRE'] // 2
+        balle.dx = 0
+        balle.dy = 0
+        balle.au_service = True
+        balle.active = True
+        balle.etat = regles['ETATS_JEU']['PRET_A_SERVIR']
+        balle.cible_x = None
+        balle.cible_y = None
+        balle.fraction_rebond = None
+        balle.trajectoire += 1
+        logger.debug("Balle réinitialisée: %s", balle)
+        return balle
     except Exception as e:
-        logger.error(f"Erreur lors de la réinitialisation de la balle: {e}", exc_info=True)
+        logger.error("Erreur lors de la réinitialisation de la balle: %s", e, exc_info=True)
         return balle
 
 def servir(balle, serveur):
     try:
-        logger.debug(f"Service par joueur {serveur}")
-        if not isinstance(balle, dict) or not isinstance(serveur, int):
+        logger.debug("Service par joueur %s", serveur)
+        if not isinstance(balle, Balle) or not isinstance(serveur, int):
             raise ValueError("Paramètres invalides pour le service")
         if serveur not in [1, 2]:
             raise ValueError("Numéro de serveur invalide")
 
-        regles = balle['regles']
-        nouvelle_balle = {
-            **balle,
-            'au_service': True,
-            'active': True,
-            'etat': regles['ETATS_JEU']['SERVICE_COMMENCE'],
-            'dy': 0,
-            'dx': 0,
-            'y': regles['HAUTEUR_FENETRE'] // 2
-        }
+        regles = balle.regles
+        balle.au_service = True
+        balle.active = True
+        balle.etat = regles['ETATS_JEU']['SERVICE_COMMENCE']
+        balle.dy = 0
+        balle.dx = 0
+        balle.y = regles['HAUTEUR_FENETRE'] // 2
+        balle.fraction_rebond = None
 
         if serveur == 1:
-            nouvelle_balle['x'] = regles['TABLE_X'] + 30
+            balle.x = regles['TABLE_X'] + 30
             est_gauche = True
             logger.debug("Service depuis la gauche")
         else:
-            nouvelle_balle['x'] = regles['TABLE_X'] + regles['LARGEUR_TABLE_PIXELS'] - 30
+            balle.x = regles['TABLE_X'] + regles['LARGEUR_TABLE_PIXELS'] - 30
             est_gauche = False
             logger.debug("Service depuis la droite")
+        balle.x_precedent = balle.x
+        balle.y_precedent = balle.y
 
         try:
-            cible_x, cible_y = definir_cible_aleatoire(nouvelle_balle, est_gauche)
-            nouvelle_balle.update({
-                'cible_x': cible_x,
-                'cible_y': cible_y,
-                'service_depuis_gauche': est_gauche
-            })
+            balle.cible_x, balle.cible_y = definir_cible_aleatoire(balle, est_gauche)
         except Exception as e:
-            logger.error(f"Erreur lors de la définition de la cible: {e}")
-            nouvelle_balle.update({
-                'cible_x': regles['LARGEUR_FENETRE'] // 2,
-                'cible_y': regles['HAUTEUR_FENETRE'] // 2,
-                'service_depuis_gauche': est_gauche
-            })
+            logger.error("Erreur lors de la définition de la cible: %s", e)
+            balle.cible_x = regles['LARGEUR_FENETRE'] // 2
+            balle.cible_y = regles['HAUTEUR_FENETRE'] // 2
+        balle.service_depuis_gauche = est_gauche
+        balle.trajectoire += 1
 
-        logger.debug(f"Nouvelle balle après service: {nouvelle_balle}")
-        return nouvelle_balle
+        logger.debug("Nouvelle balle après service: %s", balle)
+        return balle
 
     except Exception as e:
-        logger.error(f"Erreur lors du service: {e}", exc_info=True)
+        logger.error("Erreur lors du service: %s", e, exc_info=True)
         return balle
 
 def definir_cible_aleatoire(balle, est_joueur_gauche):
     try:
-        logger.debug(f"Calcul cible aléatoire (depuis gauche: {est_joueur_gauche})")
-        temps_actuel = time.time()
-        random.seed(temps_actuel)
-        regles = balle['regles']
+        logger.debug("Calcul cible aléatoire (depuis gauche: %s)", est_joueur_gauche)
+        regles = balle.regles
 
         if est_joueur_gauche:
             cible_x = regles['TABLE_X'] + (regles['LARGEUR_TABLE_PIXELS'] * 3/4)
         else:
             cible_x = regles['TABLE_X'] + (regles['LARGEUR_TABLE_PIXELS'] * 1/4)
                 
-        cible_y = random.uniform(regles['TABLE_Y'], 
+        cible_y = balle.generateur.uniform(regles['TABLE_Y'], 
                                regles['TABLE_Y'] + regles['HAUTEUR_TABLE'])
                                
-        logger.debug(f"Cible calculée: ({cible_x}, {cible_y})")
+        logger.debug("Cible calculée: (%s, %s)", cible_x, cible_y)
         return cible_x, cible_y
     except Exception as e:
-        logger.error(f"Erreur lors du calcul de la cible: {e}", exc_info=True)
+        logger.error("Erreur lors du calcul de la cible: %s", e, exc_info=True)
         raise
 
 def deplacer(balle):
-    if not balle['active']:
+    if not balle.active:
         return balle, False
 
     try:
-        nouvelle_balle = {
-            **balle,
-            'x': balle['x'] + balle['dx'],
-            'y': balle['y'] + balle['dy']
-        }
-
-        if nouvelle_balle['x'] < 0 or nouvelle_balle['x'] > nouvelle_balle['regles']['LARGEUR_FENETRE']:
-            nouvelle_balle['active'] = False
-            nouvelle_balle['etat'] = nouvelle_balle['regles']['ETATS_JEU']['POINT_TERMINE']
+        regles = balle.regles
+        balle.x_precedent = balle.x
+        balle.y_precedent = balle.y
+        balle.fraction_rebond = None
+        balle.x += balle.dx
+        balle.y += balle.dy
+
+        if balle.x < 0 or balle.x > regles['LARGEUR_FENETRE']:
+            balle.active = False
+            balle.etat = regles['ETATS_JEU']['POINT_TERMINE']
             logger.debug("Point terminé: balle hors limites")
-            return nouvelle_balle, True
+            return balle, True
 
-        if nouvelle_balle['y'] < 0:
-            nouvelle_balle['y'] = 0
-            nouvelle_balle['dy'] = abs(nouvelle_balle['dy'])
+        if balle.y < 0:
+            balle.fraction_rebond = -balle.y_precedent / balle.dy
+            balle.y = 0
+            balle.dy = abs(balle.dy)
             logger.debug("Collision avec le haut")
-        elif nouvelle_balle['y'] > nouvelle_balle['regles']['HAUTEUR_FENETRE']:
-            nouvelle_balle['y'] = nouvelle_balle['regles']['HAUTEUR_FENETRE']
-            nouvelle_balle['dy'] = -abs(nouvelle_balle['dy'])
+        elif balle.y > regles['HAUTEUR_FENETRE']:
+            balle.fraction_rebond = (regles['HAUTEUR_FENETRE'] - balle.y_precedent) / balle.dy
+            balle.y = regles['HAUTEUR_FENETRE']
+            balle.dy = -abs(balle.dy)
             logger.debug("Collision avec le bas")
 
-        nouvelle_balle['etat'] = nouvelle_balle['regles']['ETATS_JEU']['ECHANGE']
-        return nouvelle_balle, False
+        balle.etat = regles['ETATS_JEU']['ECHANGE']
+        return balle, False
 
     except Exception as e:
-        logger.error(f"Erreur lors du déplacement de la balle: {e}", exc_info=True)
+        logger.error("Erreur lors du déplacement de la balle: %s", e, exc_info=True)
         return balle, False
     
-def gerer_collision_raquette(balle, raquette, position_impact):
+def gerer_collision_raquette(balle, raquette, impact):
+    """Renvoyer la balle depuis l'impact donné par raquette.verifier_collision_balle: la
+    balle est placée au contact, poussée hors de la zone le long de la normale, et la
+    position de l'impact dans la zone de frappe donne le multiplicateur de vitesse"""
     try:
-        logger.debug(f"Collision avec raquette à la position relative {position_impact}")
+        position_impact = impact['position_impact']
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Collision avec raquette à la position relative %s", position_impact)
+
+        contact_x, contact_y = impact['point_contact']
+        normale_x, normale_y = impact['normale']
+        balle.x = contact_x + normale_x * balle.rayon
+        balle.y = min(max(contact_y + normale_y * balle.rayon, 0), balle.regles['HAUTEUR_FENETRE'])
         
         try:
-            cible_x, cible_y = definir_cible_aleatoire(balle, raquette['est_raquette_gauche'])
+            cible_x, cible_y = definir_cible_aleatoire(balle, raquette.est_raquette_gauche)
         except Exception as e:
-            logger.error(f"Erreur lors du calcul de la nouvelle cible: {e}")
-            cible_x = raquette['est_raquette_gauche'] and balle['regles']['LARGEUR_FENETRE'] - 50 or 50
-            cible_y = balle['regles']['HAUTEUR_FENETRE'] // 2
+            logger.error("Erreur lors du calcul de la nouvelle cible: %s", e)
+            cible_x = raquette.est_raquette_gauche and balle.regles['LARGEUR_FENETRE'] - 50 or 50
+            cible_y = balle.regles['HAUTEUR_FENETRE'] // 2
         
         try:
-            if balle['x'] is not None and balle['y'] is not None and cible_x is not None and cible_y is not None:
-                angle = math.atan2(cible_y - balle['y'], cible_x - balle['x'])
-                logger.debug(f"Angle calculé: {angle}")
+            if balle.x is not None and balle.y is not None and cible_x is not None and cible_y is not None:
+                angle = math.atan2(cible_y - balle.y, cible_x - balle.x)
+                if debug:
+                    logger.debug("Angle calculé: %s", angle)
             else:
-                angle = 0 if raquette['est_raquette_gauche'] else math.pi
-                logger.debug(f"Angle par défaut utilisé: {angle}")
+                angle = 0 if raquette.est_raquette_gauche else math.pi
+                logger.debug("Angle par défaut utilisé: %s", angle)
         except Exception as e:
-            logger.error(f"Erreur lors du calcul de l'angle: {e}")
-            angle = 0 if raquette['est_raquette_gauche'] else math.pi
-
-        position_relative = (balle['y'] - raquette['rect'].top) / raquette['rect'].height
-        multiplicateur_vitesse_impact = 1 + abs(position_relative - 0.5)
-        vitesse_finale = balle['vitesse'] * multiplicateur_vitesse_impact
-
-        nouvelle_balle = {
-            **balle,
-            'au_service': False,
-            'etat': balle['regles']['ETATS_JEU']['ECHANGE'],
-            'dx': math.cos(angle) * vitesse_finale,
-            'dy': math.sin(angle) * vitesse_finale,
-            'cible_x': cible_x,
-            'cible_y': cible_y
-        }
-
-        if raquette['est_raquette_gauche']:
-            nouvelle_balle['x'] = raquette['rect'].right + nouvelle_balle['rayon']
-            if nouvelle_balle['son_coup_gauche']:
-                try:
-                    nouvelle_balle['son_coup_gauche'].play()
-                except Exception as e:
-                    logger.error(f"Erreur lors de la lecture du son gauche: {e}")
-        else:
-            nouvelle_balle['x'] = raquette['rect'].left - nouvelle_balle['rayon']
-            if nouvelle_balle['son_coup_droit']:
-                try:
-                    nouvelle_balle['son_coup_droit'].play()
-                except Exception as e:
-                    logger.error(f"Erreur lors de la lecture du son droit: {e}")
+            logger.error("Erreur lors du calcul de l'angle: %s", e)
+            angle = 0 if raquette.est_raquette_gauche else math.pi
 
-        logger.debug(f"Nouvelle balle après collision: {nouvelle_balle}")
-        return nouvelle_balle
+        multiplicateur_vitesse_impact = 1 + abs(position_impact - 0.5)
+        vitesse_finale = balle.vitesse * multiplicateur_vitesse_impact
+
+        balle.au_service = False
+        balle.etat = balle.regles['ETATS_JEU']['ECHANGE']
+        balle.dx = math.cos(angle) * vitesse_finale
+        balle.dy = math.sin(angle) * vitesse_finale
+        balle.cible_x = cible_x
+        balle.cible_y = cible_y
+        balle.trajectoire += 1
+
+        emettre_son(balle, 'coup_gauche' if raquette.est_raquette_gauche else 'coup_droit')
+
+        if debug:
+            logger.debug("Nouvelle balle après collision: %s", balle)
+        return balle
 
     except Exception as e:
-        logger.error(f"Erreur lors de la gestion de la collision: {e}", exc_info=True)
+        logger.error("Erreur lors de la gestion de la collision: %s", e, exc_info=True)
         return balle
 
 def dessiner(balle, ecran):
+    """Dessiner la balle et retourner la zone touchée"""
     try:
-        pygame.draw.circle(
+        return pygame.draw.circle(
             ecran, 
-            balle['couleur'], 
-            (int(balle['x']), int(balle['y'])), 
-            balle['rayon']
+            balle.couleur, 
+            (int(balle.x), int(balle.y)), 
+            balle.rayon
         )
     except Exception as e:
-        logger.error(f"Erreur lors du dessin de la balle: {e}", exc_info=True)
+        logger.error("Erreur lors du dessin de la balle: %s", e, exc_info=True)
+        return None
@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from regles_tennis_table import creer_regles
+from main import initialiser_objets_jeu, mettre_a_jour_jeu
+from simulation import creer_source_suiveuse
+
+def preparer(regles):
+    etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MIN'], {'sons': {}, 'images': {}}, regles, graine=1)
+    return etat_jeu, creer_source_suiveuse(regles)
+
+def mesurer_allocations(images=2000):
+    """Pic de mémoire alloué par mettre_a_jour_jeu, image par image, sous tracemalloc"""
+    regles = creer_regles()
+    etat_jeu, source = preparer(regles)
+    pas_ms = 1000 / regles['IPS_PHYSIQUE']
+
+    tracemalloc.start()
+    pics = []
+    debut_total, _ = tracemalloc.get_traced_memory()
+    for image in range(images):
+        touches = source(etat_jeu, image)
+        tracemalloc.reset_peak()
+        avant, _ = tracemalloc.get_traced_memory()
+        etat_jeu = mettre_a_jour_jeu(etat_jeu, touches, round(image * pas_ms))
+        _, pic = tracemalloc.get_traced_memory()
+        pics.append(pic - avant)
+    fin_total, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    pics.sort()
+    return {
+        'pic_median': pics[len(pics) // 2],
+        'pic_p99': pics[int(len(pics) * 0.99)],
+        'retenu_par_image': (fin_total - debut_total) / images
+    }
+
+def mesurer_duree(images=20000):
+    regles = creer_regles()
+    etat_jeu, source = preparer(regles)
+    pas_ms = 1000 / regles['IPS_PHYSIQUE']
+    debut = time.perf_counter()
+    for image in range(images):
+        etat_jeu = mettre_a_jour_jeu(etat_jeu, source(etat_jeu, image), round(image * pas_ms))
+    return (time.perf_counter() - debut) / images
+
+def main():
+    pygame.font.init()
+    allocations = mesurer_allocations()
+    duree = mesurer_duree()
+    print(f"mettre_a_jour_jeu: pic médian {allocations['pic_median']} o/image, "
+          f"p99 {allocations['pic_p99']} o/image, "
+          f"retenu {allocations['retenu_par_image']:.1f} o/image, "
+          f"{duree * 1e6:.1f} µs/image")
+
+if __name__ == "__main__":
+    main()
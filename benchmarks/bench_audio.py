@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import timeit
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RACINE)
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from regles_tennis_table import creer_regles
+from main import charger_ressources, initialiser_objets_jeu, mettre_a_jour_jeu
+from simulation import creer_source_suiveuse
+from file_audio import distribuer_sons, obtenir_statistiques_audio
+
+def mesurer(regles, tampon, pas=3600, pas_par_image=1):
+    """Latence entre l'émission d'un son par la physique et l'appel à play()"""
+    pygame.mixer.pre_init(regles['FREQUENCE_AUDIO'], -16, 2, tampon)
+    pygame.init()
+    pygame.mixer.init()
+    ressources = charger_ressources(regles)
+    etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MAX'], ressources, regles, graine=1)
+    source = creer_source_suiveuse(regles)
+
+    duree_distribution = 0.0
+    for numero_pas in range(pas):
+        etat_jeu = mettre_a_jour_jeu(etat_jeu, source(etat_jeu, numero_pas), numero_pas * 1000 // 60)
+        if numero_pas % pas_par_image == 0:
+            debut = time.perf_counter()
+            distribuer_sons(etat_jeu['file_audio'])
+            duree_distribution += time.perf_counter() - debut
+    statistiques = obtenir_statistiques_audio(etat_jeu['file_audio'])
+
+    # Ancien chemin: Sound.play() appelé directement dans la physique, canal quelconque
+    son = ressources['sons']['coup_gauche']
+    lecture_directe = min(timeit.repeat(son.play, number=200, repeat=5)) / 200
+    pygame.mixer.stop()
+    pygame.quit()
+    return statistiques, duree_distribution / (pas // pas_par_image), lecture_directe
+
+def main():
+    os.chdir(RACINE)
+    # La simulation va plus vite que le temps réel: sans cet intervalle nul, presque
+    # tous les coups tomberaient dans la fenêtre de fusion INTERVALLE_MIN_SON
+    regles = {**creer_regles(), 'INTERVALLE_MIN_SON': 0}
+    for tampon in (256, 512, 1024):
+        for pas_par_image in (1, 3):
+            statistiques, distribution, lecture_directe = mesurer(regles, tampon, pas_par_image=pas_par_image)
+            print(f"tampon {tampon:>4} ({tampon * 1000 / regles['FREQUENCE_AUDIO']:4.1f} ms), "
+                  f"{pas_par_image} pas/image: {statistiques['joues']} sons joués, "
+                  f"{statistiques['fusionnes']} fusionnés, latence médiane "
+                  f"{statistiques['latence_mediane_ms'] * 1000:.0f} µs, p99 "
+                  f"{statistiques['latence_p99_ms'] * 1000:.0f} µs; distribution "
+                  f"{distribution * 1e6:.1f} µs/image, Sound.play() direct {lecture_directe * 1e6:.1f} µs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from raquette import creer_raquette, verifier_collision_balle
+from balle import creer_balle
+
+def collision_rect(raquette, balle):
+    """Ancien test discret: un pygame.Rect alloué à chaque appel puis colliderect"""
+    rayon = balle.rayon
+    balle_rect = pygame.Rect(balle.x - rayon, balle.y - rayon, rayon * 2, rayon * 2)
+    return raquette.zone_collision.colliderect(balle_rect)
+
+def creer_balle_en(x, y, x_precedent, y_precedent):
+    balle = creer_balle()
+    balle.rayon = 10
+    # Positions flottantes, comme en jeu après quelques pas
+    balle.x, balle.y = float(x), float(y)
+    balle.x_precedent, balle.y_precedent = float(x_precedent), float(y_precedent)
+    return balle
+
+def main(repetitions=200_000):
+    raquette = creer_raquette(50, 250, 12)
+    zone = raquette.zone_collision
+    cas = {
+        'loin': creer_balle_en(600, 300, 592, 303),
+        'proche': creer_balle_en(zone.right + 30, zone.centery, zone.right + 45, zone.centery),
+        'contact': creer_balle_en(zone.right + 2, zone.centery, zone.right + 20, zone.centery)
+    }
+    for nom, balle in cas.items():
+        ancien = min(timeit.repeat(lambda: collision_rect(raquette, balle), number=repetitions, repeat=5))
+        nouveau = min(timeit.repeat(lambda: verifier_collision_balle(raquette, balle, 10_000),
+                                    number=repetitions, repeat=5))
+        print(f"{nom:>8}: rect+colliderect {ancien / repetitions * 1e9:6.0f} ns, "
+              f"test continu {nouveau / repetitions * 1e9:6.0f} ns")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import os
+import sys
+import shutil
+import tempfile
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RACINE)
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+import cache_ressources
+from main import initialiser_jeu, boucle_selection_difficulte, attendre_ressources
+
+def mesurer_premiere_image(chargement_asynchrone):
+    """Temps entre le début d'initialiser_jeu et la première image du menu, en ms"""
+    etat_global = initialiser_jeu(chargement_asynchrone)
+    # ENTRÉE déjà dans la file: le menu s'affiche une fois puis se ferme
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN))
+    boucle_selection_difficulte(etat_global)
+    attendre_ressources(etat_global['ressources'])
+    pygame.quit()
+    return etat_global['temps_premiere_image'] * 1000
+
+def main(repetitions=5):
+    os.chdir(RACINE)
+    dossier_origine = cache_ressources.DOSSIER_CACHE
+    for cache in ('froid', 'chaud'):
+        for chargement_asynchrone in (False, True):
+            mesures = []
+            for _ in range(repetitions):
+                dossier = tempfile.mkdtemp(prefix='cache_ressources_') if cache == 'froid' else dossier_origine
+                cache_ressources.DOSSIER_CACHE = dossier
+                try:
+                    mesures.append(mesurer_premiere_image(chargement_asynchrone))
+                finally:
+                    if cache == 'froid':
+                        shutil.rmtree(dossier, ignore_errors=True)
+            cache_ressources.DOSSIER_CACHE = dossier_origine
+            print(f"cache {cache}, chargement {'en arrière-plan' if chargement_asynchrone else 'bloquant'}: "
+                  f"première image en {sorted(mesures)[len(mesures) // 2]:.1f} ms (médiane)")
+
+if __name__ == "__main__":
+    main()
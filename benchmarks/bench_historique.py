@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import tempfile
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RACINE)
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from regles_tennis_table import creer_regles
+from main import initialiser_objets_jeu
+from historique_matchs import (ouvrir_historique, commencer_match, ajouter_point, fermer_historique,
+                               connecter, initialiser_base, REQUETES)
+
+def centiles(durees):
+    durees = sorted(durees)
+    return (durees[len(durees) // 2] * 1e6, durees[int(len(durees) * 0.99)] * 1e6, durees[-1] * 1e6)
+
+def mesurer_depot(regles, dossier, points=20000, intervalle=0.0):
+    """Coût, pour le thread de jeu, d'un point déposé dans la file (point et échange).
+
+    Sans intervalle, les points arrivent sans pause et l'écrivain dispute le GIL au
+    thread de jeu; avec un intervalle, le rythme se rapproche d'une vraie partie."""
+    etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MIN'], {'sons': {}, 'images': {}}, regles, graine=1)
+    historique = ouvrir_historique(os.path.join(dossier, f'depot_{points}.sqlite3'))
+    commencer_match(historique, 1, regles['MODES_JEU']['SIMPLE'], 1, regles['VITESSE_BALLE_MIN'])
+    durees = []
+    for numero in range(points):
+        debut = time.perf_counter()
+        ajouter_point(historique, etat_jeu, 1 + numero % 2, 1, numero * 1000)
+        durees.append(time.perf_counter() - debut)
+        if intervalle:
+            time.sleep(intervalle)
+    debut = time.perf_counter()
+    fermer_historique(historique, delai=60)
+    vidage = time.perf_counter() - debut
+    return centiles(durees), vidage, historique['ecrivain'].lots
+
+def mesurer_ecriture_directe(regles, dossier, points=500):
+    """Ancienne approche évitée: une transaction par point, dans le thread de jeu"""
+    connexion = connecter(os.path.join(dossier, 'direct.sqlite3'))
+    initialiser_base(connexion)
+    with connexion:
+        connexion.execute(REQUETES['match'], ('direct', time.time(), 1, regles['MODES_JEU']['SIMPLE'], 1, 7.0))
+    durees = []
+    for numero in range(points):
+        debut = time.perf_counter()
+        with connexion:
+            connexion.execute(REQUETES['point'], ('direct', numero, 1, 1, 1, 0, 0, numero * 1000))
+            connexion.execute(REQUETES['echange'], ('direct', numero, 1000, 4, 8.0))
+        durees.append(time.perf_counter() - debut)
+    connexion.close()
+    return centiles(durees)
+
+def main():
+    pygame.init()
+    regles = creer_regles()
+    with tempfile.TemporaryDirectory() as dossier:
+        for nom, points, intervalle in (('en rafale', 20000, 0.0), ('toutes les 5 ms', 1000, 0.005)):
+            (mediane, p99, maximum), vidage, lots = mesurer_depot(regles, dossier, points, intervalle)
+            print(f"dépôt d'un point {nom}: médiane {mediane:.2f} µs, p99 {p99:.2f} µs, max {maximum:.1f} µs "
+                  f"(écriture en {lots} transactions, vidage final {vidage * 1000:.0f} ms)")
+        mediane, p99, maximum = mesurer_ecriture_directe(regles, dossier)
+        print(f"transaction par point dans le thread de jeu: médiane {mediane:.0f} µs, p99 {p99:.0f} µs, "
+              f"max {maximum:.0f} µs")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
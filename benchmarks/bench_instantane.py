@@ -0,0 +1,27 @@
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from regles_tennis_table import creer_regles
+from main import initialiser_objets_jeu
+from instantane import capturer_instantane, restaurer_instantane, TAILLE
+
+def main(repetitions=20000):
+    pygame.font.init()
+    regles = creer_regles()
+    etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MIN'], {'sons': {}, 'images': {}}, regles,
+                                      mode=regles['MODES_JEU']['CONTRE_CPU'], graine=1)
+    instantane = capturer_instantane(etat_jeu)
+
+    capture = min(timeit.repeat(lambda: capturer_instantane(etat_jeu), number=repetitions, repeat=5))
+    restauration = min(timeit.repeat(lambda: restaurer_instantane(etat_jeu, instantane), number=repetitions, repeat=5))
+    print(f"instantané de {TAILLE} octets: capture {capture / repetitions * 1e6:.2f} µs, "
+          f"restauration {restauration / repetitions * 1e6:.2f} µs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+import logging
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from regles_tennis_table import creer_regles
+from main import initialiser_objets_jeu, mettre_a_jour_jeu
+from simulation import creer_source_suiveuse
+from logging_config import configurer_logging, arreter_logging
+
+CONFIGURATIONS = (
+    ('DEBUG synchrone', logging.DEBUG, False),
+    ('DEBUG file', logging.DEBUG, True),
+    ('INFO file', logging.INFO, True)
+)
+
+def mesurer(images):
+    """Durée moyenne de mettre_a_jour_jeu par image avec la configuration de logs courante"""
+    regles = creer_regles()
+    etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MIN'], {'sons': {}, 'images': {}}, regles, graine=1)
+    source = creer_source_suiveuse(regles)
+    pas_ms = 1000 / regles['IPS_PHYSIQUE']
+    debut = time.perf_counter()
+    for image in range(images):
+        etat_jeu = mettre_a_jour_jeu(etat_jeu, source(etat_jeu, image), round(image * pas_ms))
+    return (time.perf_counter() - debut) / images
+
+def main(images=20000):
+    pygame.font.init()
+    # Les fichiers de logs du banc d'essai ne doivent pas polluer le dossier du jeu
+    os.chdir(tempfile.mkdtemp(prefix='bench_logging_'))
+    resultats = []
+    for nom, niveau, asynchrone in CONFIGURATIONS:
+        configurer_logging(niveau, asynchrone)
+        duree_image = mesurer(images)
+        debut_vidage = time.perf_counter()
+        arreter_logging()
+        resultats.append((nom, duree_image, time.perf_counter() - debut_vidage))
+
+    for nom, duree_image, vidage in resultats:
+        print(f"{nom:16s}: {duree_image * 1e6:6.1f} µs/image, vidage de la file {vidage * 1e3:.0f} ms")
+
+if __name__ == "__main__":
+    main()
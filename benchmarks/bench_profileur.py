@@ -0,0 +1,38 @@
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from regles_tennis_table import creer_regles
+from main import initialiser_objets_jeu, mettre_a_jour_jeu
+from simulation import creer_source_suiveuse
+from profileur_images import creer_profileur, terminer_image
+
+def mesurer(profileur, pas=20000):
+    regles = creer_regles()
+    etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MIN'], {'sons': {}, 'images': {}}, regles, graine=1)
+    source = creer_source_suiveuse(regles)
+
+    def executer():
+        nonlocal etat_jeu
+        for numero_pas in range(pas):
+            etat_jeu = mettre_a_jour_jeu(etat_jeu, source(etat_jeu, numero_pas), numero_pas * 1000 // 60, profileur)
+            if profileur:
+                terminer_image(profileur)
+    return min(timeit.repeat(executer, number=1, repeat=5)) / pas
+
+def main():
+    pygame.init()
+    regles = creer_regles()
+    sans = mesurer(None)
+    avec = mesurer(creer_profileur(regles))
+    print(f"mettre_a_jour_jeu: {sans * 1e6:.2f} µs/pas sans profileur, "
+          f"{avec * 1e6:.2f} µs/pas avec profileur et terminer_image (+{(avec - sans) * 1e6:.2f} µs)")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
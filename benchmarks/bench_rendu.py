@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RACINE)
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from regles_tennis_table import creer_regles
+from main import (
+    charger_ressources,
+    initialiser_objets_jeu,
+    mettre_a_jour_jeu,
+    dessiner_jeu,
+    creer_rendu_partiel,
+    dessiner_jeu_partiel
+)
+from simulation import creer_source_suiveuse
+
+def rendu_complet(ecran, ressources):
+    def dessiner(etat_jeu):
+        dessiner_jeu(ecran, etat_jeu, ressources)
+        pygame.display.flip()
+    return dessiner
+
+def rendu_partiel(ecran, ressources):
+    rendu = creer_rendu_partiel()
+    def dessiner(etat_jeu):
+        pygame.display.update(dessiner_jeu_partiel(ecran, etat_jeu, ressources, rendu))
+    return dessiner
+
+def mesurer(fabrique, ecran, ressources, regles, images):
+    """Durée moyenne du dessin et de la présentation d'une image, physique exclue"""
+    etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MIN'], ressources, regles, graine=1)
+    source = creer_source_suiveuse(regles)
+    dessiner = fabrique(ecran, ressources)
+    pas_ms = 1000 / regles['IPS_PHYSIQUE']
+    duree = 0.0
+    for image in range(images):
+        etat_jeu = mettre_a_jour_jeu(etat_jeu, source(etat_jeu, image), round(image * pas_ms))
+        debut = time.perf_counter()
+        dessiner(etat_jeu)
+        duree += time.perf_counter() - debut
+    return duree / images
+
+def main(images=3000):
+    os.chdir(RACINE)
+    pygame.init()
+    regles = creer_regles()
+    ecran = pygame.display.set_mode((regles['LARGEUR_FENETRE'], regles['HAUTEUR_FENETRE']))
+    ressources = charger_ressources()
+    for nom, fabrique in (('complet (flip)', rendu_complet), ('partiel (update)', rendu_partiel)):
+        duree = mesurer(fabrique, ecran, ressources, regles, images)
+        print(f"rendu {nom:17s}: {duree * 1e6:7.1f} µs/image")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
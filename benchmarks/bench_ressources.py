@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RACINE)
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from regles_tennis_table import creer_regles
+from main import charger_ressources
+
+def charger_sans_cache(regles):
+    """Ancien chemin: décodage des sources et mise à l'échelle à chaque lancement"""
+    sons = {nom: pygame.mixer.Sound(os.path.join('sons', f"{nom}.mp3"))
+            for nom in ('coup_gauche', 'coup_droit', 'service')}
+    images = {
+        'arriere_plan': pygame.transform.scale(pygame.image.load(os.path.join('images', 'plancher.jpg')),
+                                               (regles['LARGEUR_FENETRE'], regles['HAUTEUR_FENETRE'])),
+        **{nom: pygame.transform.scale(pygame.image.load(os.path.join('images', f"{nom}.png")),
+                                       (regles['LARGEUR_RAQUETTE'], regles['HAUTEUR_RAQUETTE']))
+           for nom in ('raquette_bleue', 'raquette_rouge')}
+    }
+    return sons, images
+
+def mesurer(fonction):
+    debut = time.perf_counter()
+    fonction()
+    return (time.perf_counter() - debut) * 1000
+
+def main(repetitions=5):
+    os.chdir(RACINE)
+    pygame.init()
+    pygame.mixer.init()
+    regles = creer_regles()
+    pygame.display.set_mode((regles['LARGEUR_FENETRE'], regles['HAUTEUR_FENETRE']))
+
+    dossier = tempfile.mkdtemp(prefix='cache_ressources_')
+    try:
+        sans_cache, froid, chaud = [], [], []
+        for _ in range(repetitions):
+            sans_cache.append(mesurer(lambda: charger_sans_cache(regles)))
+            shutil.rmtree(dossier, ignore_errors=True)
+            froid.append(mesurer(lambda: charger_ressources(regles, dossier)))
+            chaud.append(mesurer(lambda: charger_ressources(regles, dossier)))
+        print(f"sans cache {min(sans_cache):.1f} ms, cache froid {min(froid):.1f} ms, "
+              f"cache chaud {min(chaud):.1f} ms")
+    finally:
+        shutil.rmtree(dossier, ignore_errors=True)
+        pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from regles_tennis_table import creer_regles
+from simulation_lot import creer_lot, servir_lot, avancer_lot
+
+def mesurer(nombre, images=200):
+    regles = creer_regles()
+    lot = servir_lot(creer_lot(nombre, regles=regles, graine=1), serveurs=1)
+    debut = time.perf_counter()
+    for image in range(images):
+        points = avancer_lot(lot, image * 1000 / regles['IPS'])
+        if points.any():
+            servir_lot(lot, serveurs=lot['gagnant'], masque=points)
+    duree = time.perf_counter() - debut
+    return duree / images, nombre * images / duree
+
+def main():
+    for nombre in (1_000, 10_000, 100_000):
+        duree_image, debit = mesurer(nombre)
+        print(f"{nombre:>7} échanges: {duree_image * 1000:7.3f} ms/image, {debit:,.0f} échanges-images/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+import os
+import sys
+import json
+import time
+import timeit
+import argparse
+import platform
+import statistics
+import subprocess
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RACINE)
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from regles_tennis_table import creer_regles
+from main import (
+    charger_ressources,
+    initialiser_objets_jeu,
+    mettre_a_jour_jeu,
+    dessiner_jeu,
+    obtenir_donnees_affichage
+)
+from balle import creer_balle, deplacer as deplacer_balle, gerer_collision_raquette
+from raquette import creer_raquette, deplacer as deplacer_raquette, definir_velocite, verifier_collision_balle
+from tableau_score import dessiner as dessiner_tableau_score
+from simulation import creer_source_suiveuse, simuler_match
+
+VERSION_RESULTATS = 1
+DOSSIER_RESULTATS = os.path.join(RACINE, 'benchmarks', 'resultats')
+SEUIL_REGRESSION = 0.10
+
+def preparer_etat(contexte):
+    """État de jeu en plein échange: quelques centaines de pas d'un match scripté"""
+    regles = contexte['regles']
+    etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MIN'], contexte['ressources'], regles, graine=1)
+    source = creer_source_suiveuse(regles)
+    for numero_pas in range(200):
+        etat_jeu = mettre_a_jour_jeu(etat_jeu, source(etat_jeu, numero_pas), numero_pas * 1000 // 60)
+    return etat_jeu, source
+
+def banc_deplacer_balle(contexte):
+    balle = preparer_etat(contexte)[0]['balle']
+    balle.active, balle.dx, balle.dy = True, 5.0, 3.0
+    def appel():
+        # Ramener la balle au centre pour rester dans le cas courant (pas de point)
+        balle.x, balle.y = 400.0, 300.0
+        deplacer_balle(balle)
+    return appel, 20000
+
+def banc_deplacer_raquette(contexte):
+    raquette = creer_raquette(50, 250, 12, regles=contexte['regles'])
+    definir_velocite(raquette, 0, 1)
+    def appel():
+        raquette.rect.y = 250
+        deplacer_raquette(raquette)
+    return appel, 20000
+
+def banc_verifier_collision(contexte):
+    regles = contexte['regles']
+    raquette = creer_raquette(50, 250, 12, regles=regles)
+    zone = raquette.zone_collision
+    # Balle proche de la zone de frappe: le test continu va jusqu'au calcul du temps d'impact
+    balle = creer_balle(regles=regles)
+    balle.x, balle.y = zone.right + 30, zone.centery
+    balle.x_precedent, balle.y_precedent = zone.right + 45, zone.centery
+    # Au-delà du délai entre deux impacts de la raquette, sinon le test s'arrête aussitôt
+    temps_actuel = raquette.temps_dernier_impact + raquette.delai_entre_impacts + 1
+    return (lambda: verifier_collision_balle(raquette, balle, temps_actuel)), 20000
+
+def banc_gerer_collision_raquette(contexte):
+    etat_jeu, _ = preparer_etat(contexte)
+    balle, raquette = etat_jeu['balle'], etat_jeu['raquette_rouge']
+    def appel():
+        impact = {'point_contact': (raquette.zone_collision.right, raquette.zone_collision.centery),
+                  'normale': (1.0, 0.0), 'position_impact': 0.5}
+        gerer_collision_raquette(balle, raquette, impact)
+    return appel, 10000
+
+def banc_mettre_a_jour_jeu(contexte):
+    etat_jeu, source = preparer_etat(contexte)
+    compteur = [200]
+    def appel():
+        nonlocal etat_jeu
+        numero_pas = compteur[0]
+        etat_jeu = mettre_a_jour_jeu(etat_jeu, source(etat_jeu, numero_pas), numero_pas * 1000 // 60)
+        compteur[0] += 1
+    return appel, 5000
+
+def banc_dessiner_jeu(contexte):
+    etat_jeu, _ = preparer_etat(contexte)
+    ecran, ressources = contexte['ecran'], contexte['ressources']
+    return (lambda: dessiner_jeu(ecran, etat_jeu, ressources)), 200
+
+def banc_dessiner_tableau_score(contexte):
+    etat_jeu, _ = preparer_etat(contexte)
+    ecran = contexte['ecran']
+    tableau = etat_jeu['tableau_score']
+    donnees = obtenir_donnees_affichage(etat_jeu)
+    return (lambda: dessiner_tableau_score(tableau, ecran, donnees)), 2000
+
+def banc_match_complet(contexte):
+    regles = contexte['regles']
+    return (lambda: simuler_match(creer_source_suiveuse(regles), graine=1, regles=regles)), 1
+
+# Nom du banc, préparation retournant (appel, nombre d'appels par mesure), répétitions
+BANCS = (
+    ('balle.deplacer', banc_deplacer_balle, 7),
+    ('raquette.deplacer', banc_deplacer_raquette, 7),
+    ('raquette.verifier_collision_balle', banc_verifier_collision, 7),
+    ('balle.gerer_collision_raquette', banc_gerer_collision_raquette, 7),
+    ('main.mettre_a_jour_jeu', banc_mettre_a_jour_jeu, 7),
+    ('main.dessiner_jeu', banc_dessiner_jeu, 7),
+    ('tableau_score.dessiner', banc_dessiner_tableau_score, 7),
+    ('simulation.match_complet', banc_match_complet, 3)
+)
+
+def obtenir_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RACINE, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+def obtenir_machine():
+    return {
+        'plateforme': platform.platform(),
+        'processeur': platform.processor() or platform.machine(),
+        'coeurs': os.cpu_count(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'pygame': pygame.version.ver,
+        'sdl': '.'.join(map(str, pygame.get_sdl_version())),
+        'pilote_video': os.environ.get('SDL_VIDEODRIVER'),
+        'pilote_audio': os.environ.get('SDL_AUDIODRIVER')
+    }
+
+def executer(filtre=None):
+    """Exécuter les bancs; durées par appel en microsecondes (minimum et médiane des mesures)"""
+    os.chdir(RACINE)
+    pygame.init()
+    regles = creer_regles()
+    ecran = pygame.display.set_mode((regles['LARGEUR_FENETRE'], regles['HAUTEUR_FENETRE']))
+    contexte = {'regles': regles, 'ecran': ecran, 'ressources': charger_ressources(regles)}
+    # Les sons passent par la file audio jusqu'au mixer: hors du périmètre des bancs
+    contexte['ressources']['sons'] = {}
+
+    bancs = {}
+    try:
+        for nom, preparer, repetitions in BANCS:
+            if filtre and filtre not in nom:
+                continue
+            appel, nombre = preparer(contexte)
+            appel()
+            mesures = [duree / nombre * 1e6 for duree in
+                       timeit.repeat(appel, number=nombre, repeat=repetitions)]
+            bancs[nom] = {
+                'min_us': min(mesures),
+                'mediane_us': statistics.median(mesures),
+                'mesures_us': mesures,
+                'appels_par_mesure': nombre
+            }
+            print(f"{nom:<36} {bancs[nom]['min_us']:12.2f} µs  (médiane {bancs[nom]['mediane_us']:.2f})")
+    finally:
+        pygame.quit()
+
+    return {
+        'version': VERSION_RESULTATS,
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': obtenir_commit(),
+        'machine': obtenir_machine(),
+        'bancs': bancs
+    }
+
+def comparer(reference, actuel, seuil=SEUIL_REGRESSION, mesure='min_us'):
+    """Lignes de comparaison et liste des bancs plus lents que la référence au-delà du seuil"""
+    lignes, regressions = [], []
+    if reference['machine'] != actuel['machine']:
+        differences = sorted(cle for cle in set(reference['machine']) | set(actuel['machine'])
+                             if reference['machine'].get(cle) != actuel['machine'].get(cle))
+        lignes.append(f"attention: machines différentes ({', '.join(differences)})")
+    for nom, resultat in actuel['bancs'].items():
+        if nom not in reference['bancs']:
+            lignes.append(f"{nom:<36} nouveau banc")
+            continue
+        avant, apres = reference['bancs'][nom][mesure], resultat[mesure]
+        ecart = apres / avant - 1 if avant else 0.0
+        verdict = 'RÉGRESSION' if ecart > seuil else ('amélioration' if ecart < -seuil else '')
+        if ecart > seuil:
+            regressions.append(nom)
+        lignes.append(f"{nom:<36} {avant:12.2f} -> {apres:12.2f} µs  {ecart:+7.1%}  {verdict}")
+    return lignes, regressions
+
+def charger(chemin):
+    with open(chemin, encoding='utf-8') as fichier:
+        return json.load(fichier)
+
+def sauvegarder(resultats, chemin=None):
+    if chemin is None:
+        os.makedirs(DOSSIER_RESULTATS, exist_ok=True)
+        chemin = os.path.join(DOSSIER_RESULTATS,
+                              f"bancs_{time.strftime('%Y%m%d_%H%M%S')}_{resultats['commit'] or 'inconnu'}.json")
+    with open(chemin, 'w', encoding='utf-8') as fichier:
+        json.dump(resultats, fichier, indent=2, ensure_ascii=False)
+    print(f"Résultats écrits dans {chemin}")
+    return chemin
+
+def main():
+    analyseur = argparse.ArgumentParser(description="Bancs d'essai des chemins critiques de simulation et de rendu")
+    commandes = analyseur.add_subparsers(dest='commande', required=True)
+
+    commande_executer = commandes.add_parser('executer', help="exécuter les bancs et écrire les résultats en JSON")
+    commande_executer.add_argument('--sortie', help="fichier JSON (par défaut dans benchmarks/resultats/)")
+    commande_executer.add_argument('--filtre', help="n'exécuter que les bancs dont le nom contient ce texte")
+
+    commande_comparer = commandes.add_parser('comparer', help="comparer des résultats à une référence")
+    commande_comparer.add_argument('reference', help="résultats JSON de référence")
+    commande_comparer.add_argument('actuel', nargs='?', help="résultats JSON à comparer (par défaut: exécuter les bancs)")
+    commande_comparer.add_argument('--seuil', type=float, default=SEUIL_REGRESSION * 100,
+                                   help="ralentissement toléré en %% (défaut: %(default)s)")
+    commande_comparer.add_argument('--mesure', choices=['min_us', 'mediane_us'], default='min_us')
+    commande_comparer.add_argument('--filtre', help="n'exécuter que les bancs dont le nom contient ce texte")
+
+    arguments = analyseur.parse_args()
+    if arguments.commande == 'executer':
+        sauvegarder(executer(arguments.filtre), arguments.sortie)
+        return 0
+
+    reference = charger(arguments.reference)
+    actuel = charger(arguments.actuel) if arguments.actuel else executer(arguments.filtre)
+    lignes, regressions = comparer(reference, actuel, arguments.seuil / 100, arguments.mesure)
+    print(f"Référence {reference.get('commit')} du {reference.get('date')}, seuil {arguments.seuil:g} %")
+    for ligne in lignes:
+        print(ligne)
+    if regressions:
+        print(f"{len(regressions)} régression(s): {', '.join(regressions)}")
+        return 1
+    print("Aucune régression")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
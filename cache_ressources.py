@@ -0,0 +1,134 @@
+import os
+import struct
+import hashlib
+import logging
+import pygame
+
+logger = logging.getLogger('tennis_table')
+
+# Changer la version invalide tout le cache (format des fichiers ou traitement des sources)
+VERSION_CACHE = 1
+DOSSIER_CACHE = 'cache_ressources'
+MAGIE = b'TTRC'
+
+# Fichier image: magie, version, largeur, hauteur, canal alpha, puis les pixels bruts
+EN_TETE_IMAGE = struct.Struct('<4sBHHB')
+# Fichier son: magie, version, fréquence, format et canaux du mixer, puis le PCM brut
+EN_TETE_SON = struct.Struct('<4sBihB')
+
+def empreinte_source(chemin, *parametres):
+    """Clé de cache: contenu du fichier source, version du cache et paramètres du traitement"""
+    condensat = hashlib.sha1()
+    with open(chemin, 'rb') as fichier:
+        condensat.update(fichier.read())
+    condensat.update(repr((VERSION_CACHE, *parametres)).encode())
+    return condensat.hexdigest()[:16]
+
+def lire_fichier(chemin):
+    """Lire un fichier d'un bloc dans un tampon modifiable, partageable par frombuffer"""
+    donnees = bytearray(os.path.getsize(chemin))
+    with open(chemin, 'rb') as fichier:
+        fichier.readinto(donnees)
+    return donnees
+
+def compter(statistiques, cle):
+    if statistiques is not None:
+        statistiques[cle] += 1
+
+def chemin_cache(nom, empreinte, extension, dossier=None):
+    return os.path.join(dossier or DOSSIER_CACHE, f"{nom}_{empreinte}.{extension}")
+
+def ecrire_atomiquement(chemin, *morceaux):
+    """Écrire dans un fichier temporaire puis le renommer: jamais de fichier de cache tronqué"""
+    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+    temporaire = f"{chemin}.{os.getpid()}.tmp"
+    with open(temporaire, 'wb') as fichier:
+        for morceau in morceaux:
+            fichier.write(morceau)
+    os.replace(temporaire, chemin)
+
+def supprimer_anciennes_versions(nom, extension, a_garder, dossier=None):
+    """Retirer les entrées d'une ressource dont la source ou les paramètres ont changé"""
+    dossier = dossier or DOSSIER_CACHE
+    for fichier in os.listdir(dossier):
+        if fichier.startswith(f"{nom}_") and fichier.endswith(f".{extension}") and \
+           os.path.join(dossier, fichier) != a_garder:
+            try:
+                os.remove(os.path.join(dossier, fichier))
+            except OSError:
+                pass
+
+def preparer_surface(surface, alpha):
+    """Passer au format de l'écran, si une fenêtre existe, pour des blits sans conversion"""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+def charger_image(nom, chemin, taille, retourner=False, alpha=False, dossier=None, statistiques=None):
+    """Image mise à l'échelle (et retournée) depuis le cache, ou décodée puis mise en cache"""
+    format_pixels = 'RGBA' if alpha else 'RGB'
+    empreinte = empreinte_source(chemin, tuple(taille), retourner, format_pixels)
+    fichier_cache = chemin_cache(nom, empreinte, 'img', dossier)
+
+    try:
+        donnees = lire_fichier(fichier_cache)
+        magie, version, largeur, hauteur, avec_alpha = EN_TETE_IMAGE.unpack_from(donnees)
+        if magie == MAGIE and version == VERSION_CACHE and (largeur, hauteur) == tuple(taille) \
+           and bool(avec_alpha) == alpha:
+            # Les pixels sont lus tels quels, sans décodage ni mise à l'échelle
+            surface = pygame.image.frombuffer(
+                memoryview(donnees)[EN_TETE_IMAGE.size:], (largeur, hauteur), format_pixels)
+            compter(statistiques, 'succes')
+            return preparer_surface(surface, alpha)
+        logger.warning("Entrée de cache invalide ignorée: %s", fichier_cache)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning("Lecture du cache impossible pour %s: %s", nom, e)
+
+    compter(statistiques, 'echecs')
+    surface = pygame.transform.scale(pygame.image.load(chemin), taille)
+    if retourner:
+        surface = pygame.transform.flip(surface, True, False)
+    try:
+        ecrire_atomiquement(
+            fichier_cache,
+            EN_TETE_IMAGE.pack(MAGIE, VERSION_CACHE, *surface.get_size(), int(alpha)),
+            pygame.image.tobytes(surface, format_pixels)
+        )
+        supprimer_anciennes_versions(nom, 'img', fichier_cache, dossier)
+    except Exception as e:
+        logger.warning("Écriture du cache impossible pour %s: %s", nom, e)
+    return preparer_surface(surface, alpha)
+
+def charger_son(nom, chemin, dossier=None, statistiques=None):
+    """Son décodé en PCM au format du mixer depuis le cache, ou décodé puis mis en cache"""
+    frequence, format_mixer, canaux = pygame.mixer.get_init()
+    empreinte = empreinte_source(chemin, frequence, format_mixer, canaux)
+    fichier_cache = chemin_cache(nom, empreinte, 'pcm', dossier)
+
+    try:
+        donnees = lire_fichier(fichier_cache)
+        en_tete = EN_TETE_SON.unpack_from(donnees)
+        if en_tete == (MAGIE, VERSION_CACHE, frequence, format_mixer, canaux):
+            son = pygame.mixer.Sound(buffer=memoryview(donnees)[EN_TETE_SON.size:])
+            compter(statistiques, 'succes')
+            return son
+        logger.warning("Entrée de cache invalide ignorée: %s", fichier_cache)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning("Lecture du cache impossible pour %s: %s", nom, e)
+
+    compter(statistiques, 'echecs')
+    son = pygame.mixer.Sound(chemin)
+    try:
+        ecrire_atomiquement(
+            fichier_cache,
+            EN_TETE_SON.pack(MAGIE, VERSION_CACHE, frequence, format_mixer, canaux),
+            son.get_raw()
+        )
+        supprimer_anciennes_versions(nom, 'pcm', fichier_cache, dossier)
+    except Exception as e:
+        logger.warning("Écriture du cache impossible pour %s: %s", nom, e)
+    return son
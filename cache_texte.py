@@ -0,0 +1,65 @@
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger('tennis_table')
+
+CAPACITE_CACHE_TEXTE = 256
+SCORE_MAX_PRERENDU = 30
+SEPARATEUR_SCORE = " - "
+
+def creer_cache_texte(capacite=CAPACITE_CACHE_TEXTE):
+    """Cache LRU borné des surfaces de texte, clé (police, texte, couleur, anticrénelage)"""
+    return {
+        'capacite': capacite,
+        'surfaces': OrderedDict(),
+        'succes': 0,
+        'echecs': 0,
+        'evictions': 0
+    }
+
+# Cache partagé par le tableau de score, le statut et les menus
+CACHE_TEXTE = creer_cache_texte()
+
+def rendre_texte(police, texte, couleur, anticrenelage=True, cache=None):
+    """Équivalent de police.render(texte, anticrenelage, couleur), mis en cache.
+
+    La surface retournée est partagée: la copier avant de la modifier (set_alpha...)."""
+    cache = cache or CACHE_TEXTE
+    surfaces = cache['surfaces']
+    cle = (police, texte, couleur, anticrenelage)
+    surface = surfaces.get(cle)
+    if surface is not None:
+        surfaces.move_to_end(cle)
+        cache['succes'] += 1
+        return surface
+
+    cache['echecs'] += 1
+    surface = police.render(texte, anticrenelage, couleur)
+    surfaces[cle] = surface
+    if len(surfaces) > cache['capacite']:
+        surfaces.popitem(last=False)
+        cache['evictions'] += 1
+    return surface
+
+def prerendre_scores(police, couleur, cache=None):
+    """Rendre d'avance les nombres de 0 à SCORE_MAX_PRERENDU et le séparateur du score"""
+    for nombre in range(SCORE_MAX_PRERENDU + 1):
+        rendre_texte(police, str(nombre), couleur, cache=cache)
+    rendre_texte(police, SEPARATEUR_SCORE, couleur, cache=cache)
+
+def obtenir_statistiques_cache(cache=None):
+    cache = cache or CACHE_TEXTE
+    total = cache['succes'] + cache['echecs']
+    return {
+        'succes': cache['succes'],
+        'echecs': cache['echecs'],
+        'evictions': cache['evictions'],
+        'taux_succes': cache['succes'] / total if total else 0.0,
+        'taille': len(cache['surfaces']),
+        'capacite': cache['capacite']
+    }
+
+def vider_cache(cache=None):
+    cache = cache or CACHE_TEXTE
+    cache['surfaces'].clear()
+    cache['succes'] = cache['echecs'] = cache['evictions'] = 0
@@ -0,0 +1,249 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import itertools
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from regles_tennis_table import creer_regles, obtenir_vitesse_balle_pour_niveau
+from simulation import simuler_match, creer_source_suiveuse, creer_source_service_seul
+
+logger = logging.getLogger('tennis_table')
+
+SOURCES_JOUEURS = {
+    'suiveur': creer_source_suiveuse,
+    'service': creer_source_service_seul,
+    # Raquette rouge suiveuse, raquette bleue jouée par l'adversaire CPU du niveau de la cellule
+    'cpu': creer_source_suiveuse
+}
+MODES_JOUEURS = {'cpu': 'CONTRE_CPU'}
+
+# À incrémenter quand la simulation change: les cellules déjà en cache sont alors recalculées
+VERSION_CACHE = 3
+
+PARAMETRES_BALAYABLES = ('VITESSE_RAQUETTE', 'DELAI_ENTRE_IMPACTS', 'HAUTEUR_RAQUETTE')
+
+def construire_grille(niveaux, variations=None):
+    """Produit cartésien des niveaux de difficulté et des valeurs de règles à balayer.
+
+    `variations` associe un nom de règle à la liste de ses valeurs, par exemple
+    {'VITESSE_RAQUETTE': [8, 10, 12]}."""
+    variations = variations or {}
+    noms = sorted(variations)
+    return [
+        {'niveau': niveau, 'regles': dict(zip(noms, valeurs))}
+        for niveau in niveaux
+        for valeurs in itertools.product(*(variations[nom] for nom in noms))
+    ]
+
+def cle_cellule(cellule, joueurs, matchs, graine_base):
+    return json.dumps({
+        'version': VERSION_CACHE,
+        'niveau': cellule['niveau'],
+        'regles': cellule['regles'],
+        'joueurs': joueurs,
+        'matchs': matchs,
+        'graine': graine_base
+    }, sort_keys=True)
+
+def deriver_graine(graine_base, cle, index):
+    empreinte = hashlib.sha256(f"{graine_base}:{cle}:{index}".encode('utf-8')).digest()
+    return int.from_bytes(empreinte[:8], 'little')
+
+def creer_agregat():
+    return {
+        'matchs': 0,
+        'images': 0,
+        'victoires_joueur1': 0,
+        'points_joueur1': 0,
+        'points_joueur2': 0,
+        'points_serveur': 0,
+        'longueurs_echange': {},
+        'coups_par_echange': {}
+    }
+
+def fusionner_agregats(agregat, partiel):
+    fusion = {
+        cle: agregat[cle] + partiel[cle]
+        for cle in agregat if not isinstance(agregat[cle], dict)
+    }
+    for cle in ('longueurs_echange', 'coups_par_echange'):
+        fusion[cle] = dict(Counter(agregat[cle]) + Counter(partiel[cle]))
+    return fusion
+
+def executer_tranche(tache):
+    """Unité de travail exécutée dans un processus: quelques matchs d'une même cellule"""
+    cellule = tache['cellule']
+    regles = {**creer_regles(), **cellule['regles']}
+    vitesse_balle = obtenir_vitesse_balle_pour_niveau(regles, cellule['niveau'])
+    source = SOURCES_JOUEURS[tache['joueurs']](regles)
+    mode = regles['MODES_JEU'][tache['mode']] if tache['mode'] else None
+
+    agregat = creer_agregat()
+    longueurs = Counter()
+    coups = Counter()
+    for graine in tache['graines']:
+        resultat = simuler_match(source, graine, vitesse_balle=vitesse_balle, regles=regles,
+                                 mode=mode, niveau=tache['niveau'])
+        agregat['matchs'] += 1
+        agregat['images'] += resultat['images']
+        agregat['victoires_joueur1'] += resultat['etat_jeu']['gestionnaire_match']['gagnant_match'] == 1
+        for point in resultat['points']:
+            agregat['points_joueur1'] += point['gagnant'] == 1
+            agregat['points_joueur2'] += point['gagnant'] == 2
+            agregat['points_serveur'] += point['gagnant'] == point['serveur']
+            longueurs[str(point['images'])] += 1
+            coups[str(point['coups'])] += 1
+    agregat['longueurs_echange'] = dict(longueurs)
+    agregat['coups_par_echange'] = dict(coups)
+    return tache['cle'], agregat
+
+def quantile_histogramme(histogramme, q):
+    valeurs = sorted((int(valeur), compte) for valeur, compte in histogramme.items())
+    total = sum(compte for _, compte in valeurs)
+    cumul = 0
+    for valeur, compte in valeurs:
+        cumul += compte
+        if cumul >= q * total:
+            return valeur
+    return 0
+
+def moyenne_histogramme(histogramme):
+    total = sum(histogramme.values())
+    return sum(int(valeur) * compte for valeur, compte in histogramme.items()) / total if total else 0.0
+
+def resumer_agregat(agregat):
+    points = agregat['points_joueur1'] + agregat['points_joueur2']
+    return {
+        'matchs': agregat['matchs'],
+        'points': points,
+        'taux_victoire_joueur1': agregat['victoires_joueur1'] / agregat['matchs'] if agregat['matchs'] else 0.0,
+        'taux_points_joueur1': agregat['points_joueur1'] / points if points else 0.0,
+        'taux_points_serveur': agregat['points_serveur'] / points if points else 0.0,
+        'longueur_echange_moyenne': moyenne_histogramme(agregat['longueurs_echange']),
+        'longueur_echange_mediane': quantile_histogramme(agregat['longueurs_echange'], 0.5),
+        'longueur_echange_p90': quantile_histogramme(agregat['longueurs_echange'], 0.9),
+        'coups_par_echange_moyenne': moyenne_histogramme(agregat['coups_par_echange'])
+    }
+
+def charger_cache(fichier_cache):
+    if not fichier_cache or not os.path.exists(fichier_cache):
+        return {}
+    try:
+        with open(fichier_cache, encoding='utf-8') as fichier:
+            return json.load(fichier)
+    except (OSError, ValueError) as e:
+        logger.warning("Cache de calibration illisible, il sera reconstruit: %s", e)
+        return {}
+
+def sauvegarder_cache(fichier_cache, cache):
+    if not fichier_cache:
+        return
+    temporaire = f"{fichier_cache}.tmp"
+    with open(temporaire, 'w', encoding='utf-8') as fichier:
+        json.dump(cache, fichier, indent=1, sort_keys=True)
+    os.replace(temporaire, fichier_cache)
+
+def decouper_taches(cellules, joueurs, matchs, taille_tranche, graine_base):
+    taches = []
+    for cellule in cellules:
+        cle = cle_cellule(cellule, joueurs, matchs, graine_base)
+        graines = [deriver_graine(graine_base, cle, index) for index in range(matchs)]
+        for debut in range(0, matchs, taille_tranche):
+            taches.append({
+                'cle': cle,
+                'cellule': cellule,
+                'joueurs': joueurs,
+                'mode': MODES_JOUEURS.get(joueurs),
+                'niveau': cellule['niveau'],
+                'graines': graines[debut:debut + taille_tranche]
+            })
+    return taches
+
+def executer_balayage(cellules, matchs=20, joueurs='suiveur', taille_tranche=4,
+                      processus=None, fichier_cache=None, graine_base=0):
+    """Répartir les matchs de chaque cellule sur un ProcessPoolExecutor.
+
+    Les cellules déjà présentes dans `fichier_cache` ne sont pas recalculées; le
+    cache est réécrit dès qu'une cellule est complète."""
+    cache = charger_cache(fichier_cache)
+    a_calculer = [c for c in cellules if cle_cellule(c, joueurs, matchs, graine_base) not in cache]
+    logger.info("Balayage: %s cellules, %s en cache", len(cellules), len(cellules) - len(a_calculer))
+
+    taches = decouper_taches(a_calculer, joueurs, matchs, taille_tranche, graine_base)
+    tranches_restantes = Counter(tache['cle'] for tache in taches)
+    partiels = {}
+
+    debut = time.perf_counter()
+    if taches:
+        with ProcessPoolExecutor(max_workers=processus) as executeur:
+            futurs = [executeur.submit(executer_tranche, tache) for tache in taches]
+            for futur in as_completed(futurs):
+                cle, agregat = futur.result()
+                partiels[cle] = fusionner_agregats(partiels.get(cle, creer_agregat()), agregat)
+                tranches_restantes[cle] -= 1
+                if tranches_restantes[cle] == 0:
+                    cache[cle] = partiels.pop(cle)
+                    sauvegarder_cache(fichier_cache, cache)
+    duree = time.perf_counter() - debut
+
+    resultats = []
+    for cellule in cellules:
+        cle = cle_cellule(cellule, joueurs, matchs, graine_base)
+        resultats.append({**cellule, **resumer_agregat(cache[cle])})
+    logger.info("Balayage terminé en %.1fs (%s tranches calculées)", duree, len(taches))
+    return {
+        'resultats': resultats,
+        'cellules_calculees': len(a_calculer),
+        'duree': duree
+    }
+
+def analyser_variation(texte):
+    nom, valeurs = texte.split('=', 1)
+    if nom not in PARAMETRES_BALAYABLES:
+        raise argparse.ArgumentTypeError(f"Paramètre non balayable: {nom}")
+    return nom, [int(valeur) for valeur in valeurs.split(',')]
+
+def analyser_niveaux(texte):
+    if '-' in texte:
+        debut, fin = texte.split('-', 1)
+        return list(range(int(debut), int(fin) + 1))
+    return [int(niveau) for niveau in texte.split(',')]
+
+def main():
+    analyseur = argparse.ArgumentParser(description="Calibration Monte Carlo de la difficulté")
+    analyseur.add_argument('--niveaux', type=analyser_niveaux, default=list(range(1, 11)))
+    analyseur.add_argument('--parametre', type=analyser_variation, action='append', default=[],
+                           help="ex: VITESSE_RAQUETTE=8,10,12")
+    analyseur.add_argument('--matchs', type=int, default=20)
+    analyseur.add_argument('--joueurs', choices=sorted(SOURCES_JOUEURS), default='suiveur')
+    analyseur.add_argument('--tranche', type=int, default=4)
+    analyseur.add_argument('--processus', type=int, default=None)
+    analyseur.add_argument('--cache', default='calibration.json')
+    analyseur.add_argument('--graine', type=int, default=0)
+    arguments = analyseur.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    cellules = construire_grille(arguments.niveaux, dict(arguments.parametre))
+    bilan = executer_balayage(
+        cellules,
+        matchs=arguments.matchs,
+        joueurs=arguments.joueurs,
+        taille_tranche=arguments.tranche,
+        processus=arguments.processus,
+        fichier_cache=arguments.cache,
+        graine_base=arguments.graine
+    )
+    for resultat in bilan['resultats']:
+        print(f"niveau {resultat['niveau']:>2} {resultat['regles']}: "
+              f"échange moyen {resultat['longueur_echange_moyenne']:.0f} images "
+              f"(p90 {resultat['longueur_echange_p90']}), "
+              f"{resultat['coups_par_echange_moyenne']:.1f} coups, "
+              f"serveur {resultat['taux_points_serveur']:.0%}, "
+              f"joueur 1 {resultat['taux_points_joueur1']:.0%} des points")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+import os
+import sys
+import time
+import pstats
+import cProfile
+import logging
+import threading
+from collections import Counter
+
+logger = logging.getLogger('tennis_table')
+
+VARIABLE_CAPTURE = 'TENNIS_TABLE_CAPTURE_PROFIL'
+VARIABLE_FREQUENCE = 'TENNIS_TABLE_FREQUENCE_ECHANTILLONNAGE'
+MODE_CPROFILE = 'cprofile'
+MODE_ECHANTILLONNAGE = 'echantillonnage'
+MODES = (MODE_CPROFILE, MODE_ECHANTILLONNAGE)
+PROFONDEUR_MAX_PILE = 64
+
+class Echantillonneur(threading.Thread):
+    """Relève la pile du thread observé à intervalle régulier via sys._current_frames().
+
+    Seuls les objets code sont comptés pendant la capture; les noms ne sont
+    construits qu'à l'écriture du fichier."""
+    def __init__(self, id_thread, frequence):
+        super().__init__(name='echantillonneur_profil', daemon=True)
+        self.id_thread = id_thread
+        self.intervalle = 1 / frequence
+        self.arret = threading.Event()
+        self.piles = Counter()
+        self.echantillons = 0
+
+    def run(self):
+        while not self.arret.wait(self.intervalle):
+            cadre = sys._current_frames().get(self.id_thread)
+            codes = []
+            while cadre is not None and len(codes) < PROFONDEUR_MAX_PILE:
+                codes.append(cadre.f_code)
+                cadre = cadre.f_back
+            # Racine en premier, comme dans le format des piles repliées
+            self.piles[tuple(reversed(codes))] += 1
+            self.echantillons += 1
+
+    def arreter(self):
+        self.arret.set()
+        self.join()
+
+def nom_code(code):
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+def nom_fonction(fonction):
+    fichier, ligne, nom = fonction
+    return f"{os.path.basename(fichier)}:{nom}" if ligne else nom
+
+def piles_depuis_statistiques(statistiques):
+    """Piles repliées (pile -> microsecondes) reconstruites depuis le graphe d'appels de cProfile.
+
+    cProfile ne garde que les arcs appelant -> appelé: le temps d'une fonction est
+    réparti entre ses appelants au prorata du temps cumulé passé depuis chacun."""
+    appeles = {}
+    for fonction, (_, _, _, _, appelants) in statistiques.stats.items():
+        for appelant, (_, _, _, cumul) in appelants.items():
+            appeles.setdefault(appelant, []).append((fonction, cumul))
+
+    piles = Counter()
+    def parcourir(fonction, temps, chemin):
+        _, _, propre, cumul, _ = statistiques.stats[fonction]
+        ratio = temps / cumul if cumul else 0.0
+        nom = ';'.join(chemin)
+        piles[nom] += propre * ratio * 1e6
+        if len(chemin) >= PROFONDEUR_MAX_PILE:
+            return
+        for appele, cumul_appele in appeles.get(fonction, ()):
+            nom_appele = nom_fonction(appele)
+            if nom_appele not in chemin:
+                parcourir(appele, cumul_appele * ratio, chemin + [nom_appele])
+
+    for fonction, (_, _, _, cumul, appelants) in statistiques.stats.items():
+        if not appelants:
+            parcourir(fonction, cumul, [nom_fonction(fonction)])
+    return piles
+
+def ecrire_piles(chemin, piles):
+    with open(chemin, 'w', encoding='utf-8') as fichier:
+        for pile, valeur in sorted(piles.items()):
+            if round(valeur) > 0:
+                fichier.write(f"{pile} {round(valeur)}\n")
+
+def capture_demandee():
+    """Mode de capture demandé au lancement par TENNIS_TABLE_CAPTURE_PROFIL, ou None"""
+    mode = os.environ.get(VARIABLE_CAPTURE, '').lower()
+    if mode and mode not in MODES:
+        logger.warning("Mode de capture inconnu: %s (attendu: %s)", mode, ', '.join(MODES))
+        return None
+    return mode or None
+
+def creer_capture(regles, dossier='logs'):
+    """Capture de profil à la demande, bornée à DUREE_CAPTURE_PROFIL secondes"""
+    frequence = os.environ.get(VARIABLE_FREQUENCE) or regles['FREQUENCE_ECHANTILLONNAGE']
+    try:
+        frequence = float(frequence)
+        if frequence <= 0:
+            raise ValueError(frequence)
+    except ValueError:
+        logger.warning("Fréquence d'échantillonnage invalide: %s", frequence)
+        frequence = regles['FREQUENCE_ECHANTILLONNAGE']
+    return {
+        'mode': None,
+        'profil': None,
+        'echantillonneur': None,
+        'debut': None,
+        'duree_max': regles['DUREE_CAPTURE_PROFIL'],
+        'frequence': frequence,
+        'dossier': dossier
+    }
+
+def demarrer_capture(capture, mode):
+    if capture['mode'] is not None:
+        return
+    try:
+        if mode == MODE_CPROFILE:
+            capture['profil'] = cProfile.Profile()
+            capture['profil'].enable()
+        else:
+            capture['echantillonneur'] = Echantillonneur(threading.get_ident(), capture['frequence'])
+            capture['echantillonneur'].start()
+        capture['mode'] = mode
+        capture['debut'] = time.perf_counter()
+        logger.info("Capture de profil démarrée (%s, %s s au plus)", mode, capture['duree_max'])
+    except Exception as e:
+        logger.error("Impossible de démarrer la capture de profil: %s", e, exc_info=True)
+        capture['profil'] = capture['echantillonneur'] = None
+
+def arreter_capture(capture, raison):
+    """Arrêter la capture en cours et l'écrire dans le dossier de logs; retourne les fichiers écrits"""
+    mode = capture['mode']
+    if mode is None:
+        return []
+    duree = time.perf_counter() - capture['debut']
+    capture['mode'] = None
+    try:
+        os.makedirs(capture['dossier'], exist_ok=True)
+        base = os.path.join(capture['dossier'], f"profil_{time.strftime('%Y%m%d_%H%M%S')}_{mode}")
+        if mode == MODE_CPROFILE:
+            profil = capture['profil']
+            profil.disable()
+            profil.dump_stats(f"{base}.pstats")
+            ecrire_piles(f"{base}_piles.txt", piles_depuis_statistiques(pstats.Stats(profil)))
+            fichiers = [f"{base}.pstats", f"{base}_piles.txt"]
+        else:
+            echantillonneur = capture['echantillonneur']
+            echantillonneur.arreter()
+            # Piles repliées comptées en échantillons, pas en microsecondes
+            ecrire_piles(f"{base}_piles.txt", {
+                ';'.join(nom_code(code) for code in pile): nombre
+                for pile, nombre in echantillonneur.piles.items()
+            })
+            fichiers = [f"{base}_piles.txt"]
+            logger.info("%s échantillons en %.1f s (%.0f/s demandés)",
+                        echantillonneur.echantillons, duree, capture['frequence'])
+        logger.info("Capture de profil (%s, %.1f s, %s) écrite: %s", mode, duree, raison, ', '.join(fichiers))
+        return fichiers
+    except Exception as e:
+        logger.error("Erreur lors de l'écriture de la capture de profil: %s", e, exc_info=True)
+        return []
+    finally:
+        capture['profil'] = capture['echantillonneur'] = None
+
+def basculer_capture(capture, mode):
+    """Touche de capture: démarre ce mode, ou arrête la capture en cours"""
+    if capture['mode'] is None:
+        demarrer_capture(capture, mode)
+    else:
+        arreter_capture(capture, "demande du joueur")
+
+def verifier_duree_capture(capture):
+    """À appeler à chaque image: arrête la capture une fois sa durée maximale atteinte"""
+    if capture['mode'] is not None and time.perf_counter() - capture['debut'] >= capture['duree_max']:
+        arreter_capture(capture, "durée maximale atteinte")
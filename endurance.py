@@ -0,0 +1,115 @@
+import os
+import gc
+import sys
+import time
+import logging
+import argparse
+import pygame
+from regles_tennis_table import creer_regles
+from main import initialiser_objets_jeu, reinitialiser_partie, charger_ressources
+from simulation import (
+    creer_horloge_simulation,
+    creer_rendu_nul,
+    creer_rendu_ecran,
+    creer_source_suiveuse,
+    executer_simulation
+)
+from suivi_memoire import creer_suivi_memoire, relever_memoire, arreter_suivi_memoire
+
+logger = logging.getLogger('tennis_table')
+
+# Matchs joués avant la mesure de référence: caches de texte, surfaces et tampons déjà remplis
+MATCHS_CHAUFFE = 2
+LIMITE_CROISSANCE = 1024 * 1024
+
+def executer_endurance(duree, limite=LIMITE_CROISSANCE, regles=None, graine=0,
+                       rendu=False, cpu=False, matchs_max=None):
+    """Enchaîner des matchs scriptés sur un même etat_jeu pendant `duree` secondes, comme
+    une borne laissée en marche, et mesurer la mémoire retenue après chaque match.
+
+    La mémoire est bornée si, après MATCHS_CHAUFFE matchs, elle ne dépasse jamais la
+    référence de plus de `limite` octets."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    # pygame n'est arrêté à la fin que s'il a été initialisé ici
+    pygame_initialise = pygame.get_init()
+    pygame.init()
+    regles = regles or creer_regles()
+    # Un relevé après chaque match plutôt qu'à intervalle fixe
+    suivi = creer_suivi_memoire(intervalle=None)
+    try:
+        if rendu:
+            ecran = pygame.display.set_mode((regles['LARGEUR_FENETRE'], regles['HAUTEUR_FENETRE']))
+            ressources = charger_ressources(regles)
+            ressources['sons'] = {}
+            rendu_matchs = creer_rendu_ecran(ecran, ressources)
+        else:
+            ressources = {'sons': {}, 'images': {}}
+            rendu_matchs = creer_rendu_nul()
+        mode = regles['MODES_JEU']['CONTRE_CPU'] if cpu else None
+        etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MIN'], ressources, regles, mode, graine=graine)
+        source = creer_source_suiveuse(regles)
+        horloge = creer_horloge_simulation(regles['IPS_PHYSIQUE'])
+
+        resultat = {'matchs': 0, 'images': 0, 'reference': None, 'maximum': 0, 'final': 0}
+        debut = time.monotonic()
+        while time.monotonic() - debut < duree and (matchs_max is None or resultat['matchs'] < matchs_max):
+            etat_jeu, horloge, _ = executer_simulation(etat_jeu, source, horloge, rendu_matchs)
+            reinitialiser_partie(etat_jeu)
+            resultat['matchs'] += 1
+
+            gc.collect()
+            courant = relever_memoire(suivi)['courant']
+            if resultat['matchs'] == MATCHS_CHAUFFE:
+                resultat['reference'] = courant
+            resultat['final'] = courant
+            resultat['maximum'] = max(resultat['maximum'], courant)
+
+        resultat['images'] = horloge['images']
+        resultat['duree'] = time.monotonic() - debut
+        reference = resultat['reference'] if resultat['reference'] is not None else resultat['final']
+        resultat['croissance'] = resultat['maximum'] - reference
+        resultat['bornee'] = resultat['croissance'] <= limite
+        resultat['releves'] = list(suivi['releves'])
+        return resultat
+    finally:
+        arreter_suivi_memoire(suivi)
+        if not pygame_initialise:
+            pygame.quit()
+
+def main():
+    analyseur = argparse.ArgumentParser(description="Test d'endurance: matchs scriptés en boucle, mémoire bornée")
+    analyseur.add_argument('--heures', type=float, default=1.0)
+    analyseur.add_argument('--matchs', type=int, default=None, help="arrêter après ce nombre de matchs")
+    analyseur.add_argument('--limite', type=float, default=LIMITE_CROISSANCE / 1024,
+                           help="croissance tolérée après la chauffe, en Ko (défaut: %(default)s)")
+    analyseur.add_argument('--graine', type=int, default=0)
+    analyseur.add_argument('--rendu', action='store_true', help="dessiner chaque image sur un écran factice")
+    analyseur.add_argument('--cpu', action='store_true', help="raquette bleue jouée par l'adversaire CPU")
+    arguments = analyseur.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    resultat = executer_endurance(
+        arguments.heures * 3600,
+        limite=arguments.limite * 1024,
+        graine=arguments.graine,
+        rendu=arguments.rendu,
+        cpu=arguments.cpu,
+        matchs_max=arguments.matchs
+    )
+    print(f"{resultat['matchs']} matchs, {resultat['images']} images en {resultat['duree']:.0f} s")
+    print(f"mémoire après chauffe {(resultat['reference'] or 0) / 1024:.1f} Ko, "
+          f"maximum {resultat['maximum'] / 1024:.1f} Ko, fin {resultat['final'] / 1024:.1f} Ko "
+          f"(croissance {resultat['croissance'] / 1024:+.1f} Ko, limite {arguments.limite:g} Ko)")
+    if resultat['releves'] and resultat['releves'][-1]['variations']:
+        print("dernières variations par site:")
+        for site, taille, nombre in resultat['releves'][-1]['variations'][:5]:
+            print(f"  {site:<40} {taille / 1024:+9.1f} Ko {nombre:+6d} blocs")
+    if not resultat['bornee']:
+        print("ÉCHEC: mémoire non bornée")
+        return 1
+    print("Mémoire bornée")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+import os
+import csv
+import time
+import struct
+import logging
+import threading
+
+logger = logging.getLogger('tennis_table')
+
+# Relevé d'un pas physique: numéro du pas, balle (x, y, dx, dy), rectangles des
+# raquettes rouge et bleue, masque des touches, état de la balle et du match
+FORMAT_RELEVE = struct.Struct('<IffffhhhhhhhhHBB')
+COLONNES = (
+    'pas', 'balle_x', 'balle_y', 'balle_dx', 'balle_dy',
+    'rouge_x', 'rouge_y', 'rouge_largeur', 'rouge_hauteur',
+    'bleue_x', 'bleue_y', 'bleue_largeur', 'bleue_hauteur',
+    'touches', 'etat_balle', 'etat_match'
+)
+DELAI_MIN_ENTRE_VIDAGES = 5.0
+DELAI_FIN_VIDAGE = 5.0
+
+def creer_enregistreur_vol(regles, secondes=None, dossier='logs'):
+    """Enregistreur de vol: tampon circulaire préalloué des derniers pas physiques,
+    écrit sur disque seulement en cas d'erreur ou à la demande"""
+    secondes = secondes if secondes is not None else regles['DUREE_ENREGISTREUR_VOL']
+    capacite = max(1, int(secondes * regles['IPS_PHYSIQUE']))
+    etats = list(regles['ETATS_JEU'].values())
+    return {
+        'regles': regles,
+        'capacite': capacite,
+        'tampon': bytearray(capacite * FORMAT_RELEVE.size),
+        'position': 0,
+        'total': 0,
+        'etats': etats,
+        'index_etats': {etat: index for index, etat in enumerate(etats)},
+        'dossier': dossier,
+        'dernier_vidage': None,
+        # Protège le tampon et l'état du vidage: les erreurs peuvent être journalisées
+        # depuis d'autres threads que celui du jeu
+        'verrou': threading.Lock(),
+        'vidage': None
+    }
+
+def enregistrer_releve(enregistreur, numero_pas, etat_jeu, masque_touches):
+    """Écrire le relevé d'un pas à sa place dans le tampon, sans allocation"""
+    balle = etat_jeu['balle']
+    index_etats = enregistreur['index_etats']
+    with enregistreur['verrou']:
+        FORMAT_RELEVE.pack_into(
+            enregistreur['tampon'],
+            enregistreur['position'] * FORMAT_RELEVE.size,
+            numero_pas,
+            balle.x, balle.y, balle.dx, balle.dy,
+            *etat_jeu['raquette_rouge'].rect,
+            *etat_jeu['raquette_bleue'].rect,
+            masque_touches,
+            index_etats.get(balle.etat, 255),
+            index_etats.get(etat_jeu['gestionnaire_match'].etat, 255)
+        )
+        enregistreur['position'] = (enregistreur['position'] + 1) % enregistreur['capacite']
+        enregistreur['total'] += 1
+
+def copier_tampon(enregistreur):
+    """Copie des relevés du tampon, du plus ancien au plus récent; à appeler sous le verrou"""
+    taille = FORMAT_RELEVE.size
+    tampon = enregistreur['tampon']
+    if enregistreur['total'] < enregistreur['capacite']:
+        return bytes(tampon[:enregistreur['position'] * taille])
+    coupure = enregistreur['position'] * taille
+    return bytes(tampon[coupure:] + tampon[:coupure])
+
+def obtenir_releves(enregistreur):
+    """Relevés présents dans le tampon, du plus ancien au plus récent"""
+    with enregistreur['verrou']:
+        donnees = copier_tampon(enregistreur)
+    return list(FORMAT_RELEVE.iter_unpack(donnees))
+
+def ecrire_csv(chemin, raison, donnees, etats):
+    try:
+        os.makedirs(os.path.dirname(chemin), exist_ok=True)
+        with open(chemin, 'w', newline='', encoding='utf-8') as fichier:
+            fichier.write(f"# {raison}\n")
+            ecrivain = csv.writer(fichier)
+            ecrivain.writerow(COLONNES)
+            for releve in FORMAT_RELEVE.iter_unpack(donnees):
+                *valeurs, etat_balle, etat_match = releve
+                ecrivain.writerow([
+                    *valeurs,
+                    etats[etat_balle] if etat_balle < len(etats) else '',
+                    etats[etat_match] if etat_match < len(etats) else ''
+                ])
+        logger.info("Enregistreur de vol vidé dans %s (%s)", chemin, raison)
+    except Exception as e:
+        logger.warning("Impossible de vider l'enregistreur de vol: %s", e)
+
+def vider_enregistreur(enregistreur, raison, forcer=False):
+    """Copier le tampon sous le verrou, puis l'écrire dans un fichier CSV du dossier de
+    logs depuis un thread, sans bloquer l'appelant sur le disque. Retourne le chemin du
+    fichier, ou None si aucun vidage n'est lancé.
+
+    Hors demande explicite, au plus un vidage toutes les DELAI_MIN_ENTRE_VIDAGES
+    secondes, pour qu'une erreur répétée à chaque image ne sature pas le disque."""
+    maintenant = time.monotonic()
+    with enregistreur['verrou']:
+        vidage = enregistreur['vidage']
+        if vidage is not None and vidage.is_alive():
+            return None
+        if not forcer and enregistreur['dernier_vidage'] is not None and \
+           maintenant - enregistreur['dernier_vidage'] < DELAI_MIN_ENTRE_VIDAGES:
+            return None
+        enregistreur['dernier_vidage'] = maintenant
+        donnees = copier_tampon(enregistreur)
+        chemin = os.path.join(
+            enregistreur['dossier'],
+            f"enregistreur_vol_{time.strftime('%Y%m%d_%H%M%S')}_{enregistreur['total']}.csv"
+        )
+        vidage = threading.Thread(
+            target=ecrire_csv,
+            args=(chemin, raison, donnees, enregistreur['etats']),
+            name='vidage_enregistreur_vol',
+            daemon=True
+        )
+        enregistreur['vidage'] = vidage
+        vidage.start()
+    return chemin
+
+def attendre_vidage(enregistreur, delai=DELAI_FIN_VIDAGE):
+    """Attendre la fin de l'écriture du dernier vidage lancé"""
+    vidage = enregistreur['vidage']
+    if vidage is not None:
+        vidage.join(delai)
+
+class GestionnaireEnregistreurVol(logging.Handler):
+    """Vide l'enregistreur de vol dès qu'une erreur est journalisée"""
+    def __init__(self, enregistreur):
+        super().__init__(logging.ERROR)
+        self.enregistreur = enregistreur
+
+    def emit(self, record):
+        try:
+            vider_enregistreur(self.enregistreur, f"{record.levelname}: {record.getMessage()}")
+        except Exception:
+            self.handleError(record)
@@ -0,0 +1,67 @@
+import logging
+from collections.abc import MutableMapping
+
+logger = logging.getLogger('tennis_table')
+
+class EtatMutable(MutableMapping):
+    """Base des états de jeu à attributs fixes (dataclass avec __slots__).
+
+    Les fonctions de mise à jour modifient l'état sur place au lieu de recopier un
+    dictionnaire à chaque image; `copier` donne un instantané aux rares endroits
+    qui ont besoin de l'état précédent. L'accès par clé (balle['x']) reste
+    disponible pour le code qui manipule encore les états comme des dictionnaires."""
+    __slots__ = ()
+
+    # Champs mutables (pygame.Rect, listes) à dupliquer dans un instantané
+    CHAMPS_COPIES = ()
+
+    def __getitem__(self, cle):
+        try:
+            return getattr(self, cle)
+        except AttributeError:
+            raise KeyError(cle) from None
+
+    def __setitem__(self, cle, valeur):
+        try:
+            setattr(self, cle, valeur)
+        except AttributeError:
+            raise KeyError(cle) from None
+
+    def __delitem__(self, cle):
+        raise TypeError(f"Impossible de supprimer le champ {cle} d'un état")
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def copier(self, **modifications):
+        """Instantané indépendant de l'état, avec éventuellement quelques champs modifiés"""
+        copie = object.__new__(type(self))
+        for nom in self.__slots__:
+            setattr(copie, nom, getattr(self, nom))
+        for nom in self.CHAMPS_COPIES:
+            setattr(copie, nom, getattr(self, nom).copy())
+        for nom, valeur in modifications.items():
+            copie[nom] = valeur
+        return copie
+
+    def copier_dans(self, copie=None):
+        """Comme copier, mais en réécrivant une copie précédente (et ses rectangles et
+        listes) plutôt qu'en allouant un nouvel état à chaque image"""
+        if type(copie) is not type(self):
+            return self.copier()
+        for nom in self.__slots__:
+            if nom not in self.CHAMPS_COPIES:
+                setattr(copie, nom, getattr(self, nom))
+        for nom in self.CHAMPS_COPIES:
+            getattr(copie, nom)[:] = getattr(self, nom)
+        return copie
+
+def copier_etat_jeu(etat_jeu):
+    """Instantané d'un etat_jeu: chaque état mutable est copié, le reste est partagé"""
+    return {
+        nom: valeur.copier() if isinstance(valeur, EtatMutable) else valeur
+        for nom, valeur in etat_jeu.items()
+    }
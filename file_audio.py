@@ -0,0 +1,126 @@
+import os
+import sys
+import math
+import time
+import argparse
+import logging
+from collections import deque
+import pygame
+
+logger = logging.getLogger('tennis_table')
+
+VARIABLE_TAMPON_AUDIO = 'TENNIS_TABLE_TAMPON_AUDIO'
+# Un canal réservé par son: un nouveau coup coupe le précédent au lieu de prendre un canal au hasard
+CANAUX_RESERVES = ('coup_gauche', 'coup_droit', 'service')
+# Écart gauche/droite du panoramique: 1.0 pour un son entièrement dans un haut-parleur aux bords
+LARGEUR_STEREO = 0.8
+ECHANTILLONS_LATENCE = 1024
+
+def obtenir_taille_tampon_audio(regles, arguments=None):
+    """Taille du tampon du mixer: option --tampon-audio, sinon variable TENNIS_TABLE_TAMPON_AUDIO,
+    sinon TAMPON_AUDIO des règles. Plus petit: moins de latence, mais risque de coupures."""
+    analyseur = argparse.ArgumentParser(add_help=False)
+    analyseur.add_argument('--tampon-audio', dest='tampon_audio')
+    connus, _ = analyseur.parse_known_args(sys.argv[1:] if arguments is None else arguments)
+    valeur = connus.tampon_audio or os.environ.get(VARIABLE_TAMPON_AUDIO) or regles['TAMPON_AUDIO']
+    try:
+        taille = int(valeur)
+        if taille <= 0:
+            raise ValueError(valeur)
+        return taille
+    except ValueError:
+        logger.warning("Taille de tampon audio invalide: %s, %s utilisée", valeur, regles['TAMPON_AUDIO'])
+        return regles['TAMPON_AUDIO']
+
+def preinitialiser_mixer(regles, arguments=None):
+    """Configurer le mixer avant pygame.init(), qui l'initialise avec ces paramètres"""
+    tampon = obtenir_taille_tampon_audio(regles, arguments)
+    pygame.mixer.pre_init(regles['FREQUENCE_AUDIO'], -16, 2, tampon)
+    logger.info("Mixer: %s Hz, tampon de %s échantillons (%.1f ms)",
+                regles['FREQUENCE_AUDIO'], tampon, tampon * 1000 / regles['FREQUENCE_AUDIO'])
+    return tampon
+
+def creer_file_audio(regles, sons):
+    """File des sons émis par la physique, joués une fois par image sur des canaux réservés.
+
+    Retourne None sans sons ou sans mixer: la physique n'émet alors aucun événement."""
+    sons = {nom: son for nom, son in sons.items() if son and nom in CANAUX_RESERVES}
+    format_mixer = pygame.mixer.get_init()
+    if not sons or not format_mixer:
+        return None
+    try:
+        if pygame.mixer.get_num_channels() < len(CANAUX_RESERVES):
+            pygame.mixer.set_num_channels(len(CANAUX_RESERVES))
+        pygame.mixer.set_reserved(len(CANAUX_RESERVES))
+        canaux = {nom: pygame.mixer.Channel(index) for index, nom in enumerate(CANAUX_RESERVES)}
+    except Exception as e:
+        logger.warning("Impossible de réserver les canaux audio: %s", e)
+        return None
+
+    return {
+        'regles': regles,
+        'evenements': [],
+        'sons': sons,
+        'canaux': canaux,
+        'stereo': format_mixer[2] >= 2,
+        'intervalle_min': regles['INTERVALLE_MIN_SON'] / 1000,
+        'derniere_lecture': {nom: None for nom in CANAUX_RESERVES},
+        'joues': 0,
+        'fusionnes': 0,
+        'latences': deque(maxlen=ECHANTILLONS_LATENCE)
+    }
+
+def calculer_panoramique(x, largeur_ecran):
+    """Volumes gauche et droit à puissance constante selon la position horizontale"""
+    ratio = min(max(x / largeur_ecran, 0.0), 1.0)
+    angle = (0.5 + (ratio - 0.5) * LARGEUR_STEREO) * math.pi / 2
+    return math.cos(angle), math.sin(angle)
+
+def distribuer_sons(file_audio):
+    """Jouer les sons émis depuis l'image précédente.
+
+    Un même son émis plusieurs fois dans l'image, ou moins de INTERVALLE_MIN_SON ms
+    après sa dernière lecture, n'est joué qu'une fois; la position la plus récente
+    de la balle donne le panoramique."""
+    if not file_audio or not file_audio['evenements']:
+        return
+    evenements = file_audio['evenements']
+    derniers = {}
+    for nom, x, instant in evenements:
+        derniers[nom] = (x, instant)
+    file_audio['fusionnes'] += len(evenements) - len(derniers)
+    # Vider sur place: la balle garde une référence à cette liste
+    evenements.clear()
+
+    maintenant = time.perf_counter()
+    derniere_lecture = file_audio['derniere_lecture']
+    for nom, (x, instant) in derniers.items():
+        precedente = derniere_lecture[nom]
+        if precedente is not None and maintenant - precedente < file_audio['intervalle_min']:
+            file_audio['fusionnes'] += 1
+            continue
+        canal = file_audio['canaux'][nom]
+        try:
+            canal.play(file_audio['sons'][nom])
+            if file_audio['stereo']:
+                canal.set_volume(*calculer_panoramique(x, file_audio['regles']['LARGEUR_FENETRE']))
+        except Exception as e:
+            logger.warning("Erreur lors de la lecture du son %s: %s", nom, e)
+            continue
+        derniere_lecture[nom] = maintenant
+        file_audio['latences'].append(time.perf_counter() - instant)
+        file_audio['joues'] += 1
+
+def obtenir_statistiques_audio(file_audio):
+    if not file_audio:
+        return {}
+    latences = sorted(file_audio['latences'])
+    def centile(fraction):
+        return latences[min(len(latences) - 1, int(fraction * len(latences)))] * 1000 if latences else 0.0
+    return {
+        'joues': file_audio['joues'],
+        'fusionnes': file_audio['fusionnes'],
+        'latence_mediane_ms': centile(0.5),
+        'latence_p99_ms': centile(0.99),
+        'latence_max_ms': latences[-1] * 1000 if latences else 0.0
+    }
@@ -1,30 +1,40 @@
 import pygame
 import logging
+from dataclasses import dataclass, field
+from etats import EtatMutable
 from regles_tennis_table import creer_regles, est_avantage, est_gagnant_jeu, est_gagnant_match
+from statistiques_match import obtenir_vue_statistiques
 
 logger = logging.getLogger('tennis_table')
 
-def creer_gestionnaire_match():
+@dataclass(slots=True, eq=False)
+class GestionnaireMatch(EtatMutable):
+    regles: dict = field(repr=False)
+    etat: str
+    score_jeu_actuel1: int = 0
+    score_jeu_actuel2: int = 0
+    jeux_joueur1: int = 0
+    jeux_joueur2: int = 0
+    match_termine: bool = False
+    gagnant_match: int = None
+    historique_jeux: list = field(default_factory=list)
+    jeu_actuel: int = 1
+    dernier_changement: int = None
+    delai_prochain_jeu: int = None
+    changement_etat: bool = False
+
+    CHAMPS_COPIES = ('historique_jeux',)
+
+def creer_gestionnaire_match(regles=None):
     logger.debug("Création d'un nouveau gestionnaire de match")
-    regles = creer_regles()
-    gestionnaire = {
-        'regles': regles,
-        'score_jeu_actuel1': 0,
-        'score_jeu_actuel2': 0,
-        'jeux_joueur1': 0,
-        'jeux_joueur2': 0,
-        'match_termine': False,
-        'gagnant_match': None,
-        'etat': regles['ETATS_JEU']['PRET_A_SERVIR'],
-        'historique_jeux': [],
-        'jeu_actuel': 1
-    }
-    logger.debug(f"Gestionnaire créé: {gestionnaire}")
+    regles = regles or creer_regles()
+    gestionnaire = GestionnaireMatch(regles=regles, etat=regles['ETATS_JEU']['PRET_A_SERVIR'])
+    logger.debug("Gestionnaire créé: %s", gestionnaire)
     return gestionnaire
 
 def commencer_nouveau_jeu(gestionnaire):
     logger.debug("Démarrage d'un nouveau jeu")
-    regles = gestionnaire['regles']
+    regles = gestionnaire.regles
     nouveau_jeu = {
         'score_joueur1': 0,
         'score_joueur2': 0,
@@ -32,99 +42,98 @@ def commencer_nouveau_jeu(gestionnaire):
         'jeux_joueur2': 0,
         'etat': regles['ETATS_JEU']['PRET_A_SERVIR']
     }
-    logger.debug(f"Nouveau jeu créé: {nouveau_jeu}")
+    logger.debug("Nouveau jeu créé: %s", nouveau_jeu)
     return nouveau_jeu
 
-def mettre_a_jour_score(gestionnaire, score1, score2):
-    logger.debug(f"Mise à jour du score: {score1}-{score2}")
-    ancien_etat = gestionnaire['etat']
-    nouveau_gestionnaire = {
-        **gestionnaire,
-        'score_jeu_actuel1': score1,
-        'score_jeu_actuel2': score2,
-        'dernier_changement': pygame.time.get_ticks()
-    }
+def mettre_a_jour_score(gestionnaire, score1, score2, temps_actuel=None):
+    logger.debug("Mise à jour du score: %s-%s", score1, score2)
+    if temps_actuel is None:
+        temps_actuel = pygame.time.get_ticks()
+    ancien_etat = gestionnaire.etat
+    gestionnaire.score_jeu_actuel1 = score1
+    gestionnaire.score_jeu_actuel2 = score2
+    gestionnaire.dernier_changement = temps_actuel
     
-    if est_gagnant_jeu(nouveau_gestionnaire['regles'], score1, score2):
+    if est_gagnant_jeu(gestionnaire.regles, score1, score2):
         logger.debug("Jeu terminé détecté")
-        nouveau_gestionnaire['etat'] = nouveau_gestionnaire['regles']['ETATS_JEU']['JEU_TERMINE']
-        nouveau_gestionnaire['delai_prochain_jeu'] = pygame.time.get_ticks() + 2000
-    elif est_avantage(nouveau_gestionnaire['regles'], score1, score2):
+        gestionnaire.etat = gestionnaire.regles['ETATS_JEU']['JEU_TERMINE']
+        gestionnaire.delai_prochain_jeu = temps_actuel + 2000
+    elif est_avantage(gestionnaire.regles, score1, score2):
         logger.debug("Avantage détecté")
-        nouveau_gestionnaire['etat'] = nouveau_gestionnaire['regles']['ETATS_JEU']['AVANTAGE']
+        gestionnaire.etat = gestionnaire.regles['ETATS_JEU']['AVANTAGE']
     
-    if ancien_etat != nouveau_gestionnaire['etat']:
-        logger.debug(f"Changement d'état: {ancien_etat} -> {nouveau_gestionnaire['etat']}")
-        nouveau_gestionnaire['changement_etat'] = True
+    if ancien_etat != gestionnaire.etat:
+        logger.debug("Changement d'état: %s -> %s", ancien_etat, gestionnaire.etat)
+        gestionnaire.changement_etat = True
     
-    return nouveau_gestionnaire
+    return gestionnaire
 
 def incrementer_jeux_joueur(gestionnaire, joueur, score_final):
-    logger.debug(f"Incrémentation des jeux pour joueur {joueur}, score final: {score_final}")
-    nouveau_gestionnaire = {
-        **gestionnaire,
-        'historique_jeux': [*gestionnaire['historique_jeux'], score_final],
-        'etat': gestionnaire['regles']['ETATS_JEU']['JEU_TERMINE']
-    }
+    logger.debug("Incrémentation des jeux pour joueur %s, score final: %s", joueur, score_final)
+    gestionnaire.historique_jeux.append(score_final)
     
     if joueur == 1:
-        nouveau_gestionnaire['jeux_joueur1'] = gestionnaire['jeux_joueur1'] + 1
-        logger.debug(f"Jeux joueur 1: {nouveau_gestionnaire['jeux_joueur1']}")
+        gestionnaire.jeux_joueur1 += 1
+        logger.debug("Jeux joueur 1: %s", gestionnaire.jeux_joueur1)
     else:
-        nouveau_gestionnaire['jeux_joueur2'] = gestionnaire['jeux_joueur2'] + 1
-        logger.debug(f"Jeux joueur 2: {nouveau_gestionnaire['jeux_joueur2']}")
+        gestionnaire.jeux_joueur2 += 1
+        logger.debug("Jeux joueur 2: %s", gestionnaire.jeux_joueur2)
             
     gagnant_match = est_gagnant_match(
-        nouveau_gestionnaire['regles'],
-        nouveau_gestionnaire['jeux_joueur1'], 
-        nouveau_gestionnaire['jeux_joueur2'])
+        gestionnaire.regles,
+        gestionnaire.jeux_joueur1, 
+        gestionnaire.jeux_joueur2)
         
     if gagnant_match:
-        logger.debug(f"Match terminé, gagnant: Joueur {gagnant_match}")
-        nouveau_gestionnaire['match_termine'] = True
-        nouveau_gestionnaire['gagnant_match'] = gagnant_match
-        nouveau_gestionnaire['etat'] = nouveau_gestionnaire['regles']['ETATS_JEU']['MATCH_TERMINE']
+        logger.debug("Match terminé, gagnant: Joueur %s", gagnant_match)
+        gestionnaire.match_termine = True
+        gestionnaire.gagnant_match = gagnant_match
+        gestionnaire.etat = gestionnaire.regles['ETATS_JEU']['MATCH_TERMINE']
     else:
         logger.debug("Passage au jeu suivant")
-        nouveau_gestionnaire['jeu_actuel'] = gestionnaire['jeu_actuel'] + 1
-        nouveau_gestionnaire['etat'] = nouveau_gestionnaire['regles']['ETATS_JEU']['PRET_A_SERVIR']
+        gestionnaire.jeu_actuel += 1
+        gestionnaire.etat = gestionnaire.regles['ETATS_JEU']['PRET_A_SERVIR']
     
-    return nouveau_gestionnaire
+    return gestionnaire
 
 def verifier_progression_jeu(gestionnaire):
     logger.debug("Vérification de la progression du jeu")
     gagnant = est_gagnant_jeu(
-        gestionnaire['regles'],
-        gestionnaire['score_jeu_actuel1'], 
-        gestionnaire['score_jeu_actuel2'])
-    logger.debug(f"Gagnant trouvé: {gagnant}")
+        gestionnaire.regles,
+        gestionnaire.score_jeu_actuel1, 
+        gestionnaire.score_jeu_actuel2)
+    logger.debug("Gagnant trouvé: %s", gagnant)
     return gagnant
 
-def obtenir_statistiques_match(gestionnaire):
+def obtenir_statistiques_match(gestionnaire, statistiques=None):
+    """Statistiques du match; avec `statistiques` (etat_jeu['statistiques']), y ajoute la
+    vue des échanges tenue à jour par événement"""
     logger.debug("Récupération des statistiques du match")
     try:
-        total_points_j1 = sum(jeu[0] for jeu in gestionnaire['historique_jeux'])
-        total_points_j2 = sum(jeu[1] for jeu in gestionnaire['historique_jeux'])
+        total_points_j1 = sum(jeu[0] for jeu in gestionnaire.historique_jeux)
+        total_points_j2 = sum(jeu[1] for jeu in gestionnaire.historique_jeux)
         
         stats = {
-            'jeux_joues': len(gestionnaire['historique_jeux']),
-            'jeux_joueur1': gestionnaire['jeux_joueur1'],
-            'jeux_joueur2': gestionnaire['jeux_joueur2'],
+            'jeux_joues': len(gestionnaire.historique_jeux),
+            'jeux_joueur1': gestionnaire.jeux_joueur1,
+            'jeux_joueur2': gestionnaire.jeux_joueur2,
             'points_totaux_joueur1': total_points_j1,
             'points_totaux_joueur2': total_points_j2,
-            'historique_jeux': gestionnaire['historique_jeux'],
-            'match_termine': gestionnaire['match_termine'],
-            'gagnant_match': gestionnaire['gagnant_match'],
-            'jeu_actuel': gestionnaire['jeu_actuel'],
-            'total_jeux_possibles': gestionnaire['regles']['TOTAL_JEUX_POSSIBLES'],
-            'etat': gestionnaire['etat']
+            'historique_jeux': gestionnaire.historique_jeux,
+            'match_termine': gestionnaire.match_termine,
+            'gagnant_match': gestionnaire.gagnant_match,
+            'jeu_actuel': gestionnaire.jeu_actuel,
+            'total_jeux_possibles': gestionnaire.regles['TOTAL_JEUX_POSSIBLES'],
+            'etat': gestionnaire.etat
         }
-        logger.debug(f"Statistiques calculées: {stats}")
+        if statistiques is not None:
+            stats['echanges'] = obtenir_vue_statistiques(statistiques)
+        logger.debug("Statistiques calculées: %s", stats)
         return stats
     except Exception as e:
-        logger.error(f"Erreur lors du calcul des statistiques: {e}")
+        logger.error("Erreur lors du calcul des statistiques: %s", e)
         return None
 
 def reinitialiser(gestionnaire):
     logger.debug("Réinitialisation du gestionnaire de match")
-    return creer_gestionnaire_match()
\ No newline at end of file
+    return creer_gestionnaire_match(gestionnaire.regles)
\ No newline at end of file
@@ -1,136 +1,141 @@
 import random
-import time
 import logging
+from dataclasses import dataclass, field
+from etats import EtatMutable
 from regles_tennis_table import creer_regles, est_avantage
 
 logger = logging.getLogger('tennis_table')
 
-def creer_gestionnaire_service():
+@dataclass(slots=True, eq=False)
+class GestionnaireService(EtatMutable):
+    regles: dict = field(repr=False)
+    serveur_actuel: int
+    compte_service: int
+    services_par_tour: int
+    est_egalite: bool
+    let_service: bool
+    etat: str
+    service_depuis_gauche: bool
+    generateur: random.Random = field(repr=False)
+
+def creer_gestionnaire_service(regles=None, generateur=None):
     logger.debug("Création d'un nouveau gestionnaire de service")
-    regles = creer_regles()
+    regles = regles or creer_regles()
+    generateur = generateur or random.Random()
     
-    heure_actuelle = time.time()
-    random.seed(heure_actuelle)
-    serveur_initial = random.choice([1, 2])
+    serveur_initial = generateur.choice([1, 2])
     
-    gestionnaire = {
-        'regles': regles,
-        'serveur_actuel': serveur_initial,
-        'compte_service': 0,
-        'services_par_tour': regles['SERVICES_PAR_TOUR'],
-        'est_egalite': False,
-        'let_service': False,
-        'etat': regles['ETATS_JEU']['PRET_A_SERVIR'],
-        'service_depuis_gauche': serveur_initial == 1
-    }
-    logger.debug(f"Gestionnaire service créé: {gestionnaire}")
+    gestionnaire = GestionnaireService(
+        regles=regles,
+        serveur_actuel=serveur_initial,
+        compte_service=0,
+        services_par_tour=regles['SERVICES_PAR_TOUR'],
+        est_egalite=False,
+        let_service=False,
+        etat=regles['ETATS_JEU']['PRET_A_SERVIR'],
+        service_depuis_gauche=serveur_initial == 1,
+        generateur=generateur
+    )
+    logger.debug("Gestionnaire service créé: %s", gestionnaire)
     return gestionnaire
 
 def mettre_a_jour_compte_service(gestionnaire, score1, score2):
-    logger.debug(f"Mise à jour du compte service pour score {score1}-{score2}")
-    nouveau_gestionnaire = {**gestionnaire}
-    
+    logger.debug("Mise à jour du compte service pour score %s-%s", score1, score2)
     try:
-        if est_avantage(gestionnaire['regles'], score1, score2):
+        # Le compte et le nombre de services par tour d'avant l'égalité décident
+        # encore du changement de serveur pour ce point
+        compte_service = gestionnaire.compte_service
+        services_par_tour = gestionnaire.services_par_tour
+        if est_avantage(gestionnaire.regles, score1, score2):
             logger.debug("Situation d'avantage détectée")
-            if not gestionnaire['est_egalite']:
-                nouveau_gestionnaire.update({
-                    'est_egalite': True,
-                    'services_par_tour': 1,
-                    'compte_service': 0
-                })
+            if not gestionnaire.est_egalite:
+                gestionnaire.est_egalite = True
+                gestionnaire.services_par_tour = 1
         
-        nouveau_gestionnaire['compte_service'] = gestionnaire['compte_service'] + 1
-        logger.debug(f"Nouveau compte service: {nouveau_gestionnaire['compte_service']}")
+        gestionnaire.compte_service = compte_service + 1
+        logger.debug("Nouveau compte service: %s", gestionnaire.compte_service)
         
-        if nouveau_gestionnaire['compte_service'] >= gestionnaire['services_par_tour']:
+        if gestionnaire.compte_service >= services_par_tour:
             logger.debug("Changement de serveur nécessaire")
-            nouveau_gestionnaire = changer_serveur(nouveau_gestionnaire)
-            nouveau_gestionnaire['compte_service'] = 0
+            changer_serveur(gestionnaire)
+            gestionnaire.compte_service = 0
                 
-        nouveau_gestionnaire['etat'] = gestionnaire['regles']['ETATS_JEU']['PRET_A_SERVIR']
+        gestionnaire.etat = gestionnaire.regles['ETATS_JEU']['PRET_A_SERVIR']
         
-        return nouveau_gestionnaire
+        return gestionnaire
     except Exception as e:
-        logger.error(f"Erreur lors de la mise à jour du compte service: {e}")
+        logger.error("Erreur lors de la mise à jour du compte service: %s", e)
         raise
 
 def changer_serveur(gestionnaire):
     logger.debug("Changement de serveur")
     try:
-        nouveau_serveur = 3 - gestionnaire['serveur_actuel']
-        nouveau_gestionnaire = {
-            **gestionnaire,
-            'serveur_actuel': nouveau_serveur,
-            'service_depuis_gauche': nouveau_serveur == 1,
-            'let_service': False,
-            'etat': gestionnaire['regles']['ETATS_JEU']['PRET_A_SERVIR']
-        }
-        logger.debug(f"Nouveau serveur: {nouveau_serveur}")
-        return nouveau_gestionnaire
+        nouveau_serveur = 3 - gestionnaire.serveur_actuel
+        gestionnaire.serveur_actuel = nouveau_serveur
+        gestionnaire.service_depuis_gauche = nouveau_serveur == 1
+        gestionnaire.let_service = False
+        gestionnaire.etat = gestionnaire.regles['ETATS_JEU']['PRET_A_SERVIR']
+        logger.debug("Nouveau serveur: %s", nouveau_serveur)
+        return gestionnaire
     except Exception as e:
-        logger.error(f"Erreur lors du changement de serveur: {e}")
+        logger.error("Erreur lors du changement de serveur: %s", e)
         raise
 
 def commencer_service(gestionnaire):
     logger.debug("Début du service")
-    return {
-        **gestionnaire,
-        'etat': gestionnaire['regles']['ETATS_JEU']['SERVICE_COMMENCE']
-    }
+    gestionnaire.etat = gestionnaire.regles['ETATS_JEU']['SERVICE_COMMENCE']
+    return gestionnaire
 
 def gerer_le_service(gestionnaire):
     logger.debug("Gestion du let service")
-    return {
-        **gestionnaire,
-        'let_service': True,
-        'etat': gestionnaire['regles']['ETATS_JEU']['PRET_A_SERVIR']
-    }
+    gestionnaire.let_service = True
+    gestionnaire.etat = gestionnaire.regles['ETATS_JEU']['PRET_A_SERVIR']
+    return gestionnaire
 
 def obtenir_position_service(gestionnaire):
     logger.debug("Calcul de la position de service")
     try:
-        if gestionnaire['service_depuis_gauche']:
-            position = gestionnaire['regles']['TABLE_X'] + 30
+        if gestionnaire.service_depuis_gauche:
+            position = gestionnaire.regles['TABLE_X'] + 30
         else:
-            position = gestionnaire['regles']['TABLE_X'] + gestionnaire['regles']['LARGEUR_TABLE_PIXELS'] - 30
-        logger.debug(f"Position de service calculée: {position}")
+            position = gestionnaire.regles['TABLE_X'] + gestionnaire.regles['LARGEUR_TABLE_PIXELS'] - 30
+        logger.debug("Position de service calculée: %s", position)
         return position
     except Exception as e:
-        logger.error(f"Erreur lors du calcul de la position de service: {e}")
+        logger.error("Erreur lors du calcul de la position de service: %s", e)
         raise
 
 def reinitialiser(gestionnaire):
     logger.debug("Réinitialisation du gestionnaire de service")
-    return creer_gestionnaire_service()
+    return creer_gestionnaire_service(gestionnaire.regles, gestionnaire.generateur)
 
 def obtenir_info_service(gestionnaire):
     logger.debug("Récupération des informations de service")
     return {
-        'serveur_actuel': gestionnaire['serveur_actuel'],
-        'services_restants': gestionnaire['services_par_tour'] - gestionnaire['compte_service'],
-        'est_egalite': gestionnaire['est_egalite'],
-        'service_depuis_gauche': gestionnaire['service_depuis_gauche'],
-        'etat': gestionnaire['etat'],
-        'let_service': gestionnaire['let_service']
+        'serveur_actuel': gestionnaire.serveur_actuel,
+        'services_restants': gestionnaire.services_par_tour - gestionnaire.compte_service,
+        'est_egalite': gestionnaire.est_egalite,
+        'service_depuis_gauche': gestionnaire.service_depuis_gauche,
+        'etat': gestionnaire.etat,
+        'let_service': gestionnaire.let_service
     }
 
 def est_pret_a_servir(gestionnaire):
     try:
-        resultat = gestionnaire['etat'] == gestionnaire['regles']['ETATS_JEU']['PRET_A_SERVIR']
-        logger.debug(f"Vérification prêt à servir: {resultat}")
+        resultat = gestionnaire.etat == gestionnaire.regles['ETATS_JEU']['PRET_A_SERVIR']
+        logger.debug("Vérification prêt à servir: %s", resultat)
         return resultat
     except Exception as e:
-        logger.error(f"Erreur lors de la vérification prêt à servir: {e}")
+        logger.error("Erreur lors de la vérification prêt à servir: %s", e)
         raise
 
 def est_en_service(gestionnaire):
     try:
-        resultat = gestionnaire['etat'] == gestionnaire['regles']['ETATS_JEU']['SERVICE_COMMENCE']
-        logger.debug(f"Vérification en service: {resultat}")
+        resultat = gestionnaire.etat == gestionnaire.regles['ETATS_JEU']['SERVICE_COMMENCE']
+        logger.debug("Vérification en service: %s", resultat)
         return resultat
     except Exception as e:
-        logger.error(f"Erreur lors de la vérification en service: {e}")
+        logger.error("Erreur lors de la vérification en service: %s", e)
         raise
 
 def servir(gestionnaire):
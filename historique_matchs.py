@@ -0,0 +1,295 @@
+import os
+import time
+import queue
+import uuid
+import sqlite3
+import logging
+import threading
+from itertools import groupby
+
+logger = logging.getLogger('tennis_table')
+
+VARIABLE_HISTORIQUE = 'TENNIS_TABLE_HISTORIQUE'
+FICHIER_HISTORIQUE = 'historique.sqlite3'
+VERSION_SCHEMA = 1
+# Lot d'écriture: au plus TAILLE_LOT enregistrements, regroupés pendant DELAI_LOT secondes
+TAILLE_LOT = 500
+DELAI_LOT = 0.5
+DELAI_FERMETURE = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matchs (
+    id TEXT PRIMARY KEY,
+    debut REAL NOT NULL,
+    fin REAL,
+    graine INTEGER,
+    mode TEXT NOT NULL,
+    niveau INTEGER,
+    vitesse_balle REAL,
+    gagnant INTEGER,
+    jeux_joueur1 INTEGER NOT NULL DEFAULT 0,
+    jeux_joueur2 INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_matchs_debut ON matchs (debut);
+CREATE INDEX IF NOT EXISTS idx_matchs_mode_niveau ON matchs (mode, niveau, gagnant);
+
+CREATE TABLE IF NOT EXISTS jeux (
+    match_id TEXT NOT NULL REFERENCES matchs (id),
+    numero INTEGER NOT NULL,
+    score_joueur1 INTEGER NOT NULL,
+    score_joueur2 INTEGER NOT NULL,
+    gagnant INTEGER NOT NULL,
+    PRIMARY KEY (match_id, numero)
+);
+
+CREATE TABLE IF NOT EXISTS points (
+    match_id TEXT NOT NULL REFERENCES matchs (id),
+    numero INTEGER NOT NULL,
+    jeu INTEGER NOT NULL,
+    gagnant INTEGER NOT NULL,
+    serveur INTEGER,
+    score_joueur1 INTEGER NOT NULL,
+    score_joueur2 INTEGER NOT NULL,
+    temps_ms INTEGER,
+    PRIMARY KEY (match_id, numero)
+);
+CREATE INDEX IF NOT EXISTS idx_points_jeu ON points (match_id, jeu);
+
+CREATE TABLE IF NOT EXISTS echanges (
+    match_id TEXT NOT NULL,
+    numero_point INTEGER NOT NULL,
+    duree_ms INTEGER NOT NULL,
+    coups INTEGER NOT NULL,
+    vitesse_max REAL NOT NULL,
+    PRIMARY KEY (match_id, numero_point),
+    FOREIGN KEY (match_id, numero_point) REFERENCES points (match_id, numero)
+);
+"""
+
+# Requêtes de l'écrivain, par type d'enregistrement déposé dans la file
+REQUETES = {
+    'match': "INSERT INTO matchs (id, debut, graine, mode, niveau, vitesse_balle) VALUES (?, ?, ?, ?, ?, ?)",
+    'jeu': "INSERT INTO jeux VALUES (?, ?, ?, ?, ?)",
+    'point': "INSERT INTO points VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    'echange': "INSERT INTO echanges VALUES (?, ?, ?, ?, ?)",
+    'fin': "UPDATE matchs SET fin = ?, gagnant = ?, jeux_joueur1 = ?, jeux_joueur2 = ? WHERE id = ?"
+}
+ARRET = None
+
+def obtenir_chemin_historique():
+    """Fichier de la base: variable TENNIS_TABLE_HISTORIQUE, sinon historique.sqlite3.
+    Une valeur vide ou '0' désactive l'historique (None)."""
+    chemin = os.environ.get(VARIABLE_HISTORIQUE, FICHIER_HISTORIQUE)
+    return chemin if chemin not in ('', '0') else None
+
+def connecter(chemin):
+    connexion = sqlite3.connect(chemin)
+    connexion.execute("PRAGMA journal_mode=WAL")
+    # En WAL, NORMAL ne synchronise le disque qu'aux points de contrôle
+    connexion.execute("PRAGMA synchronous=NORMAL")
+    connexion.execute("PRAGMA foreign_keys=ON")
+    return connexion
+
+def initialiser_base(connexion):
+    version = connexion.execute("PRAGMA user_version").fetchone()[0]
+    if version > VERSION_SCHEMA:
+        raise RuntimeError(f"Historique créé par une version plus récente (schéma {version})")
+    with connexion:
+        connexion.executescript(SCHEMA)
+        connexion.execute(f"PRAGMA user_version={VERSION_SCHEMA}")
+
+class EcrivainHistorique(threading.Thread):
+    """Vide la file de l'historique et écrit ses enregistrements par lots, une transaction par lot.
+
+    La connexion SQLite est créée et utilisée dans ce thread seulement."""
+    def __init__(self, chemin, file):
+        super().__init__(name='ecrivain_historique', daemon=True)
+        self.chemin = chemin
+        self.file = file
+        self.pret = threading.Event()
+        self.erreur = None
+        self.lots = 0
+        self.enregistrements = 0
+
+    def run(self):
+        try:
+            connexion = connecter(self.chemin)
+            initialiser_base(connexion)
+        except Exception as e:
+            logger.error("Impossible d'ouvrir l'historique %s: %s", self.chemin, e, exc_info=True)
+            self.erreur = e
+            self.pret.set()
+            return
+        self.pret.set()
+        try:
+            en_cours = True
+            while en_cours:
+                lot, en_cours = self.collecter_lot()
+                if lot:
+                    self.ecrire_lot(connexion, lot)
+        finally:
+            connexion.close()
+
+    def collecter_lot(self):
+        """Attendre un enregistrement, puis regrouper ceux qui arrivent pendant DELAI_LOT"""
+        premier = self.file.get()
+        if premier is ARRET:
+            return [], False
+        lot = [premier]
+        limite = time.monotonic() + DELAI_LOT
+        while len(lot) < TAILLE_LOT:
+            restant = limite - time.monotonic()
+            try:
+                enregistrement = self.file.get(timeout=restant) if restant > 0 else self.file.get_nowait()
+            except queue.Empty:
+                break
+            if enregistrement is ARRET:
+                return lot, False
+            lot.append(enregistrement)
+        return lot, True
+
+    def ecrire_lot(self, connexion, lot):
+        try:
+            with connexion:
+                # Les suites d'enregistrements de même type passent en un seul executemany,
+                # dans l'ordre de la file (un match avant ses points, ses points avant sa fin)
+                for genre, enregistrements in groupby(lot, key=lambda enregistrement: enregistrement[0]):
+                    connexion.executemany(REQUETES[genre], [valeurs for _, valeurs in enregistrements])
+            self.lots += 1
+            self.enregistrements += len(lot)
+        except Exception as e:
+            # Le lot entier est annulé: le réécrire enregistrement par enregistrement, pour
+            # ne perdre que les fautifs (et garder le match dont dépendent ses points)
+            logger.warning("Lot de %s enregistrements de l'historique refusé (%s), écriture un par un",
+                           len(lot), e)
+            self.ecrire_un_par_un(connexion, lot)
+
+    def ecrire_un_par_un(self, connexion, lot):
+        """Repli après l'échec d'un lot: une transaction par enregistrement"""
+        ecrits = 0
+        for genre, valeurs in lot:
+            try:
+                with connexion:
+                    connexion.execute(REQUETES[genre], valeurs)
+                ecrits += 1
+            except Exception as e:
+                logger.error("Enregistrement '%s' de l'historique abandonné: %s", genre, e, exc_info=True)
+        self.lots += 1
+        self.enregistrements += ecrits
+
+def ouvrir_historique(chemin=None):
+    """Historique des matchs: le thread de jeu ne fait que déposer des enregistrements
+    dans une file, écrits par EcrivainHistorique. Retourne None si la base est
+    désactivée ou ne peut pas être ouverte."""
+    chemin = chemin or obtenir_chemin_historique()
+    if not chemin:
+        return None
+    file = queue.SimpleQueue()
+    ecrivain = EcrivainHistorique(chemin, file)
+    ecrivain.start()
+    ecrivain.pret.wait()
+    if ecrivain.erreur is not None:
+        return None
+    logger.info("Historique des matchs: %s", chemin)
+    return {
+        'chemin': chemin,
+        'file': file,
+        'ecrivain': ecrivain,
+        'match_actuel': None,
+        'numero_point': 0
+    }
+
+def commencer_match(historique, graine, mode, niveau, vitesse_balle):
+    if not historique:
+        return
+    historique['match_actuel'] = uuid.uuid4().hex
+    historique['numero_point'] = 0
+    historique['file'].put(('match', (historique['match_actuel'], time.time(), graine, mode, niveau, vitesse_balle)))
+
+def ajouter_point(historique, etat_jeu, gagnant, serveur, temps_actuel):
+    """Point marqué, avec son échange lu dans etat_jeu['statistiques']; à appeler
+    après la mise à jour du score et avant la remise à zéro d'un jeu terminé"""
+    match_id = historique['match_actuel']
+    if match_id is None:
+        return
+    historique['numero_point'] += 1
+    numero = historique['numero_point']
+    score = etat_jeu['score']
+    file = historique['file']
+    file.put(('point', (match_id, numero, etat_jeu['gestionnaire_match'].jeu_actuel, gagnant, serveur,
+                        score.score_joueur1, score.score_joueur2, temps_actuel)))
+    statistiques = etat_jeu.get('statistiques')
+    if statistiques:
+        file.put(('echange', (match_id, numero, statistiques.duree_dernier_echange,
+                              statistiques.coups_echange, statistiques.vitesse_max_echange)))
+
+def ajouter_jeu(historique, numero, score_final, gagnant):
+    match_id = historique['match_actuel']
+    if match_id is not None:
+        historique['file'].put(('jeu', (match_id, numero, score_final[0], score_final[1], gagnant)))
+
+def terminer_match(historique, gestionnaire_match):
+    match_id = historique['match_actuel']
+    if match_id is None:
+        return
+    historique['file'].put(('fin', (time.time(), gestionnaire_match.gagnant_match,
+                                    gestionnaire_match.jeux_joueur1, gestionnaire_match.jeux_joueur2, match_id)))
+    historique['match_actuel'] = None
+
+def fermer_historique(historique, delai=DELAI_FERMETURE):
+    """Écrire ce qui reste dans la file et arrêter l'écrivain"""
+    if not historique:
+        return
+    ecrivain = historique['ecrivain']
+    historique['file'].put(ARRET)
+    ecrivain.join(delai)
+    if ecrivain.is_alive():
+        logger.warning("L'historique n'a pas fini d'écrire en %s s", delai)
+    else:
+        logger.info("Historique fermé: %s enregistrements en %s transactions",
+                    ecrivain.enregistrements, ecrivain.lots)
+
+def ouvrir_lecture(chemin=None):
+    """Connexion en lecture seule pour les requêtes, indépendante de l'écrivain, à la
+    même base que ouvrir_historique. Retourne None si l'historique est désactivé."""
+    chemin = chemin or obtenir_chemin_historique()
+    if not chemin:
+        return None
+    connexion = sqlite3.connect(f"file:{chemin}?mode=ro", uri=True)
+    connexion.row_factory = sqlite3.Row
+    return connexion
+
+def derniers_matchs(connexion, nombre=10):
+    """Les `nombre` derniers matchs terminés, du plus récent au plus ancien"""
+    lignes = connexion.execute(
+        "SELECT * FROM matchs WHERE fin IS NOT NULL ORDER BY debut DESC LIMIT ?", (nombre,))
+    return [dict(ligne) for ligne in lignes]
+
+def face_a_face(connexion, mode=None, niveau=None):
+    """Bilan joueur 1 contre joueur 2 (ou contre l'ordinateur) sur les matchs terminés"""
+    conditions, parametres = ["fin IS NOT NULL"], []
+    if mode is not None:
+        conditions.append("mode = ?")
+        parametres.append(mode)
+    if niveau is not None:
+        conditions.append("niveau = ?")
+        parametres.append(niveau)
+    ligne = connexion.execute(
+        "SELECT COUNT(*) AS matchs,"
+        " COALESCE(SUM(gagnant = 1), 0) AS victoires_joueur1,"
+        " COALESCE(SUM(gagnant = 2), 0) AS victoires_joueur2,"
+        " COALESCE(SUM(jeux_joueur1), 0) AS jeux_joueur1,"
+        " COALESCE(SUM(jeux_joueur2), 0) AS jeux_joueur2"
+        f" FROM matchs WHERE {' AND '.join(conditions)}", parametres).fetchone()
+    return dict(ligne)
+
+def taux_victoire_par_niveau(connexion, mode=None):
+    """Taux de victoire du joueur 1 par niveau de difficulté, niveaux croissants"""
+    requete = ("SELECT niveau, COUNT(*) AS matchs, SUM(gagnant = 1) AS victoires_joueur1,"
+               " AVG(gagnant = 1) AS taux_victoire_joueur1 FROM matchs WHERE fin IS NOT NULL")
+    parametres = []
+    if mode is not None:
+        requete += " AND mode = ?"
+        parametres.append(mode)
+    lignes = connexion.execute(requete + " GROUP BY niveau ORDER BY niveau", parametres)
+    return [dict(ligne) for ligne in lignes]
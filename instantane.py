@@ -0,0 +1,198 @@
+import math
+import struct
+import logging
+
+logger = logging.getLogger('tennis_table')
+
+# Instantané binaire à disposition fixe de l'état simulé d'un match (121 octets).
+# Seuls les champs qui survivent d'un pas physique au suivant sont enregistrés:
+# les champs recalculés à chaque pas (x_precedent, zone_precedente, dx des raquettes...)
+# et les ressources (sons, images, règles) restent ceux de l'etat_jeu restauré.
+VERSION = 1
+HISTORIQUE_MAX = 7
+AUCUN = -1
+AUCUN_ETAT = 255
+
+FORMAT = struct.Struct(
+    '<B'                            # version
+    'ddddIBB'                       # balle: x, y, dx, dy, trajectoire, etat, drapeaux
+    'hhi'                           # raquette rouge: x, y, temps_dernier_impact
+    'hhi'                           # raquette bleue
+    'BBBBBBBBB'                     # score: points, jeux, gagnants, avantage, dernier point, drapeaux
+    'BBBBB'                         # service: serveur, compte, services par tour, etat, drapeaux
+    'BBBBBBBBii'                    # match: etat, points, jeux, gagnant, jeu actuel, drapeaux, temps
+    f'B{2 * HISTORIQUE_MAX}B'       # match: nombre de jeux joués puis scores de chaque jeu
+    'Bdiii'                         # adversaire CPU: présent, y_cible, trajectoire, temps
+)
+TAILLE = FORMAT.size
+
+def _ou_aucun(valeur, aucun=0):
+    return aucun if valeur is None else valeur
+
+def _ou_none(valeur, aucun=0):
+    return None if valeur == aucun else valeur
+
+def _drapeaux(*valeurs):
+    masque = 0
+    for bit, valeur in enumerate(valeurs):
+        if valeur:
+            masque |= 1 << bit
+    return masque
+
+def _bits(masque, nombre):
+    return [bool(masque >> bit & 1) for bit in range(nombre)]
+
+def _index_etat(etats, etat):
+    return AUCUN_ETAT if etat is None else etats.index(etat)
+
+def _etat_index(etats, index):
+    return None if index == AUCUN_ETAT else etats[index]
+
+def capturer_instantane(etat_jeu):
+    """Instantané compact (bytes) de la balle, des raquettes, du score, du service,
+    du match et de l'adversaire CPU.
+
+    Le flux aléatoire du match n'en fait pas partie: pour un retour en arrière exact,
+    conserver à côté etat_jeu['generateur'].getstate()."""
+    try:
+        etats = list(etat_jeu['regles']['ETATS_JEU'].values())
+        balle = etat_jeu['balle']
+        rouge = etat_jeu['raquette_rouge']
+        bleue = etat_jeu['raquette_bleue']
+        score = etat_jeu['score']
+        service = etat_jeu['gestionnaire_service']
+        match = etat_jeu['gestionnaire_match']
+        adversaire = etat_jeu.get('adversaire_cpu')
+
+        historique = match.historique_jeux
+        if len(historique) > HISTORIQUE_MAX:
+            raise ValueError(f"Plus de {HISTORIQUE_MAX} jeux dans l'historique du match")
+        scores_jeux = [point for jeu in historique for point in jeu]
+        scores_jeux += [0] * (2 * HISTORIQUE_MAX - len(scores_jeux))
+
+        return FORMAT.pack(
+            VERSION,
+            balle.x, balle.y, balle.dx, balle.dy, balle.trajectoire,
+            _index_etat(etats, balle.etat),
+            _drapeaux(balle.au_service, balle.active,
+                      balle.service_depuis_gauche is not None, balle.service_depuis_gauche),
+            rouge.rect.x, rouge.rect.y, rouge.temps_dernier_impact,
+            bleue.rect.x, bleue.rect.y, bleue.temps_dernier_impact,
+            score.score_joueur1, score.score_joueur2, score.jeux_joueur1, score.jeux_joueur2,
+            _ou_aucun(score.gagnant_jeu), _ou_aucun(score.gagnant_match),
+            _ou_aucun(score.avantage_joueur), _ou_aucun(score.dernier_point),
+            _drapeaux(score.est_avantage, score.service_change),
+            service.serveur_actuel, service.compte_service, service.services_par_tour,
+            _index_etat(etats, service.etat),
+            _drapeaux(service.est_egalite, service.let_service,
+                      service.service_depuis_gauche is not None, service.service_depuis_gauche),
+            _index_etat(etats, match.etat),
+            match.score_jeu_actuel1, match.score_jeu_actuel2, match.jeux_joueur1, match.jeux_joueur2,
+            _ou_aucun(match.gagnant_match), match.jeu_actuel,
+            _drapeaux(match.match_termine, match.changement_etat),
+            _ou_aucun(match.dernier_changement, AUCUN), _ou_aucun(match.delai_prochain_jeu, AUCUN),
+            len(historique), *scores_jeux,
+            adversaire is not None,
+            math.nan if adversaire is None or adversaire.y_cible is None else adversaire.y_cible,
+            adversaire.trajectoire if adversaire else AUCUN,
+            _ou_aucun(adversaire and adversaire.temps_changement, AUCUN),
+            _ou_aucun(adversaire and adversaire.debut_attente_service, AUCUN)
+        )
+    except Exception as e:
+        logger.error("Erreur lors de la capture de l'instantané: %s", e, exc_info=True)
+        raise
+
+def restaurer_instantane(etat_jeu, donnees):
+    """Réécrire sur place un etat_jeu à partir d'un instantané.
+
+    Les objets existants sont conservés, avec leurs sons, images et règles: pour
+    recharger un match sauvegardé, restaurer dans un etat_jeu créé par
+    initialiser_objets_jeu avec la même vitesse de balle."""
+    try:
+        valeurs = FORMAT.unpack(donnees)
+        if valeurs[0] != VERSION:
+            raise ValueError(f"Version d'instantané non prise en charge: {valeurs[0]}")
+        etats = list(etat_jeu['regles']['ETATS_JEU'].values())
+        (_,
+         balle_x, balle_y, balle_dx, balle_dy, trajectoire, balle_etat, balle_drapeaux,
+         rouge_x, rouge_y, rouge_impact, bleue_x, bleue_y, bleue_impact,
+         score1, score2, score_jeux1, score_jeux2, gagnant_jeu, score_gagnant_match,
+         avantage_joueur, dernier_point, score_drapeaux,
+         serveur, compte_service, services_par_tour, service_etat, service_drapeaux,
+         match_etat, match_score1, match_score2, jeux1, jeux2, gagnant_match, jeu_actuel,
+         match_drapeaux, dernier_changement, delai_prochain_jeu, nombre_jeux) = valeurs[:39]
+        scores_jeux = valeurs[39:39 + 2 * HISTORIQUE_MAX]
+        cpu_present, y_cible, cpu_trajectoire, temps_changement, debut_attente = valeurs[39 + 2 * HISTORIQUE_MAX:]
+
+        balle = etat_jeu['balle']
+        balle.x = balle.x_precedent = balle_x
+        balle.y = balle.y_precedent = balle_y
+        balle.dx = balle_dx
+        balle.dy = balle_dy
+        balle.fraction_rebond = None
+        balle.trajectoire = trajectoire
+        balle.etat = _etat_index(etats, balle_etat)
+        au_service, active, cote_connu, depuis_gauche = _bits(balle_drapeaux, 4)
+        balle.au_service = au_service
+        balle.active = active
+        balle.service_depuis_gauche = depuis_gauche if cote_connu else None
+
+        for nom, x, y, temps_impact in (('raquette_rouge', rouge_x, rouge_y, rouge_impact),
+                                        ('raquette_bleue', bleue_x, bleue_y, bleue_impact)):
+            raquette = etat_jeu[nom]
+            raquette.rect.topleft = (x, y)
+            raquette.zone_collision.x = x
+            raquette.zone_collision.y = y + raquette.regles['HAUTEUR_RAQUETTE'] * 0.05
+            raquette.zone_precedente = raquette.zone_collision.topleft
+            raquette.dx = raquette.dy = 0
+            raquette.temps_dernier_impact = temps_impact
+
+        score = etat_jeu['score']
+        score.score_joueur1 = score1
+        score.score_joueur2 = score2
+        score.jeux_joueur1 = score_jeux1
+        score.jeux_joueur2 = score_jeux2
+        score.gagnant_jeu = _ou_none(gagnant_jeu)
+        score.gagnant_match = _ou_none(score_gagnant_match)
+        score.avantage_joueur = _ou_none(avantage_joueur)
+        score.dernier_point = _ou_none(dernier_point)
+        score.est_avantage, score.service_change = _bits(score_drapeaux, 2)
+
+        service = etat_jeu['gestionnaire_service']
+        service.serveur_actuel = serveur
+        service.compte_service = compte_service
+        service.services_par_tour = services_par_tour
+        service.etat = _etat_index(etats, service_etat)
+        est_egalite, let_service, cote_connu, depuis_gauche = _bits(service_drapeaux, 4)
+        service.est_egalite = est_egalite
+        service.let_service = let_service
+        service.service_depuis_gauche = depuis_gauche if cote_connu else None
+
+        match = etat_jeu['gestionnaire_match']
+        match.etat = _etat_index(etats, match_etat)
+        match.score_jeu_actuel1 = match_score1
+        match.score_jeu_actuel2 = match_score2
+        match.jeux_joueur1 = jeux1
+        match.jeux_joueur2 = jeux2
+        match.gagnant_match = _ou_none(gagnant_match)
+        match.jeu_actuel = jeu_actuel
+        match.match_termine, match.changement_etat = _bits(match_drapeaux, 2)
+        match.dernier_changement = _ou_none(dernier_changement, AUCUN)
+        match.delai_prochain_jeu = _ou_none(delai_prochain_jeu, AUCUN)
+        match.historique_jeux[:] = [
+            (scores_jeux[2 * jeu], scores_jeux[2 * jeu + 1]) for jeu in range(nombre_jeux)
+        ]
+
+        adversaire = etat_jeu.get('adversaire_cpu')
+        if adversaire is not None and cpu_present:
+            adversaire.y_cible = None if math.isnan(y_cible) else y_cible
+            adversaire.trajectoire = cpu_trajectoire
+            adversaire.temps_changement = _ou_none(temps_changement, AUCUN)
+            adversaire.debut_attente_service = _ou_none(debut_attente, AUCUN)
+        elif adversaire is not None:
+            # Instantané d'un match à deux joueurs: la cible sera recalculée
+            adversaire.trajectoire = -1
+        return etat_jeu
+    except Exception as e:
+        logger.error("Erreur lors de la restauration de l'instantané: %s", e, exc_info=True)
+        raise
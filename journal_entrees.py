@@ -0,0 +1,219 @@
+import os
+import sys
+import time
+import struct
+import logging
+import argparse
+from collections import defaultdict
+import pygame
+from regles_tennis_table import creer_regles
+
+logger = logging.getLogger('tennis_table')
+
+# Fichier: en-tête fixe puis une suite de mots de 16 bits (petit-boutiste).
+# Chaque mot est soit une plage (bits 0-8: masque des touches, bits 9-15: longueur 1..127),
+# soit un événement (longueur 0, bits 0-8: code de l'événement).
+MAGIE = b'TTJE'
+VERSION = 1
+FORMAT_EN_TETE = '<4sBQdBBH'
+LONGUEUR_PLAGE_MAX = 127
+BITS_MASQUE = 9
+MASQUE_TOUCHES = (1 << BITS_MASQUE) - 1
+EVENEMENT_REINITIALISATION = 1
+
+DOSSIER_JOURNAUX = 'journaux'
+
+def obtenir_touches_journalisees(regles):
+    """Les neuf touches qui influencent la simulation, dans l'ordre des bits du masque"""
+    controles = regles['CONTROLES']
+    return [
+        controles[joueur][direction]
+        for joueur in ('JOUEUR1', 'JOUEUR2')
+        for direction in ('HAUT', 'BAS', 'GAUCHE', 'DROITE')
+    ] + [controles['SERVICE']]
+
+def encoder_touches(touches, touches_journalisees):
+    masque = 0
+    for bit, touche in enumerate(touches_journalisees):
+        if touches[touche]:
+            masque |= 1 << bit
+    return masque
+
+def decoder_masque(masque, touches_journalisees):
+    """Équivalent de pygame.key.get_pressed() pour un masque du journal"""
+    return defaultdict(bool, {touche: True for bit, touche in enumerate(touches_journalisees) if masque >> bit & 1})
+
+def creer_journal(regles, graine, vitesse_balle, mode=None, niveau=None):
+    modes = list(regles['MODES_JEU'].values())
+    return {
+        'regles': regles,
+        'touches_journalisees': obtenir_touches_journalisees(regles),
+        'graine': graine,
+        'vitesse_balle': vitesse_balle,
+        'mode': modes.index(mode) if mode in modes else 0,
+        'niveau': niveau if niveau is not None else regles['DIFFICULTE_MIN'],
+        'ips_physique': regles['IPS_PHYSIQUE'],
+        'mots': bytearray(),
+        'masque_courant': None,
+        'longueur_courante': 0,
+        'pas': 0
+    }
+
+def vider_plage(journal):
+    if journal['longueur_courante']:
+        journal['mots'] += struct.pack('<H', journal['longueur_courante'] << BITS_MASQUE | journal['masque_courant'])
+    journal['longueur_courante'] = 0
+
+def enregistrer_pas(journal, touches):
+    """Ajouter les touches d'un pas physique; seules les plages complètes sont écrites.
+    Retourne le masque des touches du pas."""
+    masque = encoder_touches(touches, journal['touches_journalisees'])
+    if masque != journal['masque_courant'] or journal['longueur_courante'] == LONGUEUR_PLAGE_MAX:
+        vider_plage(journal)
+        journal['masque_courant'] = masque
+    journal['longueur_courante'] += 1
+    journal['pas'] += 1
+    return masque
+
+def enregistrer_evenement(journal, code):
+    vider_plage(journal)
+    journal['mots'] += struct.pack('<H', code)
+
+def serialiser_journal(journal):
+    vider_plage(journal)
+    en_tete = struct.pack(
+        FORMAT_EN_TETE,
+        MAGIE,
+        VERSION,
+        journal['graine'],
+        journal['vitesse_balle'],
+        journal['mode'],
+        journal['niveau'],
+        journal['ips_physique']
+    )
+    return en_tete + bytes(journal['mots'])
+
+def sauvegarder_journal(journal, chemin=None):
+    try:
+        if chemin is None:
+            os.makedirs(DOSSIER_JOURNAUX, exist_ok=True)
+            chemin = os.path.join(
+                DOSSIER_JOURNAUX,
+                f"match_{time.strftime('%Y%m%d_%H%M%S')}_{journal['graine']}.ttj"
+            )
+        donnees = serialiser_journal(journal)
+        with open(chemin, 'wb') as fichier:
+            fichier.write(donnees)
+        logger.info("Journal des entrées sauvegardé: %s (%s pas, %s octets)", chemin, journal['pas'], len(donnees))
+        return chemin
+    except Exception as e:
+        logger.error("Erreur lors de la sauvegarde du journal des entrées: %s", e, exc_info=True)
+        return None
+
+def charger_journal(chemin, regles=None):
+    regles = regles or creer_regles()
+    with open(chemin, 'rb') as fichier:
+        donnees = fichier.read()
+
+    taille_en_tete = struct.calcsize(FORMAT_EN_TETE)
+    magie, version, graine, vitesse_balle, mode, niveau, ips_physique = struct.unpack_from(FORMAT_EN_TETE, donnees)
+    if magie != MAGIE or version != VERSION:
+        raise ValueError(f"Fichier de journal invalide: {chemin}")
+    if ips_physique != regles['IPS_PHYSIQUE']:
+        logger.warning("Journal enregistré à %s pas/s, règles actuelles à %s", ips_physique, regles['IPS_PHYSIQUE'])
+
+    journal = creer_journal(regles, graine, vitesse_balle, list(regles['MODES_JEU'].values())[mode], niveau)
+    journal['mots'] = bytearray(donnees[taille_en_tete:])
+    journal['pas'] = sum(mot >> BITS_MASQUE for (mot,) in struct.iter_unpack('<H', journal['mots']))
+    return journal
+
+def iterer_pas(journal):
+    """(masque, evenements) pour chaque pas physique, les événements s'appliquant avant le pas"""
+    vider_plage(journal)
+    evenements = []
+    for (mot,) in struct.iter_unpack('<H', journal['mots']):
+        longueur = mot >> BITS_MASQUE
+        if longueur == 0:
+            evenements.append(mot & MASQUE_TOUCHES)
+            continue
+        for _ in range(longueur):
+            yield mot & MASQUE_TOUCHES, evenements
+            evenements = []
+
+def rejouer(journal, vitesse=None, ecran=None, ressources=None):
+    """Rejouer un journal avec mettre_a_jour_jeu.
+
+    Sans vitesse, la relecture tourne sans fenêtre aussi vite que possible; avec une
+    vitesse (1, 2, 8...), elle est dessinée et cadencée à ce multiple du temps réel."""
+    from main import initialiser_objets_jeu, mettre_a_jour_jeu, reinitialiser_partie, dessiner_jeu
+    from file_audio import distribuer_sons
+    try:
+        regles = journal['regles']
+        ressources = ressources or {'sons': {}, 'images': {}}
+        mode = list(regles['MODES_JEU'].values())[journal['mode']]
+        etat_jeu = initialiser_objets_jeu(
+            journal['vitesse_balle'], ressources, regles, mode, journal['niveau'], journal['graine']
+        )
+        touches_journalisees = journal['touches_journalisees']
+        pas_ms = 1000 / journal['ips_physique']
+        pas_par_image = max(1, round(vitesse * journal['ips_physique'] / regles['IPS'])) if vitesse else None
+        horloge = pygame.time.Clock() if vitesse else None
+
+        debut = time.perf_counter()
+        numero_pas = 0
+        for masque, evenements in iterer_pas(journal):
+            if EVENEMENT_REINITIALISATION in evenements:
+                reinitialiser_partie(etat_jeu)
+            etat_jeu = mettre_a_jour_jeu(
+                etat_jeu,
+                decoder_masque(masque, touches_journalisees),
+                round(numero_pas * pas_ms)
+            )
+            numero_pas += 1
+
+            if vitesse and numero_pas % pas_par_image == 0:
+                if any(evenement.type == pygame.QUIT for evenement in pygame.event.get()):
+                    break
+                distribuer_sons(etat_jeu['file_audio'])
+                dessiner_jeu(ecran, etat_jeu, ressources)
+                pygame.display.flip()
+                horloge.tick(regles['IPS'])
+        duree = time.perf_counter() - debut
+
+        logger.info("Relecture de %s pas en %.3fs", numero_pas, duree)
+        return {'etat_jeu': etat_jeu, 'pas': numero_pas, 'duree': duree}
+    except Exception as e:
+        logger.error("Erreur lors de la relecture du journal: %s", e, exc_info=True)
+        raise
+
+def main():
+    analyseur = argparse.ArgumentParser(description="Relecture d'un journal des entrées")
+    analyseur.add_argument('fichier')
+    analyseur.add_argument('--vitesse', type=int, choices=[1, 2, 8], default=None,
+                           help="relecture affichée à 1x, 2x ou 8x (sans fenêtre et au plus vite par défaut)")
+    arguments = analyseur.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    regles = creer_regles()
+    journal = charger_journal(arguments.fichier, regles)
+
+    ecran = ressources = None
+    if arguments.vitesse:
+        from main import charger_ressources
+        pygame.init()
+        ecran = pygame.display.set_mode((regles['LARGEUR_FENETRE'], regles['HAUTEUR_FENETRE']))
+        pygame.display.set_caption(f"{regles['TITRE_FENETRE']} - relecture x{arguments.vitesse}")
+        ressources = charger_ressources()
+    else:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.font.init()
+
+    resultat = rejouer(journal, arguments.vitesse, ecran, ressources)
+    match = resultat['etat_jeu']['gestionnaire_match']
+    print(f"{resultat['pas']} pas rejoués en {resultat['duree']:.2f}s, "
+          f"jeux {match['jeux_joueur1']}-{match['jeux_joueur2']}, "
+          f"score {resultat['etat_jeu']['score']['score_joueur1']}-{resultat['etat_jeu']['score']['score_joueur2']}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,174 @@
 import logging
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler, QueueHandler, QueueListener
 import os
 import time
+import queue
+import atexit
+import argparse
 from pathlib import Path
 import sys
 
-def configurer_logging():
+VARIABLE_NIVEAU_LOG = 'TENNIS_TABLE_LOG'
+NIVEAU_LOG_PAR_DEFAUT = 'INFO'
+BUDGET_RAPPORTS_PAR_SECONDE = 5
+INTERVALLE_RESUME_ERREURS = 10.0
+# Endroits mémorisés entre deux résumés, au plus (les plus anciens sont oubliés au-delà)
+VUES_MAX = 1000
+
+_ecouteurs = []
+_filtres_erreurs = []
+
+class GestionnaireFile(QueueHandler):
+    """Côté jeu, seul le message est interpolé: les états sont modifiés sur place
+    d'un pas à l'autre. Horodatage, mise en forme et écriture se font dans le
+    thread de l'écouteur."""
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+class FiltreErreurs(logging.Filter):
+    """Déduplication des avertissements et erreurs.
+
+    Chaque enregistrement est identifié par l'endroit du log et, s'il y en a une, par
+    le type et la ligne d'origine de l'exception. La première occurrence passe en
+    entier, les suivantes sont seulement comptées; au-delà d'un budget de rapports
+    par seconde, même les premières occurrences sont comptées sans être écrites.
+    Les comptes sont publiés en un résumé périodique et à l'arrêt; chaque résumé
+    oublie les endroits vus, dont la première occurrence suivante repasse en entier."""
+    def __init__(self, logger, budget_par_seconde=BUDGET_RAPPORTS_PAR_SECONDE,
+                 intervalle_resume=INTERVALLE_RESUME_ERREURS, horloge=time.monotonic):
+        super().__init__()
+        self.logger = logger
+        self.budget_par_seconde = budget_par_seconde
+        self.intervalle_resume = intervalle_resume
+        self.horloge = horloge
+        self.vues = {}
+        self.repetitions = {}
+        self.hors_budget = 0
+        self.seconde_courante = None
+        self.rapports_seconde = 0
+        self.dernier_resume = horloge()
+
+    @staticmethod
+    def empreinte(record):
+        """Endroit du log, plus type et origine de l'exception s'il y en a une"""
+        if record.exc_info and record.exc_info[0] is not None:
+            type_exception, _, trace = record.exc_info
+            while trace is not None and trace.tb_next is not None:
+                trace = trace.tb_next
+            origine = (trace.tb_frame.f_code.co_filename, trace.tb_lineno) if trace else (None, None)
+            return (record.pathname, record.lineno, type_exception, *origine)
+        return (record.pathname, record.lineno, record.msg)
+
+    @staticmethod
+    def libelle(cle):
+        chemin, ligne, detail, *origine = cle
+        libelle = f"{os.path.basename(chemin)}:{ligne}"
+        if origine:
+            libelle += f" {detail.__name__}"
+            if origine[0]:
+                libelle += f" ({os.path.basename(origine[0])}:{origine[1]})"
+        return libelle
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING or getattr(record, 'resume_erreurs', False):
+            return True
+
+        cle = self.empreinte(record)
+        if cle in self.vues:
+            self.repetitions[cle] = self.repetitions.get(cle, 0) + 1
+            return False
+
+        seconde = int(self.horloge())
+        if seconde != self.seconde_courante:
+            self.seconde_courante = seconde
+            self.rapports_seconde = 0
+        if self.rapports_seconde >= self.budget_par_seconde:
+            self.hors_budget += 1
+            return False
+        self.rapports_seconde += 1
+        if len(self.vues) >= VUES_MAX:
+            del self.vues[next(iter(self.vues))]
+        self.vues[cle] = self.libelle(cle)
+        return True
+
+    def publier_resume(self, forcer=False):
+        """Écrire les comptes accumulés, au plus une fois par intervalle sauf si forcer"""
+        maintenant = self.horloge()
+        if not forcer and maintenant - self.dernier_resume < self.intervalle_resume:
+            return
+        duree = maintenant - self.dernier_resume
+        self.dernier_resume = maintenant
+        self.vues.clear()
+        if not self.repetitions and not self.hors_budget:
+            return
+
+        lignes = [
+            f"{self.libelle(cle)} x{nombre}"
+            for cle, nombre in sorted(self.repetitions.items(), key=lambda element: -element[1])
+        ]
+        if self.hors_budget:
+            lignes.append(f"{self.hors_budget} rapports hors budget ({self.budget_par_seconde}/s)")
+        self.logger.warning("Erreurs répétées sur %.0fs: %s", duree, "; ".join(lignes),
+                            extra={'resume_erreurs': True})
+        self.repetitions.clear()
+        self.hors_budget = 0
+
+def publier_resume_erreurs(forcer=False):
+    for filtre in _filtres_erreurs:
+        filtre.publier_resume(forcer)
+
+def obtenir_niveau_log(arguments=None):
+    """Niveau de log: option --log, sinon variable TENNIS_TABLE_LOG, sinon INFO"""
+    analyseur = argparse.ArgumentParser(add_help=False)
+    analyseur.add_argument('--log', dest='niveau_log')
+    connus, _ = analyseur.parse_known_args(sys.argv[1:] if arguments is None else arguments)
+    nom = (connus.niveau_log or os.environ.get(VARIABLE_NIVEAU_LOG) or NIVEAU_LOG_PAR_DEFAUT).upper()
+    niveau = logging.getLevelName(nom)
+    if not isinstance(niveau, int):
+        print(f"Niveau de log inconnu: {nom}, {NIVEAU_LOG_PAR_DEFAUT} utilisé")
+        niveau = logging.getLevelName(NIVEAU_LOG_PAR_DEFAUT)
+    return niveau
+
+def arreter_logging():
+    """Publier le résumé des erreurs, vider la file et arrêter les threads d'écriture"""
+    publier_resume_erreurs(forcer=True)
+    while _filtres_erreurs:
+        filtre = _filtres_erreurs.pop()
+        filtre.logger.removeFilter(filtre)
+    while _ecouteurs:
+        ecouteur = _ecouteurs.pop()
+        try:
+            ecouteur.stop()
+            for gestionnaire in ecouteur.handlers:
+                gestionnaire.close()
+        except Exception as e:
+            print(f"Erreur lors de l'arrêt du logging: {e}")
+
+def configurer_logging(niveau=None, asynchrone=True):
+    """Configurer le logger tennis_table.
+
+    Par défaut, le thread de jeu ne fait que déposer les enregistrements dans une
+    file; un QueueListener les formate et les écrit dans les fichiers et la console."""
     try:
         if not os.path.exists('logs'):
             os.makedirs('logs')
 
+        arreter_logging()
+        if niveau is None:
+            niveau = obtenir_niveau_log()
+
         loggers = ['tennis_table']
         for nom_logger in loggers:
             logger = logging.getLogger(nom_logger)
-            logger.setLevel(logging.DEBUG)
+            logger.setLevel(niveau)
             logger.handlers.clear()
             logger.propagate = False
+            filtre_erreurs = FiltreErreurs(logger)
+            logger.addFilter(filtre_erreurs)
+            _filtres_erreurs.append(filtre_erreurs)
+            gestionnaires = []
 
             formateur = logging.Formatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(module)s - %(funcName)s - %(message)s'
@@ -29,7 +182,7 @@ def configurer_logging():
             )
             gestionnaire_debug.setLevel(logging.DEBUG)
             gestionnaire_debug.setFormatter(formateur)
-            logger.addHandler(gestionnaire_debug)
+            gestionnaires.append(gestionnaire_debug)
 
             gestionnaire_info = RotatingFileHandler(
                 filename='logs/info.log',
@@ -39,7 +192,7 @@ def configurer_logging():
             )
             gestionnaire_info.setLevel(logging.INFO)
             gestionnaire_info.setFormatter(formateur)
-            logger.addHandler(gestionnaire_info)
+            gestionnaires.append(gestionnaire_info)
 
             gestionnaire_erreur = TimedRotatingFileHandler(
                 filename='logs/error.log',
@@ -50,7 +203,7 @@ def configurer_logging():
             )
             gestionnaire_erreur.setLevel(logging.ERROR)
             gestionnaire_erreur.setFormatter(formateur)
-            logger.addHandler(gestionnaire_erreur)
+            gestionnaires.append(gestionnaire_erreur)
 
             gestionnaire_console = logging.StreamHandler(sys.stdout)
             gestionnaire_console.setLevel(logging.INFO)
@@ -59,12 +212,24 @@ def configurer_logging():
                 datefmt='%H:%M:%S'
             )
             gestionnaire_console.setFormatter(formateur_console)
-            logger.addHandler(gestionnaire_console)
+            gestionnaires.append(gestionnaire_console)
+
+            if asynchrone:
+                file_logs = queue.SimpleQueue()
+                ecouteur = QueueListener(file_logs, *gestionnaires, respect_handler_level=True)
+                ecouteur.start()
+                _ecouteurs.append(ecouteur)
+                logger.addHandler(GestionnaireFile(file_logs))
+            else:
+                for gestionnaire in gestionnaires:
+                    logger.addHandler(gestionnaire)
 
     except Exception as e:
         print(f"Erreur lors de la configuration du logging: {e}")
         raise
 
+atexit.register(arreter_logging)
+
 def nettoyer_vieux_logs():
     try:
         dossier_logs = Path('logs')
@@ -2,9 +2,11 @@ import pygame
 import sys
 import os
 import math
+import time
+import random
+from concurrent.futures import Future, ThreadPoolExecutor
 import logging
-from logging_config import configurer_logging
-configurer_logging()
+from logging_config import configurer_logging, arreter_logging, publier_resume_erreurs
 
 logger = logging.getLogger('tennis_table')
 
@@ -14,11 +16,13 @@ from raquette import (
     definir_velocite, 
     reinitialiser_position,
     verifier_collision_balle,
+    enregistrer_impact,
     dessiner as dessiner_raquette
 )
 from balle import (
     creer_balle,
-    definir_sons,
+    definir_file_audio,
+    emettre_son,
     reinitialiser as reinitialiser_balle,
     servir,
     deplacer as deplacer_balle,
@@ -38,6 +42,7 @@ from tableau_score import (
 from selecteur_difficulte import (
     creer_selecteur_difficulte,
     gerer_evenement,
+    obtenir_etat_affiche,
     dessiner as dessiner_selecteur
 )
 from gestionnaire_match import (
@@ -47,17 +52,81 @@ from gestionnaire_match import (
 )
 from gestionnaire_service import (
     creer_gestionnaire_service,
-    mettre_a_jour_compte_service
+    mettre_a_jour_compte_service,
+    reinitialiser as reinitialiser_service
 )
 from regles_tennis_table import creer_regles
+from adversaire_cpu import creer_adversaire_cpu, piloter as piloter_adversaire
+from pas_fixe import (
+    creer_accumulateur,
+    accumuler,
+    avancer_pas,
+    obtenir_temps_physique,
+    facteur_interpolation,
+    capturer_positions,
+    creer_dessin,
+    interpoler_etat
+)
+from enregistreur_vol import (
+    creer_enregistreur_vol,
+    enregistrer_releve,
+    vider_enregistreur,
+    attendre_vidage,
+    GestionnaireEnregistreurVol
+)
+from journal_entrees import (
+    creer_journal,
+    enregistrer_pas,
+    enregistrer_evenement,
+    sauvegarder_journal,
+    EVENEMENT_REINITIALISATION
+)
+from cache_ressources import charger_image, charger_son
+from file_audio import preinitialiser_mixer, creer_file_audio, distribuer_sons
+from profileur_images import (
+    profileur_demande,
+    creer_profileur,
+    marquer,
+    terminer_image,
+    dessiner_hud as dessiner_hud_profileur,
+    journaliser_resume as journaliser_resume_profileur
+)
+from capture_profil import (
+    MODE_CPROFILE,
+    MODE_ECHANTILLONNAGE,
+    capture_demandee,
+    creer_capture,
+    demarrer_capture,
+    arreter_capture,
+    basculer_capture,
+    verifier_duree_capture
+)
+from statistiques_match import (
+    creer_statistiques_match,
+    enregistrer_service,
+    enregistrer_coup,
+    enregistrer_point,
+    reinitialiser_statistiques
+)
+from historique_matchs import (
+    ouvrir_historique,
+    commencer_match,
+    ajouter_point,
+    ajouter_jeu,
+    terminer_match,
+    fermer_historique
+)
+from suivi_memoire import suivi_memoire_demande, creer_suivi_memoire, verifier_suivi_memoire, arreter_suivi_memoire
 
-def initialiser_jeu():
+def initialiser_jeu(chargement_asynchrone=True):
     try:
+        debut = time.perf_counter()
         logger.info("Initialisation du jeu")
+        regles = creer_regles()
+        preinitialiser_mixer(regles)
         pygame.init()
         pygame.mixer.init()
         
-        regles = creer_regles()
         ecran = pygame.display.set_mode((regles['LARGEUR_FENETRE'], regles['HAUTEUR_FENETRE']))
         pygame.display.set_caption(regles['TITRE_FENETRE'])
         
@@ -66,76 +135,148 @@ def initialiser_jeu():
             'ecran': ecran,
             'horloge': pygame.time.Clock(),
             'en_cours': True,
-            'ressources': charger_ressources(),
+            # Le menu s'affiche pendant le chargement: seul le match a besoin des ressources
+            'ressources': demarrer_chargement_ressources(regles) if chargement_asynchrone
+                          else charger_ressources(regles),
             'etat_jeu': None,
-            'pause': False
+            'pause': False,
+            'debut': debut
         }
     except Exception as e:
-        logger.error(f"Erreur lors de l'initialisation du jeu: {e}", exc_info=True)
+        logger.error("Erreur lors de l'initialisation du jeu: %s", e, exc_info=True)
         return None
 
-def charger_ressources():
+def demarrer_chargement_ressources(regles):
+    """Lancer charger_ressources dans un thread; retourne un Future des ressources"""
+    executeur = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chargement_ressources')
+    try:
+        return executeur.submit(charger_ressources, regles)
+    finally:
+        # Le thread termine le chargement en cours puis s'arrête
+        executeur.shutdown(wait=False)
+
+def attendre_ressources(ressources):
+    """Ressources chargées; n'attend le Future que si le chargement n'est pas terminé"""
+    if not isinstance(ressources, Future):
+        return ressources
+    try:
+        if not ressources.done():
+            debut = time.perf_counter()
+            resultat = ressources.result()
+            logger.info("Attente de la fin du chargement des ressources: %.1f ms",
+                        (time.perf_counter() - debut) * 1000)
+            return resultat
+        return ressources.result()
+    except Exception as e:
+        logger.error("Erreur lors du chargement des ressources: %s", e, exc_info=True)
+        return {'sons': {}, 'images': {}}
+
+def terminer_chargement_ressources(ressources):
+    """À la fermeture: annuler le chargement s'il n'a pas commencé, sinon attendre sa fin,
+    le thread de chargement utilisant pygame"""
+    if isinstance(ressources, Future) and ressources.cancel():
+        return None
+    return attendre_ressources(ressources)
+
+def creer_fond_provisoire(regles):
+    """Fond uni du menu, affiché tant que l'image du plancher n'est pas chargée"""
+    fond = pygame.Surface((regles['LARGEUR_FENETRE'], regles['HAUTEUR_FENETRE']))
+    fond.fill(regles['GRIS'])
+    return fond
+
+def charger_ressources(regles=None, dossier_cache=None):
+    """Charger sons et images via le cache de ressources prétraitées.
+
+    Au premier lancement (cache froid), les sources sont décodées, mises à l'échelle
+    et écrites dans le cache; ensuite elles sont relues telles quelles."""
     try:
         logger.info("Chargement des ressources")
+        regles = regles or creer_regles()
+        debut = time.perf_counter()
+        statistiques = {'succes': 0, 'echecs': 0}
         ressources = {'sons': {}, 'images': {}}
         
         try:
             ressources['sons'].update({
-                'coup_gauche': pygame.mixer.Sound(os.path.join('sons', 'coup_gauche.mp3')),
-                'coup_droit': pygame.mixer.Sound(os.path.join('sons', 'coup_droit.mp3')),
-                'service': pygame.mixer.Sound(os.path.join('sons', 'service.mp3'))
+                nom: charger_son(nom, os.path.join('sons', f"{nom}.mp3"), dossier_cache, statistiques)
+                for nom in ('coup_gauche', 'coup_droit', 'service')
             })
         except Exception as e:
-            logger.warning(f"Impossible de charger les sons: {e}")
+            logger.warning("Impossible de charger les sons: %s", e)
         
         try:
-            arriere_plan = pygame.image.load(os.path.join('images', 'plancher.jpg'))
-            raquette_bleue = pygame.image.load(os.path.join('images', 'raquette_bleue.png'))
-            raquette_rouge = pygame.image.load(os.path.join('images', 'raquette_rouge.png'))
-            
+            taille_raquette = (regles['LARGEUR_RAQUETTE'], regles['HAUTEUR_RAQUETTE'])
             ressources['images'].update({
-                'arriere_plan': pygame.transform.scale(arriere_plan, (800, 600)),
-                'raquette_bleue': pygame.transform.scale(raquette_bleue, (60, 100)),
-                'raquette_rouge': pygame.transform.scale(raquette_rouge, (60, 100))
+                'arriere_plan': charger_image(
+                    'arriere_plan', os.path.join('images', 'plancher.jpg'),
+                    (regles['LARGEUR_FENETRE'], regles['HAUTEUR_FENETRE']),
+                    dossier=dossier_cache, statistiques=statistiques),
+                # Raquettes déjà tournées vers la table: la bleue joue à droite
+                'raquette_bleue': charger_image(
+                    'raquette_bleue', os.path.join('images', 'raquette_bleue.png'), taille_raquette,
+                    retourner=True, alpha=True, dossier=dossier_cache, statistiques=statistiques),
+                'raquette_rouge': charger_image(
+                    'raquette_rouge', os.path.join('images', 'raquette_rouge.png'), taille_raquette,
+                    alpha=True, dossier=dossier_cache, statistiques=statistiques)
             })
         except Exception as e:
-            logger.warning(f"Impossible de charger les images: {e}")
+            logger.warning("Impossible de charger les images: %s", e)
         
+        ressources['chargement'] = {**statistiques, 'duree': time.perf_counter() - debut}
+        logger.info("Ressources chargées en %.1f ms (cache %s: %d lues, %d reconstruites)",
+                    ressources['chargement']['duree'] * 1000,
+                    'froid' if statistiques['echecs'] else 'chaud',
+                    statistiques['succes'], statistiques['echecs'])
         return ressources
     except Exception as e:
-        logger.error(f"Erreur lors du chargement des ressources: {e}", exc_info=True)
+        logger.error("Erreur lors du chargement des ressources: %s", e, exc_info=True)
         return {'sons': {}, 'images': {}}
 
-def initialiser_objets_jeu(vitesse_balle, ressources, regles):
+def initialiser_objets_jeu(vitesse_balle, ressources, regles, mode=None, niveau=None, graine=None):
     try:
-        logger.debug(f"Initialisation des objets avec vitesse_balle={vitesse_balle}")
+        logger.debug("Initialisation des objets avec vitesse_balle=%s, mode=%s", vitesse_balle, mode)
+        ressources = attendre_ressources(ressources)
+        if graine is None:
+            graine = random.randrange(2 ** 63)
+        # Un seul flux aléatoire par match: rejouer la graine rejoue le match à l'identique
+        generateur = random.Random(graine)
+        logger.info("Nouveau match, graine %s", graine)
         
         raquette_rouge = creer_raquette(
             x=regles['TABLE_X'] - regles['LARGEUR_RAQUETTE'] - 10,
             y=regles['HAUTEUR_FENETRE'] // 2 - regles['HAUTEUR_RAQUETTE'] // 2,
             vitesse=regles['VITESSE_RAQUETTE'],
-            image=ressources['images'].get('raquette_rouge')
+            image=ressources['images'].get('raquette_rouge'),
+            regles=regles,
+            orientee=True
         )
         
         raquette_bleue = creer_raquette(
             x=regles['TABLE_X'] + regles['LARGEUR_TABLE_PIXELS'] + 10,
             y=regles['HAUTEUR_FENETRE'] // 2 - regles['HAUTEUR_RAQUETTE'] // 2,
             vitesse=regles['VITESSE_RAQUETTE'],
-            image=ressources['images'].get('raquette_bleue')
+            image=ressources['images'].get('raquette_bleue'),
+            regles=regles,
+            orientee=True
         )
         
-        balle = creer_balle(vitesse=vitesse_balle)
-        balle = definir_sons(
-            balle,
-            ressources['sons'].get('coup_gauche'),
-            ressources['sons'].get('coup_droit'),
-            ressources['sons'].get('service')
-        )
+        balle = creer_balle(vitesse=vitesse_balle, regles=regles, generateur=generateur)
+        file_audio = creer_file_audio(regles, ressources['sons'])
+        balle = definir_file_audio(balle, file_audio)
+
+        score = creer_score(regles)
+        gestionnaire_service = creer_gestionnaire_service(regles, generateur)
+        gestionnaire_match = creer_gestionnaire_match(regles)
+        tableau_score = creer_tableau_score(regles['LARGEUR_FENETRE'], regles)
+        statistiques = creer_statistiques_match(regles)
 
-        score = creer_score()
-        gestionnaire_service = creer_gestionnaire_service()
-        gestionnaire_match = creer_gestionnaire_match()
-        tableau_score = creer_tableau_score(regles['LARGEUR_FENETRE'])
+        adversaire_cpu = None
+        if mode == regles['MODES_JEU']['CONTRE_CPU']:
+            adversaire_cpu = creer_adversaire_cpu(
+                regles,
+                niveau if niveau is not None else regles['DIFFICULTE_MIN'],
+                generateur=generateur
+            )
 
         return {
             'raquette_rouge': raquette_rouge,
@@ -145,10 +286,15 @@ def initialiser_objets_jeu(vitesse_balle, ressources, regles):
             'gestionnaire_service': gestionnaire_service,
             'gestionnaire_match': gestionnaire_match,
             'tableau_score': tableau_score,
+            'statistiques': statistiques,
+            'adversaire_cpu': adversaire_cpu,
+            'file_audio': file_audio,
+            'graine': graine,
+            'generateur': generateur,
             'regles': regles
         }
     except Exception as e:
-        logger.error(f"Erreur lors de l'initialisation des objets: {e}", exc_info=True)
+        logger.error("Erreur lors de l'initialisation des objets: %s", e, exc_info=True)
         return None
 
 def gerer_entree(touches, raquette_rouge, raquette_bleue, regles):
@@ -169,45 +315,51 @@ def gerer_entree(touches, raquette_rouge, raquette_bleue, regles):
 
         return (raquette_rouge, raquette_bleue, touches[regles['CONTROLES']['SERVICE']])
     except Exception as e:
-        logger.error(f"Erreur lors de la gestion des entrées: {e}", exc_info=True)
+        logger.error("Erreur lors de la gestion des entrées: %s", e, exc_info=True)
         return raquette_rouge, raquette_bleue, False
 
-def gerer_balle(balle, raquette_rouge, raquette_bleue, espace_presse, temps_actuel, gestionnaire_service):
+def gerer_balle(balle, raquette_rouge, raquette_bleue, espace_presse, temps_actuel, gestionnaire_service,
+                profileur=None, statistiques=None):
     try:
-        if balle['au_service'] and espace_presse:
-            if balle['son_service']:
-                try:
-                    balle['son_service'].play()
-                except Exception as e:
-                    logger.warning(f"Erreur lors de la lecture du son de service: {e}")
+        if balle.au_service and espace_presse:
+            emettre_son(balle, 'service')
                 
-            nouvelle_balle = servir(balle, gestionnaire_service['serveur_actuel'])
-            nouvelle_balle['au_service'] = False
-            nouvelle_balle['etat'] = balle['regles']['ETATS_JEU']['SERVICE_COMMENCE']
+            nouvelle_balle = servir(balle, gestionnaire_service.serveur_actuel)
+            nouvelle_balle.au_service = False
+            nouvelle_balle.etat = balle.regles['ETATS_JEU']['SERVICE_COMMENCE']
             
-            angle = math.atan2(nouvelle_balle['cible_y'] - nouvelle_balle['y'], 
-                            nouvelle_balle['cible_x'] - nouvelle_balle['x'])
-            nouvelle_balle['dx'] = math.cos(angle) * nouvelle_balle['vitesse']
-            nouvelle_balle['dy'] = math.sin(angle) * nouvelle_balle['vitesse']
-            return nouvelle_balle, False
+            angle = math.atan2(nouvelle_balle.cible_y - nouvelle_balle.y, 
+                            nouvelle_balle.cible_x - nouvelle_balle.x)
+            nouvelle_balle.dx = math.cos(angle) * nouvelle_balle.vitesse
+            nouvelle_balle.dy = math.sin(angle) * nouvelle_balle.vitesse
+            if statistiques:
+                enregistrer_service(statistiques, nouvelle_balle, gestionnaire_service.serveur_actuel, temps_actuel)
+            return nouvelle_balle, False, raquette_rouge, raquette_bleue
 
-        elif not balle['au_service']:
+        elif not balle.au_service:
             nouvelle_balle, point_marque = deplacer_balle(balle)
+            if profileur:
+                marquer(profileur, 'deplacement_balle')
             if point_marque:
-                return nouvelle_balle, True
+                return nouvelle_balle, True, raquette_rouge, raquette_bleue
 
-            for raquette in [raquette_rouge, raquette_bleue]:
-                collision, position_impact = verifier_collision_balle(raquette, nouvelle_balle, temps_actuel)
+            for raquette in (raquette_rouge, raquette_bleue):
+                collision, impact = verifier_collision_balle(raquette, nouvelle_balle, temps_actuel)
                 if collision:
-                    nouvelle_balle = gerer_collision_raquette(nouvelle_balle, raquette, position_impact)
+                    gerer_collision_raquette(nouvelle_balle, raquette, impact)
+                    enregistrer_impact(raquette, temps_actuel)
+                    if statistiques:
+                        enregistrer_coup(statistiques, nouvelle_balle)
                     break
+            if profileur:
+                marquer(profileur, 'collisions')
 
-            return nouvelle_balle, False
+            return nouvelle_balle, False, raquette_rouge, raquette_bleue
 
-        return balle, False
+        return balle, False, raquette_rouge, raquette_bleue
     except Exception as e:
-        logger.error(f"Erreur lors de la gestion de la balle: {e}", exc_info=True)
-        return balle, False
+        logger.error("Erreur lors de la gestion de la balle: %s", e, exc_info=True)
+        return balle, False, raquette_rouge, raquette_bleue
 
 def dessiner_table(ecran, regles):
     try:
@@ -236,7 +388,20 @@ def dessiner_table(ecran, regles):
                         (centre_x, regles['TABLE_Y']),
                         (centre_x, regles['TABLE_Y'] + regles['HAUTEUR_TABLE']), 2)
     except Exception as e:
-        logger.error(f"Erreur lors du dessin de la table: {e}", exc_info=True)
+        logger.error("Erreur lors du dessin de la table: %s", e, exc_info=True)
+
+def obtenir_donnees_affichage(etat_jeu):
+    return {
+        'score_joueur1': etat_jeu['score']['score_joueur1'],
+        'score_joueur2': etat_jeu['score']['score_joueur2'],
+        'jeux_joueur1': etat_jeu['gestionnaire_match']['jeux_joueur1'],
+        'jeux_joueur2': etat_jeu['gestionnaire_match']['jeux_joueur2'],
+        'serveur_actuel': etat_jeu['gestionnaire_service']['serveur_actuel'],
+        'en_service': etat_jeu['balle']['au_service'],
+        'message_statut': etat_jeu['gestionnaire_match']['etat'],
+        'est_avantage': etat_jeu['score']['est_avantage'],
+        'statistiques': etat_jeu.get('statistiques')
+    }
 
 def dessiner_jeu(ecran, etat_jeu, ressources):
     try:
@@ -250,20 +415,71 @@ def dessiner_jeu(ecran, etat_jeu, ressources):
         dessiner_raquette(etat_jeu['raquette_bleue'], ecran)
         dessiner_balle(etat_jeu['balle'], ecran)
         
-        donnees_affichage = {
-            'score_joueur1': etat_jeu['score']['score_joueur1'],
-            'score_joueur2': etat_jeu['score']['score_joueur2'],
-            'jeux_joueur1': etat_jeu['gestionnaire_match']['jeux_joueur1'],
-            'jeux_joueur2': etat_jeu['gestionnaire_match']['jeux_joueur2'],
-            'serveur_actuel': etat_jeu['gestionnaire_service']['serveur_actuel'],
-            'en_service': etat_jeu['balle']['au_service'],
-            'message_statut': etat_jeu['gestionnaire_match']['etat'],
-            'est_avantage': etat_jeu['score']['est_avantage']
-        }
-        
-        dessiner_tableau_score(etat_jeu['tableau_score'], ecran, donnees_affichage)
+        dessiner_tableau_score(etat_jeu['tableau_score'], ecran, obtenir_donnees_affichage(etat_jeu))
+    except Exception as e:
+        logger.error("Erreur lors du dessin du jeu: %s", e, exc_info=True)
+
+def creer_rendu_partiel():
+    """État du rendu par rectangles modifiés: couche statique et zones de l'image précédente"""
+    return {
+        'couche_statique': None,
+        'cle_couche_statique': None,
+        'zones_precedentes': []
+    }
+
+def composer_couche_statique(taille, regles, ressources):
+    """Fond et table dessinés une fois pour toutes sur une surface hors écran"""
+    couche = pygame.Surface(taille)
+    if pygame.display.get_surface() is not None:
+        couche = couche.convert()
+    couche.fill(regles['NOIR'])
+    if ressources['images'].get('arriere_plan'):
+        couche.blit(ressources['images']['arriere_plan'], (0, 0))
+    dessiner_table(couche, regles)
+    return couche
+
+def dessiner_jeu_partiel(ecran, etat_jeu, ressources, rendu, profileur=None):
+    """Dessiner seulement ce qui bouge et retourner les rectangles à passer à
+    pygame.display.update.
+
+    La couche statique est recomposée si la taille de l'écran, les règles ou le
+    fond changent; l'écran entier est alors redessiné."""
+    try:
+        regles = etat_jeu['regles']
+        cle = (ecran.get_size(), id(regles), id(ressources['images'].get('arriere_plan')))
+        if cle != rendu['cle_couche_statique']:
+            rendu['couche_statique'] = composer_couche_statique(ecran.get_size(), regles, ressources)
+            rendu['cle_couche_statique'] = cle
+            rendu['zones_precedentes'] = [ecran.get_rect()]
+        couche_statique = rendu['couche_statique']
+
+        zones_precedentes = rendu['zones_precedentes']
+        for zone in zones_precedentes:
+            ecran.blit(couche_statique, zone, zone)
+        if profileur:
+            marquer(profileur, 'dessin_fond')
+
+        balle = etat_jeu['balle']
+        zones = [
+            dessiner_raquette(etat_jeu['raquette_rouge'], ecran),
+            dessiner_raquette(etat_jeu['raquette_bleue'], ecran),
+            dessiner_balle(balle, ecran)
+        ]
+        if profileur:
+            marquer(profileur, 'dessin_objets')
+        zones.extend(dessiner_tableau_score(etat_jeu['tableau_score'], ecran, obtenir_donnees_affichage(etat_jeu)))
+        if profileur:
+            # Zone du HUD gardée dans zones_precedentes: restaurée à l'image suivante
+            zones.append(dessiner_hud_profileur(profileur, ecran))
+            marquer(profileur, 'dessin_hud')
+        zones = [zone for zone in zones if zone]
+
+        rendu['zones_precedentes'] = zones
+        return zones_precedentes + zones
     except Exception as e:
-        logger.error(f"Erreur lors du dessin du jeu: {e}", exc_info=True)
+        logger.error("Erreur lors du dessin partiel du jeu: %s", e, exc_info=True)
+        rendu['cle_couche_statique'] = None
+        return [ecran.get_rect()]
 
 def nettoyer_ressources(ressources):
     try:
@@ -275,11 +491,17 @@ def nettoyer_ressources(ressources):
             ressources['sons'].clear()
             ressources['images'].clear()
     except Exception as e:
-        logger.error(f"Erreur lors du nettoyage des ressources: {e}", exc_info=True)
+        logger.error("Erreur lors du nettoyage des ressources: %s", e, exc_info=True)
+
+def mettre_a_jour_jeu(etat_jeu, touches, temps_actuel, profileur=None):
+    """Avancer etat_jeu d'un pas physique, sur place; retourne le même etat_jeu.
 
-def mettre_a_jour_jeu(etat_jeu, touches, temps_actuel):
+    Sans instantané préalable, une exception au milieu du pas laisse l'état
+    partiellement mis à jour (balle déplacée mais score ou service inchangés, par
+    exemple): il est retourné tel quel et le pas suivant repart de là. Un appelant qui
+    doit pouvoir revenir en arrière prend copier_etat_jeu(etat_jeu) avant le pas."""
     try:
-        nouvel_etat = {**etat_jeu}
+        nouvel_etat = etat_jeu
         
         raquette_rouge, raquette_bleue, espace_presse = gerer_entree(
             touches, 
@@ -288,44 +510,75 @@ def mettre_a_jour_jeu(etat_jeu, touches, temps_actuel):
             nouvel_etat['regles']
         )
         
+        adversaire = nouvel_etat.get('adversaire_cpu')
+        if adversaire:
+            raquette_cpu = raquette_rouge if adversaire.nom_raquette == 'raquette_rouge' else raquette_bleue
+            dy_cpu, service_cpu = piloter_adversaire(
+                adversaire,
+                raquette_cpu,
+                nouvel_etat['balle'],
+                nouvel_etat['gestionnaire_service'].serveur_actuel,
+                temps_actuel
+            )
+            definir_velocite(raquette_cpu, 0, dy_cpu)
+            if nouvel_etat['gestionnaire_service'].serveur_actuel == adversaire.joueur:
+                espace_presse = service_cpu
+        if profileur:
+            marquer(profileur, 'entree')
+        
         raquette_rouge = deplacer_raquette(raquette_rouge)
         raquette_bleue = deplacer_raquette(raquette_bleue)
+        if profileur:
+            marquer(profileur, 'raquettes')
         
-        nouvel_etat['balle'], point_marque = gerer_balle(
+        nouvel_etat['balle'], point_marque, raquette_rouge, raquette_bleue = gerer_balle(
             nouvel_etat['balle'],
             raquette_rouge,
             raquette_bleue,
             espace_presse,
             temps_actuel,
-            nouvel_etat['gestionnaire_service']
+            nouvel_etat['gestionnaire_service'],
+            profileur,
+            nouvel_etat.get('statistiques')
         )
         
         if point_marque:
-            point_joueur2 = nouvel_etat['balle']['x'] < 0
+            point_joueur2 = nouvel_etat['balle'].x < 0
+            if nouvel_etat.get('statistiques'):
+                enregistrer_point(nouvel_etat['statistiques'], 2 if point_joueur2 else 1, temps_actuel)
             if point_joueur2:
                 nouvel_etat['score'] = incrementer_joueur2(nouvel_etat['score'])
             else:
                 nouvel_etat['score'] = incrementer_joueur1(nouvel_etat['score'])
+            historique = nouvel_etat.get('historique')
+            if historique:
+                ajouter_point(historique, nouvel_etat, 2 if point_joueur2 else 1,
+                              nouvel_etat['gestionnaire_service'].serveur_actuel, temps_actuel)
                 
-            if nouvel_etat['score']['gagnant_jeu']:
+            if nouvel_etat['score'].gagnant_jeu:
+                numero_jeu = nouvel_etat['gestionnaire_match'].jeu_actuel
+                score_final = (nouvel_etat['score'].score_joueur1, nouvel_etat['score'].score_joueur2)
                 nouvel_etat['gestionnaire_match'] = incrementer_jeux_joueur(
                     nouvel_etat['gestionnaire_match'],
-                    nouvel_etat['score']['gagnant_jeu'],
-                    (nouvel_etat['score']['score_joueur1'],
-                     nouvel_etat['score']['score_joueur2'])
+                    nouvel_etat['score'].gagnant_jeu,
+                    score_final
                 )
+                if historique:
+                    ajouter_jeu(historique, numero_jeu, score_final, nouvel_etat['score'].gagnant_jeu)
+                    if nouvel_etat['gestionnaire_match'].match_termine:
+                        terminer_match(historique, nouvel_etat['gestionnaire_match'])
                 nouvel_etat['score'] = reinitialiser_score(nouvel_etat['score'])
-                nouvel_etat['gestionnaire_service'] = creer_gestionnaire_service()
+                nouvel_etat['gestionnaire_service'] = reinitialiser_service(nouvel_etat['gestionnaire_service'])
             else:
                 nouvel_etat['gestionnaire_service'] = mettre_a_jour_compte_service(
                     nouvel_etat['gestionnaire_service'],
-                    nouvel_etat['score']['score_joueur1'],
-                    nouvel_etat['score']['score_joueur2']
+                    nouvel_etat['score'].score_joueur1,
+                    nouvel_etat['score'].score_joueur2
                 )
             
             nouvel_etat['balle'] = servir(
                 nouvel_etat['balle'],
-                nouvel_etat['gestionnaire_service']['serveur_actuel']
+                nouvel_etat['gestionnaire_service'].serveur_actuel
             )
             
             nouvel_etat['raquette_rouge'] = reinitialiser_position(raquette_rouge)
@@ -335,12 +588,32 @@ def mettre_a_jour_jeu(etat_jeu, touches, temps_actuel):
             'raquette_rouge': raquette_rouge,
             'raquette_bleue': raquette_bleue,
         })
+        if profileur:
+            marquer(profileur, 'score')
         
         return nouvel_etat
     except Exception as e:
-        logger.error(f"Erreur lors de la mise à jour du jeu: {e}", exc_info=True)
+        logger.error("Erreur lors de la mise à jour du jeu: %s", e, exc_info=True)
+        # État modifié sur place jusqu'à l'exception, éventuellement partiel
         return etat_jeu
 
+def reinitialiser_partie(etat_jeu):
+    """Nouvelle partie (touche REINITIALISER), seulement après un jeu ou un match terminé"""
+    if not (etat_jeu['score']['gagnant_jeu'] or etat_jeu['gestionnaire_match']['match_termine']):
+        return False
+    if etat_jeu['gestionnaire_match']['match_termine']:
+        etat_jeu['gestionnaire_match'] = reinitialiser_match(etat_jeu['gestionnaire_match'])
+        if etat_jeu.get('statistiques'):
+            reinitialiser_statistiques(etat_jeu['statistiques'])
+    etat_jeu.update({
+        'score': reinitialiser_score(etat_jeu['score']),
+        'balle': reinitialiser_balle(etat_jeu['balle']),
+        'gestionnaire_service': reinitialiser_service(etat_jeu['gestionnaire_service']),
+        'raquette_rouge': reinitialiser_position(etat_jeu['raquette_rouge']),
+        'raquette_bleue': reinitialiser_position(etat_jeu['raquette_bleue'])
+    })
+    return True
+
 def boucle_selection_difficulte(etat_global):
     try:
         selecteur = creer_selecteur_difficulte(
@@ -348,50 +621,112 @@ def boucle_selection_difficulte(etat_global):
             etat_global['regles']['HAUTEUR_FENETRE']
         )
         selection_difficulte = True
+        ecran = etat_global['ecran']
+        chargement = etat_global['ressources']
+        en_chargement = isinstance(chargement, Future) and not chargement.done()
+        if en_chargement:
+            arriere_plan = creer_fond_provisoire(etat_global['regles'])
+        else:
+            arriere_plan = attendre_ressources(chargement)['images'].get('arriere_plan')
+        pygame.display.update(dessiner_selecteur(selecteur, ecran, arriere_plan))
+        if 'debut' in etat_global:
+            etat_global['temps_premiere_image'] = time.perf_counter() - etat_global['debut']
+            logger.info("Première image affichée en %.1f ms (ressources %s)",
+                        etat_global['temps_premiere_image'] * 1000,
+                        'en cours de chargement' if en_chargement else 'chargées')
         
         while selection_difficulte and etat_global['en_cours']:
-            for evenement in pygame.event.get():
+            if en_chargement and chargement.done():
+                # Ressources prêtes: le vrai fond remplace le fond provisoire
+                en_chargement = False
+                arriere_plan = attendre_ressources(chargement)['images'].get('arriere_plan')
+                pygame.display.update(dessiner_selecteur(selecteur, ecran, arriere_plan))
+
+            # Menu immobile: on dort jusqu'au prochain événement plutôt que de redessiner à 60 IPS
+            evenements = [pygame.event.wait(etat_global['regles']['DELAI_ATTENTE_MENU'])]
+            evenements.extend(pygame.event.get())
+            affiche = obtenir_etat_affiche(selecteur)
+            for evenement in evenements:
                 if evenement.type == pygame.QUIT:
                     etat_global['en_cours'] = False
                     return None
                 elif evenement.type == pygame.KEYDOWN and evenement.key == pygame.K_RETURN:
                     selection_difficulte = False
-                else:
+                elif evenement.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    selecteur['cle_statique'] = None
+                elif evenement.type != pygame.NOEVENT:
                     selecteur = gerer_evenement(selecteur, evenement)
 
-            ecran = etat_global['ecran']
-            ecran.fill(etat_global['regles']['NOIR'])
-            if etat_global['ressources']['images'].get('arriere_plan'):
-                ecran.blit(etat_global['ressources']['images']['arriere_plan'], (0, 0))
-            
-            dessiner_selecteur(selecteur, ecran)
-            pygame.display.flip()
-            etat_global['horloge'].tick(etat_global['regles']['IPS'])
+            if selecteur['cle_statique'] is None or obtenir_etat_affiche(selecteur) != affiche:
+                pygame.display.update(dessiner_selecteur(selecteur, ecran, arriere_plan))
         
-        return selecteur['vitesse_balle'] if etat_global['en_cours'] else None
+        return selecteur if etat_global['en_cours'] else None
     except Exception as e:
-        logger.error(f"Erreur dans la boucle de sélection de difficulté: {e}", exc_info=True)
+        logger.error("Erreur dans la boucle de sélection de difficulté: %s", e, exc_info=True)
         return None
 
 def boucle_principale():
+    journal = None
+    gestionnaire_vol = None
+    profileur = None
+    capture = None
+    suivi_memoire = None
+    historique = None
+    etat_global = None
     try:
         etat_global = initialiser_jeu()
         if not etat_global:
             logger.error("Échec de l'initialisation du jeu")
             return
             
-        vitesse_balle = boucle_selection_difficulte(etat_global)
-        if not vitesse_balle:
+        selecteur = boucle_selection_difficulte(etat_global)
+        if not selecteur:
             return
             
+        etat_global['ressources'] = attendre_ressources(etat_global['ressources'])
         etat_global['etat_jeu'] = initialiser_objets_jeu(
-            vitesse_balle, 
+            selecteur['vitesse_balle'], 
             etat_global['ressources'],
-            etat_global['regles']
+            etat_global['regles'],
+            mode=selecteur['mode'],
+            niveau=selecteur['difficulte_actuelle']
+        )
+        journal = creer_journal(
+            etat_global['regles'],
+            etat_global['etat_jeu']['graine'],
+            selecteur['vitesse_balle'],
+            selecteur['mode'],
+            selecteur['difficulte_actuelle']
         )
+        historique = ouvrir_historique()
+        etat_global['etat_jeu']['historique'] = historique
+        commencer_match(
+            historique,
+            etat_global['etat_jeu']['graine'],
+            selecteur['mode'],
+            selecteur['difficulte_actuelle'],
+            selecteur['vitesse_balle']
+        )
+        enregistreur_vol = creer_enregistreur_vol(etat_global['regles'])
+        gestionnaire_vol = GestionnaireEnregistreurVol(enregistreur_vol)
+        logger.addHandler(gestionnaire_vol)
+        accumulateur = creer_accumulateur(
+            etat_global['regles']['IPS_PHYSIQUE'],
+            etat_global['regles']['PAS_PHYSIQUES_MAX_PAR_IMAGE']
+        )
+        precedent = capturer_positions(etat_global['etat_jeu'])
+        dessin = creer_dessin()
+        rendu = creer_rendu_partiel()
+        if profileur_demande():
+            profileur = creer_profileur(etat_global['regles'])
+        capture = creer_capture(etat_global['regles'])
+        if capture_demandee():
+            demarrer_capture(capture, capture_demandee())
+        if suivi_memoire_demande():
+            suivi_memoire = creer_suivi_memoire(suivi_memoire_demande())
         
         while etat_global['en_cours']:
-            temps_actuel = pygame.time.get_ticks()
+            accumulateur, nombre_pas = accumuler(accumulateur, etat_global['horloge'].get_time())
             touches = pygame.key.get_pressed()
             
             try:
@@ -402,50 +737,93 @@ def boucle_principale():
                         if evenement.key == pygame.K_ESCAPE or evenement.key == pygame.K_q:
                             etat_global['en_cours'] = False
                         elif evenement.key == etat_global['regles']['CONTROLES']['REINITIALISER']:
-                            if etat_global['etat_jeu']['score']['gagnant_jeu'] or \
-                               etat_global['etat_jeu']['gestionnaire_match']['match_termine']:
-                                if etat_global['etat_jeu']['gestionnaire_match']['match_termine']:
-                                    etat_global['etat_jeu']['gestionnaire_match'] = reinitialiser_match(
-                                        etat_global['etat_jeu']['gestionnaire_match'])
-                                etat_global['etat_jeu'].update({
-                                    'score': reinitialiser_score(etat_global['etat_jeu']['score']),
-                                    'balle': reinitialiser_balle(etat_global['etat_jeu']['balle']),
-                                    'gestionnaire_service': creer_gestionnaire_service(),
-                                    'raquette_rouge': reinitialiser_position(etat_global['etat_jeu']['raquette_rouge']),
-                                    'raquette_bleue': reinitialiser_position(etat_global['etat_jeu']['raquette_bleue'])
-                                })
-
-                if not etat_global['etat_jeu']['gestionnaire_match']['match_termine']:
+                            nouveau_match = etat_global['etat_jeu']['gestionnaire_match']['match_termine']
+                            if reinitialiser_partie(etat_global['etat_jeu']):
+                                enregistrer_evenement(journal, EVENEMENT_REINITIALISATION)
+                                if nouveau_match:
+                                    # Le flux aléatoire continue: la graine ne rejoue que le premier match
+                                    commencer_match(historique, None, selecteur['mode'],
+                                                    selecteur['difficulte_actuelle'], selecteur['vitesse_balle'])
+                        elif evenement.key == etat_global['regles']['CONTROLES']['VIDER_ENREGISTREUR']:
+                            vider_enregistreur(enregistreur_vol, "demande du joueur", forcer=True)
+                        elif evenement.key == etat_global['regles']['CONTROLES']['PROFILEUR']:
+                            # Le profileur n'est créé qu'à la première demande
+                            profileur = profileur or creer_profileur(etat_global['regles'])
+                            profileur['affiche'] = not profileur['affiche']
+                        elif evenement.key == etat_global['regles']['CONTROLES']['CAPTURE_CPROFILE']:
+                            basculer_capture(capture, MODE_CPROFILE)
+                        elif evenement.key == etat_global['regles']['CONTROLES']['CAPTURE_ECHANTILLONS']:
+                            basculer_capture(capture, MODE_ECHANTILLONNAGE)
+                if profileur:
+                    marquer(profileur, 'evenements')
+
+                for _ in range(nombre_pas):
+                    if etat_global['etat_jeu']['gestionnaire_match']['match_termine']:
+                        break
+                    precedent = capturer_positions(etat_global['etat_jeu'])
+                    masque_touches = enregistrer_pas(journal, touches)
                     etat_global['etat_jeu'] = mettre_a_jour_jeu(
                         etat_global['etat_jeu'],
                         touches,
-                        temps_actuel
+                        obtenir_temps_physique(accumulateur),
+                        profileur
                     )
+                    enregistrer_releve(enregistreur_vol, accumulateur['pas'], etat_global['etat_jeu'], masque_touches)
+                    accumulateur = avancer_pas(accumulateur)
+                    if profileur:
+                        marquer(profileur, 'enregistrement')
+                distribuer_sons(etat_global['etat_jeu']['file_audio'])
+                if profileur:
+                    marquer(profileur, 'audio')
 
-                dessiner_jeu(
+                zones_modifiees = dessiner_jeu_partiel(
                     etat_global['ecran'],
-                    etat_global['etat_jeu'],
-                    etat_global['ressources']
+                    interpoler_etat(precedent, etat_global['etat_jeu'], facteur_interpolation(accumulateur), dessin),
+                    etat_global['ressources'],
+                    rendu,
+                    profileur
                 )
                 
-                pygame.display.flip()
+                pygame.display.update(zones_modifiees)
+                if profileur:
+                    marquer(profileur, 'affichage')
                 etat_global['horloge'].tick(etat_global['regles']['IPS'])
+                if profileur:
+                    terminer_image(profileur)
+                verifier_duree_capture(capture)
+                if suivi_memoire:
+                    verifier_suivi_memoire(suivi_memoire)
+                publier_resume_erreurs()
                 
             except Exception as e:
-                logger.error(f"Erreur dans la boucle de jeu: {e}", exc_info=True)
+                logger.error("Erreur dans la boucle de jeu: %s", e, exc_info=True)
                 
     except Exception as e:
-        logger.error(f"Erreur fatale dans la boucle principale: {e}", exc_info=True)
+        logger.error("Erreur fatale dans la boucle principale: %s", e, exc_info=True)
     finally:
-        nettoyer_ressources(etat_global.get('ressources'))
+        if gestionnaire_vol is not None:
+            logger.removeHandler(gestionnaire_vol)
+            attendre_vidage(gestionnaire_vol.enregistreur)
+        if journal is not None:
+            sauvegarder_journal(journal)
+        journaliser_resume_profileur(profileur)
+        if capture is not None:
+            arreter_capture(capture, "fin de partie")
+        if suivi_memoire is not None:
+            arreter_suivi_memoire(suivi_memoire)
+        fermer_historique(historique)
+        if etat_global:
+            nettoyer_ressources(terminer_chargement_ressources(etat_global['ressources']))
         pygame.quit()
 
 def main():
     try:
+        configurer_logging()
         boucle_principale()
     except Exception as e:
-        logger.error(f"Erreur fatale: {e}", exc_info=True)
+        logger.error("Erreur fatale: %s", e, exc_info=True)
     finally:
+        arreter_logging()
         sys.exit()
 
 if __name__ == "__main__":
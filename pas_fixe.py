@@ -0,0 +1,89 @@
+import logging
+
+logger = logging.getLogger('tennis_table')
+
+def creer_accumulateur(ips_physique, pas_max_par_image=5):
+    """Accumulateur à pas fixe: la physique avance par pas de 1000 / ips_physique ms,
+    indépendamment de la cadence d'affichage."""
+    return {
+        'ips_physique': ips_physique,
+        'pas_ms': 1000 / ips_physique,
+        'pas_max_par_image': pas_max_par_image,
+        'reste_ms': 0.0,
+        'pas': 0
+    }
+
+def accumuler(accumulateur, duree_image_ms):
+    """Ajouter la durée d'une image affichée et retourner le nombre de pas physiques à exécuter.
+
+    Le nombre de pas est borné pour qu'une image très longue (fenêtre déplacée,
+    point d'arrêt) ne déclenche pas un rattrapage sans fin; le temps excédentaire est abandonné.
+    L'accumulateur est mis à jour sur place."""
+    reste_ms = accumulateur['reste_ms'] + duree_image_ms
+    nombre_pas = int(reste_ms // accumulateur['pas_ms'])
+    if nombre_pas > accumulateur['pas_max_par_image']:
+        logger.debug("Retard de %s pas physiques, limité à %s", nombre_pas, accumulateur['pas_max_par_image'])
+        nombre_pas = accumulateur['pas_max_par_image']
+        reste_ms = nombre_pas * accumulateur['pas_ms']
+    accumulateur['reste_ms'] = reste_ms
+    return accumulateur, nombre_pas
+
+def avancer_pas(accumulateur):
+    accumulateur['reste_ms'] -= accumulateur['pas_ms']
+    accumulateur['pas'] += 1
+    return accumulateur
+
+def obtenir_temps_physique(accumulateur):
+    return round(accumulateur['pas'] * accumulateur['pas_ms'])
+
+def facteur_interpolation(accumulateur):
+    return min(max(accumulateur['reste_ms'] / accumulateur['pas_ms'], 0.0), 1.0)
+
+def capturer_positions(etat_jeu):
+    """Positions de la balle et des raquettes avant un pas physique, pour l'interpolation"""
+    balle = etat_jeu['balle']
+    return {
+        'balle': (balle.x, balle.y, balle.au_service),
+        'raquette_rouge': etat_jeu['raquette_rouge'].rect.topleft,
+        'raquette_bleue': etat_jeu['raquette_bleue'].rect.topleft
+    }
+
+def interpoler(debut, fin, alpha):
+    return debut + (fin - debut) * alpha
+
+def creer_dessin():
+    """État à dessiner et copies de la balle et des raquettes, réutilisés d'une image
+    à l'autre par interpoler_etat"""
+    return {'etat': {}, 'balle': None, 'raquette_rouge': None, 'raquette_bleue': None}
+
+def interpoler_etat(precedent, etat_jeu, alpha, dessin=None):
+    """État à dessiner entre le pas physique précédent et le pas actuel.
+
+    Seules les positions sont interpolées; une balle remise au service n'est pas
+    interpolée pour éviter une traînée à travers la table. Avec `dessin` (creer_dessin),
+    le même dictionnaire et les mêmes copies servent à chaque image."""
+    try:
+        dessin = dessin or creer_dessin()
+        balle = etat_jeu['balle']
+        x_precedent, y_precedent, au_service_precedent = precedent['balle']
+        etat_dessin = dessin['etat']
+        etat_dessin.update(etat_jeu)
+        if au_service_precedent == balle.au_service:
+            copie = dessin['balle'] = balle.copier_dans(dessin['balle'])
+            copie.x = interpoler(x_precedent, balle.x, alpha)
+            copie.y = interpoler(y_precedent, balle.y, alpha)
+            etat_dessin['balle'] = copie
+
+        for nom_raquette in ('raquette_rouge', 'raquette_bleue'):
+            raquette = etat_jeu[nom_raquette]
+            x_precedent, y_precedent = precedent[nom_raquette]
+            copie = dessin[nom_raquette] = raquette.copier_dans(dessin[nom_raquette])
+            copie.rect.topleft = (
+                round(interpoler(x_precedent, raquette.rect.x, alpha)),
+                round(interpoler(y_precedent, raquette.rect.y, alpha))
+            )
+            etat_dessin[nom_raquette] = copie
+        return etat_dessin
+    except Exception as e:
+        logger.error("Erreur lors de l'interpolation de l'état: %s", e, exc_info=True)
+        return etat_jeu
@@ -0,0 +1,140 @@
+import os
+import math
+import time
+import logging
+from array import array
+import pygame
+
+logger = logging.getLogger('tennis_table')
+
+VARIABLE_PROFILEUR = 'TENNIS_TABLE_PROFILEUR'
+# Phases d'une image de boucle_principale, dans l'ordre où elles se déroulent
+PHASES = (
+    'evenements', 'entree', 'raquettes', 'deplacement_balle', 'collisions', 'score',
+    'enregistrement', 'audio', 'dessin_fond', 'dessin_objets', 'dessin_hud',
+    'affichage', 'attente'
+)
+# Histogrammes à cases logarithmiques: 1 µs à ~3 s, 6 % de précision par case
+NOMBRE_CASES = 256
+RAISON_CASES = 1.06
+LOG_RAISON = math.log(RAISON_CASES)
+# Image perdue: plus de 1,5 fois le budget d'une image (1/IPS)
+FACTEUR_IMAGE_PERDUE = 1.5
+INTERVALLE_HUD = 0.5
+CENTILES = (0.5, 0.95, 0.99)
+
+def creer_histogramme():
+    return array('Q', bytes(8 * NOMBRE_CASES))
+
+def index_case(secondes):
+    microsecondes = secondes * 1e6
+    if microsecondes < 1:
+        return 0
+    return min(NOMBRE_CASES - 1, int(math.log(microsecondes) / LOG_RAISON) + 1)
+
+def centile(histogramme, fraction):
+    """Borne haute, en secondes, de la case contenant le centile demandé"""
+    total = sum(histogramme)
+    if not total:
+        return 0.0
+    cible = fraction * total
+    cumul = 0
+    for index, nombre in enumerate(histogramme):
+        cumul += nombre
+        if cumul >= cible:
+            return RAISON_CASES ** index / 1e6
+    return RAISON_CASES ** (NOMBRE_CASES - 1) / 1e6
+
+def profileur_demande():
+    return os.environ.get(VARIABLE_PROFILEUR, '').lower() in ('1', 'oui', 'true')
+
+def creer_profileur(regles):
+    """Profileur par phase: durée de chaque phase cumulée sur l'image, puis rangée
+    dans un histogramme de taille fixe. Sans profileur (None), le code instrumenté
+    ne fait qu'un test par phase."""
+    maintenant = time.perf_counter()
+    return {
+        'histogrammes': {phase: creer_histogramme() for phase in PHASES},
+        'histogramme_image': creer_histogramme(),
+        'courant': dict.fromkeys(PHASES, 0.0),
+        'dernier': maintenant,
+        'debut_image': maintenant,
+        'budget': 1 / regles['IPS'],
+        'images': 0,
+        'images_perdues': 0,
+        'affiche': False,
+        'police': pygame.font.Font(None, 18),
+        'hud': None,
+        'hud_mis_a_jour': 0.0
+    }
+
+def marquer(profileur, phase):
+    """Attribuer à `phase` le temps écoulé depuis la marque précédente"""
+    maintenant = time.perf_counter()
+    profileur['courant'][phase] += maintenant - profileur['dernier']
+    profileur['dernier'] = maintenant
+
+def terminer_image(profileur):
+    """Ranger les durées de l'image dans les histogrammes; à appeler après tick()"""
+    marquer(profileur, 'attente')
+    histogrammes = profileur['histogrammes']
+    courant = profileur['courant']
+    for phase, duree in courant.items():
+        histogrammes[phase][index_case(duree)] += 1
+        courant[phase] = 0.0
+
+    maintenant = profileur['dernier']
+    duree_image = maintenant - profileur['debut_image']
+    profileur['debut_image'] = maintenant
+    profileur['histogramme_image'][index_case(duree_image)] += 1
+    profileur['images'] += 1
+    if duree_image > profileur['budget'] * FACTEUR_IMAGE_PERDUE:
+        profileur['images_perdues'] += 1
+
+def obtenir_resume(profileur):
+    """Centiles (ms) par phase et pour l'image entière"""
+    resume = {
+        phase: tuple(centile(histogramme, fraction) * 1000 for fraction in CENTILES)
+        for phase, histogramme in profileur['histogrammes'].items()
+    }
+    resume['image'] = tuple(centile(profileur['histogramme_image'], fraction) * 1000 for fraction in CENTILES)
+    return resume
+
+def composer_hud(profileur):
+    police = profileur['police']
+    lignes = [f"{'phase':<18}   p50    p95    p99 (ms)"]
+    lignes += [f"{phase:<18}{p50:6.2f} {p95:6.2f} {p99:6.2f}"
+               for phase, (p50, p95, p99) in obtenir_resume(profileur).items()]
+    lignes.append(f"images perdues: {profileur['images_perdues']}/{profileur['images']}")
+
+    hauteur_ligne = police.get_linesize()
+    surfaces = [police.render(ligne, True, (255, 255, 255)) for ligne in lignes]
+    hud = pygame.Surface((max(surface.get_width() for surface in surfaces) + 8,
+                          hauteur_ligne * len(lignes) + 8))
+    hud.set_alpha(200)
+    for numero, surface in enumerate(surfaces):
+        hud.blit(surface, (4, 4 + numero * hauteur_ligne))
+    return hud
+
+def dessiner_hud(profileur, ecran):
+    """Superposer les centiles en haut à gauche; retourne la zone touchée ou None"""
+    if not profileur['affiche']:
+        return None
+    try:
+        maintenant = profileur['dernier']
+        if profileur['hud'] is None or maintenant - profileur['hud_mis_a_jour'] >= INTERVALLE_HUD:
+            profileur['hud'] = composer_hud(profileur)
+            profileur['hud_mis_a_jour'] = maintenant
+        return ecran.blit(profileur['hud'], (0, 0))
+    except Exception as e:
+        logger.error("Erreur lors du dessin du profileur: %s", e, exc_info=True)
+        return None
+
+def journaliser_resume(profileur):
+    """Écrire les centiles de chaque phase dans les logs (en fin de partie)"""
+    if not profileur or not profileur['images']:
+        return
+    lignes = [f"{phase} {p50:.2f}/{p95:.2f}/{p99:.2f}"
+              for phase, (p50, p95, p99) in obtenir_resume(profileur).items()]
+    logger.info("Profil des images (p50/p95/p99 ms) sur %s images, %s perdues: %s",
+                profileur['images'], profileur['images_perdues'], "; ".join(lignes))
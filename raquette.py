@@ -1,22 +1,51 @@
 import pygame
+import math
 import logging
+from dataclasses import dataclass, field
+from etats import EtatMutable
 from regles_tennis_table import creer_regles
 
 logger = logging.getLogger('tennis_table')
 
-def creer_raquette(x, y, vitesse, image=None):
-    """Créer une nouvelle raquette avec son état initial"""
-    logger.debug(f"Création raquette à ({x}, {y}) avec vitesse {vitesse}")
-    regles = creer_regles()
+# Repli par sous-pas: déplacement relatif d'au plus un demi-rayon par sous-pas, dans cette limite
+SOUS_PAS_MAX = 64
+
+@dataclass(slots=True, eq=False)
+class Raquette(EtatMutable):
+    regles: dict = field(repr=False)
+    rect: pygame.Rect
+    zone_collision: pygame.Rect
+    vitesse: int
+    image: object = field(repr=False)
+    est_raquette_gauche: bool
+    dx: int
+    dy: int
+    temps_dernier_impact: int
+    delai_entre_impacts: int
+    x_min: int
+    x_max: int
+    x_initial: int
+    y_initial: int
+    zone_precedente: tuple
+
+    CHAMPS_COPIES = ('rect', 'zone_collision')
+
+def creer_raquette(x, y, vitesse, image=None, regles=None, orientee=False):
+    """Créer une nouvelle raquette avec son état initial.
+
+    orientee: image déjà à la taille de la raquette et tournée vers la table
+    (ressources du cache), à utiliser telle quelle."""
+    logger.debug("Création raquette à (%s, %s) avec vitesse %s", x, y, vitesse)
+    regles = regles or creer_regles()
     rect = pygame.Rect(x, y, regles['LARGEUR_RAQUETTE'], regles['HAUTEUR_RAQUETTE'])
     
     HAUTEUR_TETE = regles['HAUTEUR_RAQUETTE'] * 0.55
-    y_tete = y + regles['HAUTEUR_RAQUETTE']
+    y_tete = y + regles['HAUTEUR_RAQUETTE'] * 0.05
     zone_collision = pygame.Rect(x, y_tete, regles['LARGEUR_RAQUETTE'], HAUTEUR_TETE)
     
     est_raquette_gauche = x < regles['LARGEUR_FENETRE'] // 2
     
-    if image:
+    if image and not orientee:
         image = pygame.transform.scale(image, 
                                     (regles['LARGEUR_RAQUETTE'], 
                                      regles['HAUTEUR_RAQUETTE']))
@@ -27,105 +56,314 @@ def creer_raquette(x, y, vitesse, image=None):
     x_min = 0 if est_raquette_gauche else moitie_ecran
     x_max = moitie_ecran if est_raquette_gauche else regles['LARGEUR_FENETRE']
     
-    raquette = {
-        'regles': regles,
-        'rect': rect,
-        'zone_collision': zone_collision,
-        'vitesse': vitesse,
-        'image': image,
-        'est_raquette_gauche': est_raquette_gauche,
-        'dx': 0,
-        'dy': 0,
-        'temps_dernier_impact': 0,
-        'delai_entre_impacts': regles['DELAI_ENTRE_IMPACTS'],
-        'x_min': x_min,
-        'x_max': x_max,
-        'x_initial': x,
-        'y_initial': y
-    }
-    logger.debug(f"Raquette créée: {raquette}")
+    raquette = Raquette(
+        regles=regles,
+        rect=rect,
+        zone_collision=zone_collision,
+        vitesse=vitesse,
+        image=image,
+        est_raquette_gauche=est_raquette_gauche,
+        dx=0,
+        dy=0,
+        temps_dernier_impact=0,
+        delai_entre_impacts=regles['DELAI_ENTRE_IMPACTS'],
+        x_min=x_min,
+        x_max=x_max,
+        x_initial=x,
+        y_initial=y,
+        zone_precedente=zone_collision.topleft
+    )
+    logger.debug("Raquette créée: %s", raquette)
     return raquette
 
 def deplacer(raquette):
-    nouveau_x = raquette['rect'].x + raquette['dx']
-    nouveau_y = raquette['rect'].y + raquette['dy']
-    logger.debug(f"Déplacement raquette vers ({nouveau_x}, {nouveau_y})")
+    rect = raquette.rect
+    zone_collision = raquette.zone_collision
+    nouveau_x = rect.x + raquette.dx
+    nouveau_y = rect.y + raquette.dy
+    # Appelée à chaque pas physique: pas d'appel au logger quand DEBUG est désactivé
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("Déplacement raquette vers (%s, %s)", nouveau_x, nouveau_y)
     
-    nouvelle_raquette = {**raquette}
-    nouveau_rect = nouvelle_raquette['rect'].copy()
-    nouvelle_zone_collision = nouvelle_raquette['zone_collision'].copy()
+    raquette.zone_precedente = zone_collision.topleft
     
-    if raquette['x_min'] <= nouveau_x <= raquette['x_max'] - raquette['rect'].width:
-        nouveau_rect.x = nouveau_x
-        nouvelle_zone_collision.x = nouveau_x
-    else:
+    if raquette.x_min <= nouveau_x <= raquette.x_max - rect.width:
+        rect.x = nouveau_x
+        zone_collision.x = nouveau_x
+    elif debug:
         logger.debug("Limite horizontale atteinte")
             
-    nouveau_rect.y = min(max(0, nouveau_y), 
-                        raquette['regles']['HAUTEUR_FENETRE'] - raquette['rect'].height)
-    if nouveau_rect.y != nouveau_y:
+    rect.y = min(max(0, nouveau_y), raquette.regles['HAUTEUR_FENETRE'] - rect.height)
+    if debug and rect.y != nouveau_y:
         logger.debug("Limite verticale atteinte")
     
-    nouvelle_zone_collision.y = nouveau_rect.y + raquette['regles']['HAUTEUR_RAQUETTE'] * 0.05
-    
-    nouvelle_raquette['rect'] = nouveau_rect
-    nouvelle_raquette['zone_collision'] = nouvelle_zone_collision
-    return nouvelle_raquette
+    zone_collision.y = rect.y + raquette.regles['HAUTEUR_RAQUETTE'] * 0.05
+    return raquette
 
 def definir_velocite(raquette, dx, dy):
     """Définir la vélocité de la raquette pour les deux axes"""
-    logger.debug(f"Nouvelle vélocité: dx={dx}, dy={dy}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Nouvelle vélocité: dx=%s, dy=%s", dx, dy)
+    raquette.dx = dx * raquette.vitesse
+    raquette.dy = dy * raquette.vitesse
+    return raquette
+
+def temps_impact_coin(ax, ay, ux, uy, coin_x, coin_y, rayon):
+    """Plus petite racine dans [0, 1] de |a + u t - coin| = rayon, en approche"""
+    ex = ax - coin_x
+    ey = ay - coin_y
+    a = ux * ux + uy * uy
+    b = ex * ux + ey * uy
+    c = ex * ex + ey * ey - rayon * rayon
+    if b >= 0 or a == 0:
+        return None
+    discriminant = b * b - a * c
+    if discriminant < 0:
+        return None
+    t = (-b - math.sqrt(discriminant)) / a
+    return t if 0 <= t <= 1 else None
+
+def temps_impact_coins(ax, ay, ux, uy, largeur, hauteur, rayon):
+    """Premier contact avec l'un des quatre quarts de cercle des coins, ou None"""
+    premier = None
+    for coin_x, coin_y in ((0, 0), (largeur, 0), (0, hauteur), (largeur, hauteur)):
+        t = temps_impact_coin(ax, ay, ux, uy, coin_x, coin_y, rayon)
+        if t is not None and (premier is None or t < premier):
+            premier = t
+    return premier
+
+def calculer_temps_impact(ax, ay, ux, uy, largeur, hauteur, rayon):
+    """Instant t dans [0, 1] où un cercle de centre (ax, ay), exprimé par rapport au coin
+    haut-gauche d'un rectangle et se déplaçant de (ux, uy) pendant le pas, touche ce rectangle.
+
+    Le contour balayé est un rectangle aux coins arrondis: quatre faces décalées
+    du rayon et quatre quarts de cercle. Ce contour étant convexe, un contact sur
+    une face est forcément le premier: les coins ne sont essayés qu'à défaut.
+    Retourne None s'il n'y a pas de contact."""
+    proche_x = 0 if ax < 0 else (largeur if ax > largeur else ax)
+    proche_y = 0 if ay < 0 else (hauteur if ay > hauteur else ay)
+    ex = ax - proche_x
+    ey = ay - proche_y
+    if ex * ex + ey * ey <= rayon * rayon:
+        return 0.0
+
+    if ux > 0 and ax < -rayon:
+        t = (-rayon - ax) / ux
+        if t <= 1 and 0 <= ay + uy * t <= hauteur:
+            return t
+    elif ux < 0 and ax > largeur + rayon:
+        t = (largeur + rayon - ax) / ux
+        if t <= 1 and 0 <= ay + uy * t <= hauteur:
+            return t
+
+    if uy > 0 and ay < -rayon:
+        t = (-rayon - ay) / uy
+        if t <= 1 and 0 <= ax + ux * t <= largeur:
+            return t
+    elif uy < 0 and ay > hauteur + rayon:
+        t = (hauteur + rayon - ay) / uy
+        if t <= 1 and 0 <= ax + ux * t <= largeur:
+            return t
+
+    return temps_impact_coins(ax, ay, ux, uy, largeur, hauteur, rayon)
+
+def decouper_trajet(balle):
+    """Sous-pas du trajet de la balle pendant le dernier déplacement.
+
+    Un rebond sur le haut ou le bas de l'écran rend le trajet non linéaire: le pas
+    est alors coupé à l'instant du rebond pour que chaque sous-pas reste linéaire.
+    Retourne None si le trajet ne se décompose pas ainsi (instant de rebond hors
+    du pas, par exemple pour une balle replacée hors de l'écran)."""
+    x_fin, y_fin = balle.x, balle.y
+    x_debut, y_debut = balle.x_precedent, balle.y_precedent
+    fraction_rebond = balle.fraction_rebond
+    if fraction_rebond is None:
+        return ((0.0, 1.0, x_debut, y_debut, x_fin, y_fin),)
+    if not 0 <= fraction_rebond <= 1:
+        return None
+
+    x_rebond = x_debut + (x_fin - x_debut) * fraction_rebond
+    return (
+        (0.0, fraction_rebond, x_debut, y_debut, x_rebond, y_fin),
+        (fraction_rebond, 1.0, x_rebond, y_fin, x_fin, y_fin)
+    )
+
+def creer_impact(temps, x, y, zone_x, zone_y, largeur, hauteur, sens):
+    """Centre de la balle au contact, point de contact sur la zone de frappe (placée
+    en zone_x, zone_y à cet instant), normale au contact dirigée vers la balle et
+    position relative de l'impact dans la zone.
+
+    sens: 1 si la table est à droite de la raquette, -1 sinon; c'est la normale
+    retenue quand le centre de la balle est déjà dans la zone."""
+    contact_x = zone_x if x < zone_x else (zone_x + largeur if x > zone_x + largeur else x)
+    contact_y = zone_y if y < zone_y else (zone_y + hauteur if y > zone_y + hauteur else y)
+    distance = math.hypot(x - contact_x, y - contact_y)
+    if distance > 0:
+        normale = ((x - contact_x) / distance, (y - contact_y) / distance)
+    else:
+        contact_x = zone_x + largeur if sens > 0 else zone_x
+        normale = (float(sens), 0.0)
     return {
-        **raquette,
-        'dx': dx * raquette['vitesse'],
-        'dy': dy * raquette['vitesse']
+        'temps': temps,
+        'x': x,
+        'y': y,
+        'point_contact': (contact_x, contact_y),
+        'normale': normale,
+        'position_impact': (contact_y - zone_y) / hauteur
     }
 
+def verifier_par_sous_pas(balle, zone_x_debut, zone_y_debut, zone_x, zone_y, largeur, hauteur, rayon, sens):
+    """Repli quand le trajet n'a pas de solution analytique: le pas est découpé selon le
+    déplacement relatif de la balle et de la raquette, et le recouvrement du cercle et
+    de la zone testé à chaque sous-pas"""
+    x_debut, y_debut = balle.x_precedent, balle.y_precedent
+    deplacement_x, deplacement_y = balle.x - x_debut, balle.y - y_debut
+    deplacement_zone_x, deplacement_zone_y = zone_x - zone_x_debut, zone_y - zone_y_debut
+    distance = math.hypot(deplacement_x - deplacement_zone_x, deplacement_y - deplacement_zone_y)
+    nombre = min(SOUS_PAS_MAX, max(1, math.ceil(distance / (rayon * 0.5))))
+    for index in range(nombre + 1):
+        temps = index / nombre
+        x = x_debut + deplacement_x * temps
+        y = y_debut + deplacement_y * temps
+        zx = zone_x_debut + deplacement_zone_x * temps
+        zy = zone_y_debut + deplacement_zone_y * temps
+        ex = x - min(max(x, zx), zx + largeur)
+        ey = y - min(max(y, zy), zy + hauteur)
+        if ex * ex + ey * ey <= rayon * rayon:
+            return True, creer_impact(temps, x, y, zx, zy, largeur, hauteur, sens)
+    return False, None
+
 def verifier_collision_balle(raquette, balle, temps_actuel):
-    if temps_actuel - raquette['temps_dernier_impact'] < raquette['delai_entre_impacts']:
+    """Test de collision continu entre la balle et la zone de frappe pendant le dernier pas.
+
+    Le déplacement de la balle et celui de la raquette sont tous deux pris en compte,
+    si bien qu'une balle rapide ne peut plus traverser la raquette. Retourne
+    (collision, impact) où impact donne le centre de la balle au contact, le point
+    de contact sur la raquette, la normale au contact et la position relative de
+    l'impact dans la zone."""
+    if temps_actuel - raquette.temps_dernier_impact < raquette.delai_entre_impacts:
         return False, None
-        
-    balle_rect = pygame.Rect(
-        balle['x'] - balle['rayon'],
-        balle['y'] - balle['rayon'],
-        balle['rayon'] * 2,
-        balle['rayon'] * 2
-    )
-    
-    collision = raquette['zone_collision'].colliderect(balle_rect)
-    if collision:
-        position_impact = (balle['y'] - raquette['zone_collision'].top) / raquette['zone_collision'].height
-        logger.debug(f"Collision détectée à la position relative {position_impact}")
-        return True, position_impact
-    
+
+    # Presque tous les pas s'arrêtent ici: rejet sur l'axe x d'abord, par simples
+    # comparaisons avec la zone balayée par la raquette, avant de construire quoi que ce soit
+    zone = raquette.zone_collision
+    rayon = balle.rayon
+    zone_x = zone.x
+    zone_x_debut, zone_y_debut = raquette.zone_precedente
+    x_debut = balle.x_precedent
+    x_fin = balle.x
+    if x_debut < x_fin:
+        if x_debut - rayon > (zone.right if zone_x_debut < zone_x else zone_x_debut + zone.width) \
+           or x_fin + rayon < (zone_x_debut if zone_x_debut < zone_x else zone_x):
+            return False, None
+    elif x_fin - rayon > (zone.right if zone_x_debut < zone_x else zone_x_debut + zone.width) \
+         or x_debut + rayon < (zone_x_debut if zone_x_debut < zone_x else zone_x):
+        return False, None
+
+    zone_y = zone.y
+    y_debut = balle.y_precedent
+    y_fin = balle.y
+    if y_debut < y_fin:
+        if y_debut - rayon > (zone.bottom if zone_y_debut < zone_y else zone_y_debut + zone.height) \
+           or y_fin + rayon < (zone_y_debut if zone_y_debut < zone_y else zone_y):
+            return False, None
+    elif y_fin - rayon > (zone.bottom if zone_y_debut < zone_y else zone_y_debut + zone.height) \
+         or y_debut + rayon < (zone_y_debut if zone_y_debut < zone_y else zone_y):
+        return False, None
+
+    largeur = zone.width
+    hauteur = zone.height
+    sens = 1 if raquette.est_raquette_gauche else -1
+    if balle.fraction_rebond is None and zone_x == zone_x_debut and zone_y == zone_y_debut:
+        # Cas courant: trajet linéaire et raquette immobile, calculer_temps_impact en ligne
+        ax = x_debut - zone_x
+        ay = y_debut - zone_y
+        ux = x_fin - x_debut
+        uy = y_fin - y_debut
+        proche_x = 0 if ax < 0 else (largeur if ax > largeur else ax)
+        proche_y = 0 if ay < 0 else (hauteur if ay > hauteur else ay)
+        ex = ax - proche_x
+        ey = ay - proche_y
+        t = None
+        if ex * ex + ey * ey <= rayon * rayon:
+            t = 0.0
+        else:
+            if ux > 0 and ax < -rayon:
+                t = (-rayon - ax) / ux
+            elif ux < 0 and ax > largeur + rayon:
+                t = (largeur + rayon - ax) / ux
+            if t is not None and not (t <= 1 and 0 <= ay + uy * t <= hauteur):
+                t = None
+            if t is None:
+                if uy > 0 and ay < -rayon:
+                    t = (-rayon - ay) / uy
+                elif uy < 0 and ay > hauteur + rayon:
+                    t = (hauteur + rayon - ay) / uy
+                if t is not None and not (t <= 1 and 0 <= ax + ux * t <= largeur):
+                    t = None
+            if t is None:
+                t = temps_impact_coins(ax, ay, ux, uy, largeur, hauteur, rayon)
+        if t is None:
+            return False, None
+        return True, creer_impact(t, x_debut + ux * t, y_debut + uy * t, zone_x, zone_y, largeur, hauteur, sens)
+
+    sous_pas = decouper_trajet(balle)
+    if sous_pas is None:
+        return verifier_par_sous_pas(balle, zone_x_debut, zone_y_debut, zone_x, zone_y,
+                                     largeur, hauteur, rayon, sens)
+
+    deplacement_zone_x = zone_x - zone_x_debut
+    deplacement_zone_y = zone_y - zone_y_debut
+    for t_debut, t_fin, bx_debut, by_debut, bx_fin, by_fin in sous_pas:
+        zx_debut = zone_x_debut + deplacement_zone_x * t_debut
+        zy_debut = zone_y_debut + deplacement_zone_y * t_debut
+        zx_fin = zone_x_debut + deplacement_zone_x * t_fin
+        zy_fin = zone_y_debut + deplacement_zone_y * t_fin
+        ax = bx_debut - zx_debut
+        ay = by_debut - zy_debut
+        t = calculer_temps_impact(ax, ay, (bx_fin - zx_fin) - ax, (by_fin - zy_fin) - ay,
+                                  largeur, hauteur, rayon)
+        if t is None:
+            continue
+
+        temps = t_debut + (t_fin - t_debut) * t
+        return True, creer_impact(
+            temps,
+            bx_debut + (bx_fin - bx_debut) * t,
+            by_debut + (by_fin - by_debut) * t,
+            zone_x_debut + deplacement_zone_x * temps,
+            zone_y_debut + deplacement_zone_y * temps,
+            largeur,
+            hauteur,
+            sens
+        )
+
     return False, None
 
+def enregistrer_impact(raquette, temps_actuel):
+    """Mémoriser l'instant du dernier impact pour appliquer le délai entre impacts"""
+    raquette.temps_dernier_impact = temps_actuel
+    return raquette
+
 def reinitialiser_position(raquette):
     """Réinitialiser la raquette à sa position initiale"""
     logger.debug("Réinitialisation position raquette")
-    nouvelle_raquette = arreter(raquette)
-    nouveau_rect = nouvelle_raquette['rect'].copy()
-    nouveau_rect.x = nouvelle_raquette['x_initial']
-    nouveau_rect.y = nouvelle_raquette['y_initial']
-    
-    nouvelle_zone_collision = nouvelle_raquette['zone_collision'].copy()
-    nouvelle_zone_collision.x = nouveau_rect.x
-    nouvelle_zone_collision.y = nouveau_rect.y + raquette['regles']['HAUTEUR_RAQUETTE'] * 0.05
-    
-    nouvelle_raquette['rect'] = nouveau_rect
-    nouvelle_raquette['zone_collision'] = nouvelle_zone_collision
-    return nouvelle_raquette
+    arreter(raquette)
+    raquette.rect.topleft = (raquette.x_initial, raquette.y_initial)
+    raquette.zone_collision.x = raquette.rect.x
+    raquette.zone_collision.y = raquette.rect.y + raquette.regles['HAUTEUR_RAQUETTE'] * 0.05
+    raquette.zone_precedente = raquette.zone_collision.topleft
+    return raquette
 
 def arreter(raquette):
     logger.debug("Arrêt de la raquette")
-    return {
-        **raquette,
-        'dx': 0,
-        'dy': 0
-    }
+    raquette.dx = 0
+    raquette.dy = 0
+    return raquette
 
 def dessiner(raquette, ecran):
-    if raquette['image']:
-        ecran.blit(raquette['image'], raquette['rect'])
-    else:
-        pygame.draw.rect(ecran, raquette['regles']['BLANC'], raquette['rect'])
+    """Dessiner la raquette et retourner la zone touchée"""
+    if raquette.image:
+        return ecran.blit(raquette.image, raquette.rect)
+    return pygame.draw.rect(ecran, raquette.regles['BLANC'], raquette.rect)
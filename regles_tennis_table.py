@@ -20,7 +20,11 @@ def creer_regles():
                 'DROITE': pygame.K_RIGHT
             },
             'SERVICE': pygame.K_SPACE,
-            'REINITIALISER': pygame.K_r
+            'REINITIALISER': pygame.K_r,
+            'VIDER_ENREGISTREUR': pygame.K_F9,
+            'PROFILEUR': pygame.K_F3,
+            'CAPTURE_CPROFILE': pygame.K_F10,
+            'CAPTURE_ECHANTILLONS': pygame.K_F11
         }
 
         ETATS_JEU = {
@@ -33,7 +37,8 @@ def creer_regles():
         }
 
         MODES_JEU = {
-            'SIMPLE': 'simple'
+            'SIMPLE': 'simple',
+            'CONTRE_CPU': 'contre_cpu'
         }
 
         COULEURS_NIVEAU = [
@@ -48,6 +53,14 @@ def creer_regles():
             'HAUTEUR_FENETRE': 600,
             'TITRE_FENETRE': "Tennis de Table",
             'IPS': 60,
+            'IPS_PHYSIQUE': 60,
+            'PAS_PHYSIQUES_MAX_PAR_IMAGE': 5,
+            'DUREE_ENREGISTREUR_VOL': 10,
+            'DUREE_CAPTURE_PROFIL': 10,
+            'FREQUENCE_ECHANTILLONNAGE': 200,
+            'FREQUENCE_AUDIO': 44100,
+            'TAMPON_AUDIO': 512,
+            'INTERVALLE_MIN_SON': 40,
             'POINTS_POUR_GAGNER': 11,
             'DIFFERENCE_POINTS_MIN': 2,
             'JEUX_POUR_GAGNER_MATCH': 4,
@@ -67,6 +80,11 @@ def creer_regles():
             'RAYON_BALLE': 7,
             'VITESSE_BALLE_MIN': 7.0,
             'VITESSE_BALLE_MAX': 18.0,
+            'DELAI_REACTION_CPU_MAX': 450,
+            'DELAI_REACTION_CPU_MIN': 60,
+            'ERREUR_VISEE_CPU_MAX': 45,
+            'ERREUR_VISEE_CPU_MIN': 4,
+            'DELAI_SERVICE_CPU': 700,
             'TAILLE_POLICE_PRINCIPALE': 48,
             'TAILLE_POLICE_SECONDAIRE': 32,
             'TAILLE_POLICE_STANDARD': 36,
@@ -77,6 +95,7 @@ def creer_regles():
             'LARGEUR_CURSEUR_DIFFICULTE': 400,
             'HAUTEUR_CURSEUR_DIFFICULTE': 8,
             'RAYON_POIGNEE_DIFFICULTE': 12,
+            'DELAI_ATTENTE_MENU': 250,
             'BLANC': (255, 255, 255),
             'NOIR': (0, 0, 0),
             'GRIS': (64, 64, 66),
@@ -94,14 +113,14 @@ def creer_regles():
         logger.debug("Règles créées avec succès")
         return regles
     except Exception as e:
-        logger.error(f"Erreur lors de la création des règles: {e}", exc_info=True)
+        logger.error("Erreur lors de la création des règles: %s", e, exc_info=True)
         raise
 
 def est_avantage(regles, score1, score2):
     try:
         return score1 >= 10 and score2 >= 10
     except Exception as e:
-        logger.error(f"Erreur lors de la vérification de l'avantage: {e}", exc_info=True)
+        logger.error("Erreur lors de la vérification de l'avantage: %s", e, exc_info=True)
         return False
 
 def est_gagnant_jeu(regles, score1, score2):
@@ -111,7 +130,7 @@ def est_gagnant_jeu(regles, score1, score2):
                 return 1 if score1 > score2 else 2
         return None
     except Exception as e:
-        logger.error(f"Erreur lors de la vérification du gagnant du jeu: {e}", exc_info=True)
+        logger.error("Erreur lors de la vérification du gagnant du jeu: %s", e, exc_info=True)
         return None
 
 def est_gagnant_match(regles, jeux1, jeux2):
@@ -122,7 +141,7 @@ def est_gagnant_match(regles, jeux1, jeux2):
             return 2
         return None
     except Exception as e:
-        logger.error(f"Erreur lors de la vérification du gagnant du match: {e}", exc_info=True)
+        logger.error("Erreur lors de la vérification du gagnant du match: %s", e, exc_info=True)
         return None
 
 def obtenir_vitesse_balle_pour_niveau(regles, niveau):
@@ -130,9 +149,26 @@ def obtenir_vitesse_balle_pour_niveau(regles, niveau):
         ratio = (niveau - regles['DIFFICULTE_MIN']) / (regles['DIFFICULTE_MAX'] - regles['DIFFICULTE_MIN'])
         return regles['VITESSE_BALLE_MIN'] + (regles['VITESSE_BALLE_MAX'] - regles['VITESSE_BALLE_MIN']) * ratio
     except Exception as e:
-        logger.error(f"Erreur lors du calcul de la vitesse de balle: {e}", exc_info=True)
+        logger.error("Erreur lors du calcul de la vitesse de balle: %s", e, exc_info=True)
         return regles['VITESSE_BALLE_MIN']
 
+def obtenir_parametres_cpu(regles, niveau):
+    """Délai de réaction (ms) et erreur de visée (pixels) de l'adversaire CPU pour un niveau"""
+    try:
+        ratio = (niveau - regles['DIFFICULTE_MIN']) / (regles['DIFFICULTE_MAX'] - regles['DIFFICULTE_MIN'])
+        return {
+            'delai_reaction': regles['DELAI_REACTION_CPU_MAX'] -
+                (regles['DELAI_REACTION_CPU_MAX'] - regles['DELAI_REACTION_CPU_MIN']) * ratio,
+            'erreur_visee': regles['ERREUR_VISEE_CPU_MAX'] -
+                (regles['ERREUR_VISEE_CPU_MAX'] - regles['ERREUR_VISEE_CPU_MIN']) * ratio
+        }
+    except Exception as e:
+        logger.error("Erreur lors du calcul des paramètres CPU: %s", e, exc_info=True)
+        return {
+            'delai_reaction': regles['DELAI_REACTION_CPU_MAX'],
+            'erreur_visee': regles['ERREUR_VISEE_CPU_MAX']
+        }
+
 def obtenir_nom_niveau(regles, niveau):
     try:
         if niveau <= 3:
@@ -144,5 +180,5 @@ def obtenir_nom_niveau(regles, niveau):
         else:
             return "Maître"
     except Exception as e:
-        logger.error(f"Erreur lors de l'obtention du nom du niveau: {e}", exc_info=True)
+        logger.error("Erreur lors de l'obtention du nom du niveau: %s", e, exc_info=True)
         return "Débutant"
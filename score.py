@@ -1,49 +1,50 @@
 import logging
+from dataclasses import dataclass, field
+from etats import EtatMutable
 from regles_tennis_table import creer_regles, est_avantage, est_gagnant_jeu, est_gagnant_match
 
 logger = logging.getLogger('tennis_table')
 
-def creer_score():
+@dataclass(slots=True, eq=False)
+class Score(EtatMutable):
+    regles: dict = field(repr=False)
+    score_joueur1: int = 0
+    score_joueur2: int = 0
+    jeux_joueur1: int = 0
+    jeux_joueur2: int = 0
+    est_avantage: bool = False
+    gagnant_jeu: int = None
+    gagnant_match: int = None
+    avantage_joueur: int = None
+    dernier_point: int = None
+    service_change: bool = False
+
+def creer_score(regles=None):
     try:
         logger.debug("Création d'un nouveau score")
-        score = {
-            'regles': creer_regles(),
-            'score_joueur1': 0,
-            'score_joueur2': 0,
-            'jeux_joueur1': 0,
-            'jeux_joueur2': 0,
-            'est_avantage': False,
-            'gagnant_jeu': None,
-            'gagnant_match': None
-        }
-        logger.debug(f"Score créé: {score}")
+        score = Score(regles=regles or creer_regles())
+        logger.debug("Score créé: %s", score)
         return score
     except Exception as e:
-        logger.error(f"Erreur lors de la création du score: {e}", exc_info=True)
+        logger.error("Erreur lors de la création du score: %s", e, exc_info=True)
         raise
 
 def incrementer_joueur1(score):
     try:
-        logger.debug(f"Incrémentation score joueur 1: {score['score_joueur1']} -> {score['score_joueur1'] + 1}")
-        nouveau_score = {
-            **score,
-            'score_joueur1': score['score_joueur1'] + 1
-        }
-        return verifier_progression(nouveau_score)
+        logger.debug("Incrémentation score joueur 1: %s -> %s", score.score_joueur1, score.score_joueur1 + 1)
+        score.score_joueur1 += 1
+        return verifier_progression(score)
     except Exception as e:
-        logger.error(f"Erreur lors de l'incrémentation du score joueur 1: {e}", exc_info=True)
+        logger.error("Erreur lors de l'incrémentation du score joueur 1: %s", e, exc_info=True)
         return score
 
 def incrementer_joueur2(score):
     try:
-        logger.debug(f"Incrémentation score joueur 2: {score['score_joueur2']} -> {score['score_joueur2'] + 1}")
-        nouveau_score = {
-            **score,
-            'score_joueur2': score['score_joueur2'] + 1
-        }
-        return verifier_progression(nouveau_score)
+        logger.debug("Incrémentation score joueur 2: %s -> %s", score.score_joueur2, score.score_joueur2 + 1)
+        score.score_joueur2 += 1
+        return verifier_progression(score)
     except Exception as e:
-        logger.error(f"Erreur lors de l'incrémentation du score joueur 2: {e}", exc_info=True)
+        logger.error("Erreur lors de l'incrémentation du score joueur 2: %s", e, exc_info=True)
         return score
 
 def verifier_progression(score):
@@ -51,130 +52,121 @@ def verifier_progression(score):
         nouveau_score = verifier_avantage(score)
         return verifier_gagnant(nouveau_score)
     except Exception as e:
-        logger.error(f"Erreur lors de la vérification de la progression: {e}", exc_info=True)
+        logger.error("Erreur lors de la vérification de la progression: %s", e, exc_info=True)
         return score
 
 def verifier_avantage(score):
     try:
-        avantage = est_avantage(score['regles'], score['score_joueur1'], score['score_joueur2'])
-        difference = abs(score['score_joueur1'] - score['score_joueur2'])
+        avantage = est_avantage(score.regles, score.score_joueur1, score.score_joueur2)
+        difference = abs(score.score_joueur1 - score.score_joueur2)
         
-        nouveau_score = {
-            **score,
-            'est_avantage': avantage,
-            'avantage_joueur': (1 if score['score_joueur1'] > score['score_joueur2']
-                               else 2 if score['score_joueur2'] > score['score_joueur1']
-                               else None) if avantage and difference == 1 else None
-        }
+        score.est_avantage = avantage
+        score.avantage_joueur = (1 if score.score_joueur1 > score.score_joueur2
+                                 else 2 if score.score_joueur2 > score.score_joueur1
+                                 else None) if avantage and difference == 1 else None
         
-        if nouveau_score['est_avantage']:
-            logger.debug(f"Avantage détecté pour joueur {nouveau_score['avantage_joueur']}")
+        if score.est_avantage:
+            logger.debug("Avantage détecté pour joueur %s", score.avantage_joueur)
             
-        return nouveau_score
+        return score
     except Exception as e:
-        logger.error(f"Erreur lors de la vérification de l'avantage: {e}", exc_info=True)
+        logger.error("Erreur lors de la vérification de l'avantage: %s", e, exc_info=True)
         return score
 
 def verifier_gagnant(score):
     try:
-        if score['gagnant_jeu'] is None:
+        if score.gagnant_jeu is None:
             gagnant = est_gagnant_jeu(
-                score['regles'],
-                score['score_joueur1'],
-                score['score_joueur2']
+                score.regles,
+                score.score_joueur1,
+                score.score_joueur2
             )
             if gagnant:
-                logger.debug(f"Gagnant détecté: Joueur {gagnant}")
+                logger.debug("Gagnant détecté: Joueur %s", gagnant)
                 return gerer_victoire_jeu(score, gagnant)
         return score
     except Exception as e:
-        logger.error(f"Erreur lors de la vérification du gagnant: {e}", exc_info=True)
+        logger.error("Erreur lors de la vérification du gagnant: %s", e, exc_info=True)
         return score
 
 def gerer_victoire_jeu(score, gagnant):
     try:
-        logger.debug(f"Gestion de la victoire du jeu pour le joueur {gagnant}")
-        nouveau_score = {
-            **score,
-            'gagnant_jeu': gagnant,
-            'jeux_joueur1': score['jeux_joueur1'] + (1 if gagnant == 1 else 0),
-            'jeux_joueur2': score['jeux_joueur2'] + (1 if gagnant == 2 else 0)
-        }
+        logger.debug("Gestion de la victoire du jeu pour le joueur %s", gagnant)
+        score.gagnant_jeu = gagnant
+        score.jeux_joueur1 += 1 if gagnant == 1 else 0
+        score.jeux_joueur2 += 1 if gagnant == 2 else 0
 
-        nouveau_score['gagnant_match'] = est_gagnant_match(
-            score['regles'],
-            nouveau_score['jeux_joueur1'],
-            nouveau_score['jeux_joueur2']
+        score.gagnant_match = est_gagnant_match(
+            score.regles,
+            score.jeux_joueur1,
+            score.jeux_joueur2
         )
         
-        if nouveau_score['gagnant_match']:
-            logger.debug(f"Match gagné par le joueur {nouveau_score['gagnant_match']}")
+        if score.gagnant_match:
+            logger.debug("Match gagné par le joueur %s", score.gagnant_match)
 
-        return nouveau_score
+        return score
     except Exception as e:
-        logger.error(f"Erreur lors de la gestion de la victoire: {e}", exc_info=True)
+        logger.error("Erreur lors de la gestion de la victoire: %s", e, exc_info=True)
         return score
 
 def obtenir_etat_jeu(score):
     try:
         logger.debug("Récupération de l'état du jeu")
         return {
-            'score': (score['score_joueur1'], score['score_joueur2']),
-            'jeux': (score['jeux_joueur1'], score['jeux_joueur2']),
-            'est_avantage': score['est_avantage'],
-            'gagnant_jeu': score['gagnant_jeu'],
-            'gagnant_match': score['gagnant_match'],
-            'etat': (score['regles']['ETATS_JEU']['JEU_TERMINE'] if score['gagnant_jeu'] 
-                    else score['regles']['ETATS_JEU']['MATCH_TERMINE'] if score['gagnant_match'] 
-                    else score['regles']['ETATS_JEU']['ECHANGE'])
+            'score': (score.score_joueur1, score.score_joueur2),
+            'jeux': (score.jeux_joueur1, score.jeux_joueur2),
+            'est_avantage': score.est_avantage,
+            'gagnant_jeu': score.gagnant_jeu,
+            'gagnant_match': score.gagnant_match,
+            'etat': (score.regles['ETATS_JEU']['JEU_TERMINE'] if score.gagnant_jeu 
+                    else score.regles['ETATS_JEU']['MATCH_TERMINE'] if score.gagnant_match 
+                    else score.regles['ETATS_JEU']['ECHANGE'])
         }
     except Exception as e:
-        logger.error(f"Erreur lors de l'obtention de l'état du jeu: {e}", exc_info=True)
+        logger.error("Erreur lors de l'obtention de l'état du jeu: %s", e, exc_info=True)
         return None
 
 def obtenir_affichage_score(score):
     try:
-        score_jeu = f"{score['score_joueur1']}-{score['score_joueur2']}"
-        score_match = f"Jeux: {score['jeux_joueur1']}-{score['jeux_joueur2']}"
+        score_jeu = f"{score.score_joueur1}-{score.score_joueur2}"
+        score_match = f"Jeux: {score.jeux_joueur1}-{score.jeux_joueur2}"
         
-        if score['est_avantage']:
+        if score.est_avantage:
             score_jeu += " AVANTAGE"
         
-        logger.debug(f"Affichage du score: {score_jeu}, {score_match}")
+        logger.debug("Affichage du score: %s, %s", score_jeu, score_match)
         return score_jeu, score_match
     except Exception as e:
-        logger.error(f"Erreur lors de la création de l'affichage du score: {e}", exc_info=True)
+        logger.error("Erreur lors de la création de l'affichage du score: %s", e, exc_info=True)
         return "0-0", "Jeux: 0-0"
 
 def commencer_nouveau_jeu(score):
     try:
         logger.debug("Démarrage d'un nouveau jeu")
-        return {
-            **score,
-            'score_joueur1': 0,
-            'score_joueur2': 0,
-            'est_avantage': False,
-            'gagnant_jeu': None,
-            'dernier_point': None,
-            'service_change': True
-        }
+        score.score_joueur1 = 0
+        score.score_joueur2 = 0
+        score.est_avantage = False
+        score.gagnant_jeu = None
+        score.dernier_point = None
+        score.service_change = True
+        return score
     except Exception as e:
-        logger.error(f"Erreur lors du démarrage d'un nouveau jeu: {e}", exc_info=True)
+        logger.error("Erreur lors du démarrage d'un nouveau jeu: %s", e, exc_info=True)
         return score
 
 def reinitialiser(score):
     try:
         logger.debug("Réinitialisation complète du score")
-        return {
-            **score,
-            'score_joueur1': 0,
-            'score_joueur2': 0,
-            'jeux_joueur1': 0,
-            'jeux_joueur2': 0,
-            'est_avantage': False,
-            'gagnant_jeu': None,
-            'gagnant_match': None
-        }
+        score.score_joueur1 = 0
+        score.score_joueur2 = 0
+        score.jeux_joueur1 = 0
+        score.jeux_joueur2 = 0
+        score.est_avantage = False
+        score.gagnant_jeu = None
+        score.gagnant_match = None
+        score.avantage_joueur = None
+        return score
     except Exception as e:
-        logger.error(f"Erreur lors de la réinitialisation du score: {e}", exc_info=True)
+        logger.error("Erreur lors de la réinitialisation du score: %s", e, exc_info=True)
         return score
\ No newline at end of file
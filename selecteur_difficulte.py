@@ -1,6 +1,7 @@
 import pygame
 import logging
 from regles_tennis_table import creer_regles, obtenir_vitesse_balle_pour_niveau, obtenir_nom_niveau
+from cache_texte import rendre_texte
 
 logger = logging.getLogger('tennis_table')
 
@@ -24,12 +25,21 @@ def creer_selecteur_difficulte(largeur_ecran, hauteur_ecran):
             'poignee_y': curseur_y + regles['HAUTEUR_CURSEUR_DIFFICULTE'] // 2,
             'poignee_en_deplacement': False,
             'difficulte_actuelle': regles['DIFFICULTE_MIN'],
-            'vitesse_balle': obtenir_vitesse_balle_pour_niveau(regles, regles['DIFFICULTE_MIN'])
+            'vitesse_balle': obtenir_vitesse_balle_pour_niveau(regles, regles['DIFFICULTE_MIN']),
+            'mode': regles['MODES_JEU']['SIMPLE'],
+            'polices': {
+                'principale': pygame.font.Font(None, regles['TAILLE_POLICE_PRINCIPALE']),
+                'secondaire': pygame.font.Font(None, regles['TAILLE_POLICE_SECONDAIRE']),
+                'standard': pygame.font.Font(None, regles['TAILLE_POLICE_STANDARD'])
+            },
+            # Bande redessinée quand la poignée, le niveau ou le mode changent
+            'zone_dynamique': pygame.Rect(0, curseur_y - 30, largeur_ecran, 135),
+            'cle_statique': None
         }
-        logger.debug(f"Sélecteur créé: {selecteur}")
+        logger.debug("Sélecteur créé: %s", selecteur)
         return selecteur
     except Exception as e:
-        logger.error(f"Erreur lors de la création du sélecteur: {e}", exc_info=True)
+        logger.error("Erreur lors de la création du sélecteur: %s", e, exc_info=True)
         raise
 
 def obtenir_couleur_difficulte(selecteur):
@@ -44,7 +54,7 @@ def obtenir_couleur_difficulte(selecteur):
         else:
             return selecteur['regles']['COULEURS_NIVEAU'][3]
     except Exception as e:
-        logger.error(f"Erreur lors de l'obtention de la couleur: {e}", exc_info=True)
+        logger.error("Erreur lors de l'obtention de la couleur: %s", e, exc_info=True)
         return (255, 255, 255)
 
 def gerer_evenement(selecteur, evenement):
@@ -63,6 +73,12 @@ def gerer_evenement(selecteur, evenement):
             nouveau_selecteur['poignee_en_deplacement'] = False
             logger.debug("Fin du déplacement de la poignée")
             
+        elif evenement.type == pygame.KEYDOWN and evenement.key == pygame.K_TAB:
+            modes = selecteur['regles']['MODES_JEU']
+            nouveau_selecteur['mode'] = (modes['CONTRE_CPU'] if selecteur['mode'] == modes['SIMPLE']
+                                         else modes['SIMPLE'])
+            logger.debug("Nouveau mode de jeu: %s", nouveau_selecteur['mode'])
+            
         elif evenement.type == pygame.MOUSEMOTION and selecteur['poignee_en_deplacement']:
             try:
                 nouveau_selecteur['poignee_x'] = max(
@@ -82,43 +98,82 @@ def gerer_evenement(selecteur, evenement):
                         nouvelle_difficulte
                     )
                 })
-                logger.debug(f"Nouvelle difficulté: {nouvelle_difficulte}")
+                logger.debug("Nouvelle difficulté: %s", nouvelle_difficulte)
             except Exception as e:
-                logger.error(f"Erreur lors du calcul de la nouvelle difficulté: {e}")
+                logger.error("Erreur lors du calcul de la nouvelle difficulté: %s", e)
         
         return nouveau_selecteur
     except Exception as e:
-        logger.error(f"Erreur lors de la gestion d'événement: {e}", exc_info=True)
+        logger.error("Erreur lors de la gestion d'événement: %s", e, exc_info=True)
         return selecteur
 
-def dessiner(selecteur, ecran):
+def obtenir_etat_affiche(selecteur):
+    """Champs dont dépend l'image du sélecteur: inutile de redessiner s'ils n'ont pas changé"""
+    return selecteur['poignee_x'], selecteur['difficulte_actuelle'], selecteur['mode']
+
+def composer_elements_statiques(selecteur, taille_ecran, arriere_plan=None):
+    """Fond (image, titre, glissière, instruction) et calque des graduations, dessinés une fois"""
+    regles = selecteur['regles']
+    polices = selecteur['polices']
+    zone = selecteur['zone_dynamique']
+
+    fond = pygame.Surface(taille_ecran)
+    if pygame.display.get_surface() is not None:
+        fond = fond.convert()
+    fond.fill(regles['NOIR'])
+    if arriere_plan:
+        fond.blit(arriere_plan, (0, 0))
+
+    titre = polices['principale'].render("Sélectionnez le Niveau de Difficulté", True, regles['BLANC'])
+    fond.blit(titre, titre.get_rect(center=(selecteur['largeur_ecran'] // 2, selecteur['curseur_y'] - 60)))
+
+    pygame.draw.rect(fond, regles['CURSEUR_ARRIERE_PLAN'],
+                (selecteur['curseur_x'], selecteur['curseur_y'],
+                 selecteur['largeur_curseur'], selecteur['hauteur_curseur']))
+
+    instruction = polices['standard'].render("Appuyez sur ENTRÉE pour commencer la partie", True, regles['BLANC'])
+    fond.blit(instruction, instruction.get_rect(
+        center=(selecteur['largeur_ecran'] // 2, selecteur['curseur_y'] + 120)))
+
+    # Graduations et numéros, à superposer au remplissage de la glissière
+    graduations = pygame.Surface(zone.size, pygame.SRCALPHA)
+    curseur_y = selecteur['curseur_y'] - zone.y
+    for i in range(10):
+        x = selecteur['curseur_x'] + (i * selecteur['largeur_curseur'] // 9) - zone.x
+        pygame.draw.line(graduations, regles['BLANC'],
+                    (x, curseur_y - 5),
+                    (x, curseur_y + selecteur['hauteur_curseur'] + 5), 2)
+        num = polices['secondaire'].render(str(i + 1), True, regles['BLANC'])
+        graduations.blit(num, num.get_rect(center=(x, curseur_y + 20)))
+    return fond, graduations
+
+def dessiner(selecteur, ecran, arriere_plan=None):
+    """Dessiner le sélecteur et retourner les zones à passer à pygame.display.update.
+
+    Les éléments statiques sont composés une seule fois; ensuite seule la bande de
+    la glissière (remplissage, poignée, niveau et mode) est restaurée et redessinée."""
     try:
         regles = selecteur['regles']
-        
-        try:
-            police = pygame.font.Font(None, regles['TAILLE_POLICE_PRINCIPALE'])
-            titre = police.render("Sélectionnez le Niveau de Difficulté", True, regles['BLANC'])
-            rect_titre = titre.get_rect(center=(selecteur['largeur_ecran'] // 2, selecteur['curseur_y'] - 60))
-            ecran.blit(titre, rect_titre)
+        polices = selecteur['polices']
+        zone = selecteur['zone_dynamique']
 
-            pygame.draw.rect(ecran, regles['CURSEUR_ARRIERE_PLAN'],
-                        (selecteur['curseur_x'], selecteur['curseur_y'],
-                         selecteur['largeur_curseur'], selecteur['hauteur_curseur']))
+        cle = (ecran.get_size(), id(arriere_plan))
+        ecran_complet = selecteur.get('cle_statique') != cle
+        if ecran_complet:
+            selecteur['fond'], selecteur['graduations'] = composer_elements_statiques(
+                selecteur, ecran.get_size(), arriere_plan)
+            selecteur['cle_statique'] = cle
+            ecran.blit(selecteur['fond'], (0, 0))
+        else:
+            ecran.blit(selecteur['fond'], zone, zone)
 
+        try:
+            couleur = obtenir_couleur_difficulte(selecteur)
             largeur_remplie = selecteur['poignee_x'] - selecteur['curseur_x']
-            pygame.draw.rect(ecran, obtenir_couleur_difficulte(selecteur),
+            pygame.draw.rect(ecran, couleur,
                         (selecteur['curseur_x'], selecteur['curseur_y'],
                          largeur_remplie, selecteur['hauteur_curseur']))
-
-            petite_police = pygame.font.Font(None, regles['TAILLE_POLICE_SECONDAIRE'])
-            for i in range(10):
-                x = selecteur['curseur_x'] + (i * selecteur['largeur_curseur'] // 9)
-                pygame.draw.line(ecran, regles['BLANC'],
-                            (x, selecteur['curseur_y'] - 5),
-                            (x, selecteur['curseur_y'] + selecteur['hauteur_curseur'] + 5), 2)
-                num = petite_police.render(str(i + 1), True, regles['BLANC'])
-                rect_num = num.get_rect(center=(x, selecteur['curseur_y'] + 20))
-                ecran.blit(num, rect_num)
+            ecran.blit(selecteur['graduations'], zone)
 
             pygame.draw.circle(ecran, regles['BLANC'],
                           (int(selecteur['poignee_x']), selecteur['poignee_y']),
@@ -126,17 +181,20 @@ def dessiner(selecteur, ecran):
 
             texte_difficulte = (f"{obtenir_nom_niveau(regles, selecteur['difficulte_actuelle'])} "
                            f"(Niveau {selecteur['difficulte_actuelle']})")
-            surface_diff = police.render(texte_difficulte, True, obtenir_couleur_difficulte(selecteur))
+            surface_diff = rendre_texte(polices['principale'], texte_difficulte, couleur)
             rect_diff = surface_diff.get_rect(center=(selecteur['largeur_ecran'] // 2, selecteur['curseur_y'] + 60))
             ecran.blit(surface_diff, rect_diff)
 
-            police_standard = pygame.font.Font(None, regles['TAILLE_POLICE_STANDARD'])
-            instruction = police_standard.render("Appuyez sur ENTRÉE pour commencer la partie", True, regles['BLANC'])
-            rect_instruction = instruction.get_rect(center=(selecteur['largeur_ecran'] // 2, selecteur['curseur_y'] + 120))
-            ecran.blit(instruction, rect_instruction)
+            nom_mode = "Contre l'ordinateur" if selecteur['mode'] == regles['MODES_JEU']['CONTRE_CPU'] else "Deux joueurs"
+            texte_mode = rendre_texte(polices['secondaire'], f"Mode : {nom_mode} (TAB pour changer)", regles['BLANC'])
+            rect_mode = texte_mode.get_rect(center=(selecteur['largeur_ecran'] // 2, selecteur['curseur_y'] + 90))
+            ecran.blit(texte_mode, rect_mode)
             
         except Exception as e:
-            logger.error(f"Erreur lors du rendu des éléments: {e}")
-            
+            logger.error("Erreur lors du rendu des éléments: %s", e)
+
+        return [ecran.get_rect()] if ecran_complet else [zone]
     except Exception as e:
-        logger.error(f"Erreur lors du dessin du sélecteur: {e}", exc_info=True)
\ No newline at end of file
+        logger.error("Erreur lors du dessin du sélecteur: %s", e, exc_info=True)
+        selecteur['cle_statique'] = None
+        return [ecran.get_rect()]
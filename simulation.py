@@ -0,0 +1,222 @@
+import os
+import time
+import logging
+from collections import defaultdict
+import pygame
+from regles_tennis_table import creer_regles
+from main import initialiser_objets_jeu, mettre_a_jour_jeu, dessiner_jeu
+from pas_fixe import (
+    creer_accumulateur,
+    accumuler,
+    avancer_pas,
+    obtenir_temps_physique,
+    facteur_interpolation,
+    capturer_positions,
+    creer_dessin,
+    interpoler_etat
+)
+
+logger = logging.getLogger('tennis_table')
+
+IMAGES_MAX_PAR_MATCH = 2_000_000
+
+def creer_horloge_simulation(ips, temps_initial=0):
+    """Horloge simulée: chaque image avance le temps d'exactement 1000 / ips ms"""
+    return {
+        'ips': ips,
+        'pas_ms': 1000 / ips,
+        'temps_initial': temps_initial,
+        'temps_ms': temps_initial,
+        'images': 0
+    }
+
+def avancer_horloge(horloge):
+    return {
+        **horloge,
+        'temps_ms': horloge['temps_ms'] + horloge['pas_ms'],
+        'images': horloge['images'] + 1
+    }
+
+def obtenir_temps(horloge):
+    return round(horloge['temps_ms'])
+
+def creer_rendu_nul():
+    """Rendu sans fenêtre: ni dessin, ni pygame.display.flip()"""
+    return {
+        'interpoler': False,
+        'dessiner': lambda etat_jeu: None,
+        'presenter': lambda: None
+    }
+
+def creer_rendu_ecran(ecran, ressources):
+    return {
+        'interpoler': True,
+        'dessiner': lambda etat_jeu: dessiner_jeu(ecran, etat_jeu, ressources),
+        'presenter': pygame.display.flip
+    }
+
+def creer_touches(touches_enfoncees=()):
+    """Équivalent de pygame.key.get_pressed() pour une liste de codes de touches"""
+    return defaultdict(bool, dict.fromkeys(touches_enfoncees, True))
+
+def creer_source_service_seul(regles):
+    """Source d'entrées qui sert dès que possible et ne bouge jamais les raquettes"""
+    touches_service = creer_touches([regles['CONTROLES']['SERVICE']])
+    touches_vides = creer_touches()
+
+    def source(etat_jeu, numero_image):
+        return touches_service if etat_jeu['balle']['au_service'] else touches_vides
+    return source
+
+def creer_source_suiveuse(regles, portee=150):
+    """Joueurs scriptés: chaque raquette suit la balle verticalement lorsqu'elle
+    arrive vers elle à moins de `portee` pixels, et sert dès que possible."""
+    controles = regles['CONTROLES']
+    joueurs = (
+        ('raquette_rouge', controles['JOUEUR1'], -1),
+        ('raquette_bleue', controles['JOUEUR2'], 1)
+    )
+
+    def source(etat_jeu, numero_image):
+        balle = etat_jeu['balle']
+        if balle['au_service']:
+            return creer_touches([controles['SERVICE']])
+
+        touches_enfoncees = []
+        for nom_raquette, touches_joueur, sens in joueurs:
+            raquette = etat_jeu[nom_raquette]
+            if balle['dx'] * sens <= 0 or abs(balle['x'] - raquette['rect'].centerx) > portee:
+                continue
+            centre = raquette['zone_collision'].centery
+            if balle['y'] < centre - raquette['vitesse'] / 2:
+                touches_enfoncees.append(touches_joueur['HAUT'])
+            elif balle['y'] > centre + raquette['vitesse'] / 2:
+                touches_enfoncees.append(touches_joueur['BAS'])
+        return creer_touches(touches_enfoncees)
+    return source
+
+def creer_releve_echanges():
+    """Relevé des échanges d'un match: un enregistrement par point joué"""
+    return {
+        'points': [],
+        'images_echange': 0,
+        'coups': 0
+    }
+
+def capturer_releve(etat_jeu):
+    """Instantané minimal d'avant pas: mettre_a_jour_jeu modifie l'état sur place"""
+    balle = etat_jeu['balle']
+    match = etat_jeu['gestionnaire_match']
+    score = etat_jeu['score']
+    impacts = etat_jeu['raquette_rouge'].temps_dernier_impact + etat_jeu['raquette_bleue'].temps_dernier_impact
+    return (balle.au_service, impacts, match.jeux_joueur1, match.jeux_joueur2,
+            score.score_joueur1, score.score_joueur2, etat_jeu['gestionnaire_service'].serveur_actuel)
+
+def observer_image(releve, avant, nouvel_etat):
+    au_service, impacts, jeux_joueur1, jeux_joueur2, score_joueur1, score_joueur2, serveur = avant
+    if not au_service:
+        releve['images_echange'] += 1
+        # Une frappe enregistre son instant sur la raquette; la balle peut être touchée
+        # sans changer de sens (raquette qui la rattrape après un contact sur la tranche)
+        if (nouvel_etat['raquette_rouge'].temps_dernier_impact
+                + nouvel_etat['raquette_bleue'].temps_dernier_impact != impacts):
+            releve['coups'] += 1
+
+    nouveau_match = nouvel_etat['gestionnaire_match']
+    if nouveau_match.jeux_joueur1 > jeux_joueur1:
+        gagnant = 1
+    elif nouveau_match.jeux_joueur2 > jeux_joueur2:
+        gagnant = 2
+    elif nouvel_etat['score'].score_joueur1 > score_joueur1:
+        gagnant = 1
+    elif nouvel_etat['score'].score_joueur2 > score_joueur2:
+        gagnant = 2
+    else:
+        return
+
+    releve['points'].append({
+        'gagnant': gagnant,
+        'serveur': serveur,
+        'images': releve['images_echange'],
+        'coups': releve['coups']
+    })
+    releve['images_echange'] = 0
+    releve['coups'] = 0
+
+def executer_simulation(etat_jeu, source_entrees, horloge, rendu, images_max=IMAGES_MAX_PAR_MATCH,
+                        releve=None, accumulateur=None):
+    """Faire tourner mettre_a_jour_jeu sans limitation d'images par seconde jusqu'à la fin du match.
+
+    L'horloge donne la cadence d'affichage simulée; la physique avance à pas fixe
+    et la source d'entrées est interrogée une fois par pas physique."""
+    accumulateur = accumulateur or creer_accumulateur(
+        etat_jeu['regles']['IPS_PHYSIQUE'],
+        etat_jeu['regles']['PAS_PHYSIQUES_MAX_PAR_IMAGE']
+    )
+    precedent = capturer_positions(etat_jeu)
+    dessin = creer_dessin()
+    while horloge['images'] < images_max and not etat_jeu['gestionnaire_match']['match_termine']:
+        accumulateur, nombre_pas = accumuler(accumulateur, horloge['pas_ms'])
+        for _ in range(nombre_pas):
+            if etat_jeu['gestionnaire_match']['match_termine']:
+                break
+            touches = source_entrees(etat_jeu, accumulateur['pas'])
+            if rendu['interpoler']:
+                precedent = capturer_positions(etat_jeu)
+            avant = capturer_releve(etat_jeu) if releve is not None else None
+            etat_jeu = mettre_a_jour_jeu(etat_jeu, touches, obtenir_temps_physique(accumulateur))
+            if releve is not None:
+                observer_image(releve, avant, etat_jeu)
+            accumulateur = avancer_pas(accumulateur)
+
+        if rendu['interpoler']:
+            rendu['dessiner'](interpoler_etat(precedent, etat_jeu, facteur_interpolation(accumulateur), dessin))
+        else:
+            rendu['dessiner'](etat_jeu)
+        rendu['presenter']()
+        horloge = avancer_horloge(horloge)
+    return etat_jeu, horloge, accumulateur
+
+def simuler_match(source_entrees, graine, vitesse_balle=None, regles=None, rendu=None,
+                  images_max=IMAGES_MAX_PAR_MATCH, ips_rendu=None, mode=None, niveau=None):
+    """Simuler un match complet sans fenêtre, aussi vite que le processeur le permet.
+
+    Retourne l'etat_jeu final, le relevé des points et le débit en images par seconde."""
+    try:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.font.init()
+
+        regles = regles or creer_regles()
+        if vitesse_balle is None:
+            vitesse_balle = regles['VITESSE_BALLE_MIN']
+        etat_jeu = initialiser_objets_jeu(vitesse_balle, {'sons': {}, 'images': {}}, regles, mode, niveau, graine)
+        horloge = creer_horloge_simulation(ips_rendu or regles['IPS_PHYSIQUE'])
+        releve = creer_releve_echanges()
+
+        debut = time.perf_counter()
+        etat_jeu, horloge, accumulateur = executer_simulation(
+            etat_jeu,
+            source_entrees,
+            horloge,
+            rendu or creer_rendu_nul(),
+            images_max,
+            releve
+        )
+        duree = time.perf_counter() - debut
+
+        resultat = {
+            'etat_jeu': etat_jeu,
+            'points': releve['points'],
+            'graine': graine,
+            'images': horloge['images'],
+            'pas_physiques': accumulateur['pas'],
+            'temps_simule_ms': obtenir_temps(horloge),
+            'duree': duree,
+            'images_par_seconde': horloge['images'] / duree if duree > 0 else float('inf')
+        }
+        logger.info("Match simulé en %.3fs: %s images (%.0f images/s)",
+                    duree, horloge['images'], resultat['images_par_seconde'])
+        return resultat
+    except Exception as e:
+        logger.error("Erreur lors de la simulation du match: %s", e, exc_info=True)
+        raise
@@ -0,0 +1,283 @@
+import logging
+import numpy as np
+from regles_tennis_table import creer_regles
+
+logger = logging.getLogger('tennis_table')
+
+GAUCHE = 0
+DROITE = 1
+
+def creer_lot(nombre, vitesse=None, regles=None, graine=None):
+    """Créer N échanges indépendants stockés en colonnes NumPy (une case par échange).
+
+    Les raquettes sont indexées par GAUCHE (rouge) et DROITE (bleue) sur le premier axe."""
+    try:
+        regles = regles or creer_regles()
+        vitesse = vitesse if vitesse is not None else regles['VITESSE_BALLE_MIN']
+        logger.debug("Création d'un lot de %s échanges avec vitesse=%s", nombre, vitesse)
+
+        moitie_ecran = regles['LARGEUR_FENETRE'] // 2
+        y_raquette = regles['HAUTEUR_FENETRE'] // 2 - regles['HAUTEUR_RAQUETTE'] // 2
+        x_initiaux = np.array([
+            regles['TABLE_X'] - regles['LARGEUR_RAQUETTE'] - 10,
+            regles['TABLE_X'] + regles['LARGEUR_TABLE_PIXELS'] + 10
+        ])
+
+        lot = {
+            'regles': regles,
+            'nombre': nombre,
+            'generateur': np.random.default_rng(graine),
+            'rayon': regles['RAYON_BALLE'],
+            'x': np.full(nombre, regles['LARGEUR_FENETRE'] // 2, dtype=np.float64),
+            'y': np.full(nombre, regles['HAUTEUR_FENETRE'] // 2, dtype=np.float64),
+            'dx': np.zeros(nombre, dtype=np.float64),
+            'dy': np.zeros(nombre, dtype=np.float64),
+            'x_precedent': np.full(nombre, regles['LARGEUR_FENETRE'] // 2, dtype=np.float64),
+            'y_precedent': np.full(nombre, regles['HAUTEUR_FENETRE'] // 2, dtype=np.float64),
+            'fraction_rebond': np.full(nombre, np.nan),
+            'vitesse': np.full(nombre, vitesse, dtype=np.float64),
+            'active': np.zeros(nombre, dtype=bool),
+            'coups': np.zeros(nombre, dtype=np.int64),
+            'gagnant': np.zeros(nombre, dtype=np.int8),
+            'raquette_x': np.repeat(x_initiaux[:, None], nombre, axis=1).astype(np.int64),
+            'raquette_y': np.full((2, nombre), y_raquette, dtype=np.int64),
+            'raquette_x_precedent': np.repeat(x_initiaux[:, None], nombre, axis=1).astype(np.int64),
+            'raquette_y_precedent': np.full((2, nombre), y_raquette, dtype=np.int64),
+            'raquette_dx': np.zeros((2, nombre), dtype=np.int64),
+            'raquette_dy': np.zeros((2, nombre), dtype=np.int64),
+            'temps_dernier_impact': np.zeros((2, nombre), dtype=np.float64),
+            'largeur_raquette': regles['LARGEUR_RAQUETTE'],
+            'hauteur_raquette': regles['HAUTEUR_RAQUETTE'],
+            'decalage_zone': round(regles['HAUTEUR_RAQUETTE'] * 0.05),
+            'hauteur_zone': int(regles['HAUTEUR_RAQUETTE'] * 0.55),
+            'x_min': np.array([0, moitie_ecran])[:, None],
+            'x_max': np.array([moitie_ecran, regles['LARGEUR_FENETRE']])[:, None],
+            'delai_entre_impacts': regles['DELAI_ENTRE_IMPACTS']
+        }
+        return lot
+    except Exception as e:
+        logger.error("Erreur lors de la création du lot: %s", e, exc_info=True)
+        raise
+
+def tirer_cibles_y(lot, nombre):
+    regles = lot['regles']
+    return regles['TABLE_Y'] + regles['HAUTEUR_TABLE'] * lot['generateur'].random(nombre)
+
+def servir_lot(lot, serveurs, masque=None):
+    """Mettre en jeu la balle des échanges sélectionnés, comme servir() puis gerer_balle()"""
+    try:
+        regles = lot['regles']
+        masque = np.ones(lot['nombre'], dtype=bool) if masque is None else masque
+        indices = np.flatnonzero(masque)
+        depuis_gauche = np.broadcast_to(np.asarray(serveurs), (lot['nombre'],))[indices] == 1
+
+        x = np.where(depuis_gauche,
+                     regles['TABLE_X'] + 30,
+                     regles['TABLE_X'] + regles['LARGEUR_TABLE_PIXELS'] - 30).astype(np.float64)
+        y = np.full(len(indices), regles['HAUTEUR_FENETRE'] // 2, dtype=np.float64)
+        cible_x = np.where(depuis_gauche,
+                           regles['TABLE_X'] + regles['LARGEUR_TABLE_PIXELS'] * 3/4,
+                           regles['TABLE_X'] + regles['LARGEUR_TABLE_PIXELS'] * 1/4)
+        cible_y = tirer_cibles_y(lot, len(indices))
+        angle = np.arctan2(cible_y - y, cible_x - x)
+
+        lot['x'][indices] = x
+        lot['y'][indices] = y
+        lot['x_precedent'][indices] = x
+        lot['y_precedent'][indices] = y
+        lot['fraction_rebond'][indices] = np.nan
+        lot['dx'][indices] = np.cos(angle) * lot['vitesse'][indices]
+        lot['dy'][indices] = np.sin(angle) * lot['vitesse'][indices]
+        lot['active'][indices] = True
+        lot['coups'][indices] = 0
+        lot['gagnant'][indices] = 0
+        return lot
+    except Exception as e:
+        logger.error("Erreur lors du service du lot: %s", e, exc_info=True)
+        raise
+
+def deplacer_raquettes(lot):
+    np.copyto(lot['raquette_x_precedent'], lot['raquette_x'])
+    np.copyto(lot['raquette_y_precedent'], lot['raquette_y'])
+    nouveau_x = lot['raquette_x'] + lot['raquette_dx']
+    dans_limites = (lot['x_min'] <= nouveau_x) & (nouveau_x <= lot['x_max'] - lot['largeur_raquette'])
+    np.copyto(lot['raquette_x'], nouveau_x, where=dans_limites)
+    np.clip(lot['raquette_y'] + lot['raquette_dy'],
+            0, lot['regles']['HAUTEUR_FENETRE'] - lot['hauteur_raquette'],
+            out=lot['raquette_y'])
+
+def deplacer_balles(lot):
+    """Même règle que balle.deplacer: sortie latérale = point, rebond sur le haut et le bas"""
+    regles = lot['regles']
+    active = lot['active']
+    x = lot['x']
+    y = lot['y']
+    np.copyto(lot['x_precedent'], x, where=active)
+    np.copyto(lot['y_precedent'], y, where=active)
+    lot['fraction_rebond'][active] = np.nan
+    np.add(x, lot['dx'], out=x, where=active)
+    np.add(y, lot['dy'], out=y, where=active)
+
+    hors_limites = active & ((x < 0) | (x > regles['LARGEUR_FENETRE']))
+    lot['gagnant'][hors_limites] = np.where(x[hors_limites] < 0, 2, 1)
+    active &= ~hors_limites
+
+    haut = active & (y < 0)
+    lot['fraction_rebond'][haut] = -lot['y_precedent'][haut] / lot['dy'][haut]
+    y[haut] = 0
+    lot['dy'][haut] = np.abs(lot['dy'][haut])
+    bas = active & (y > regles['HAUTEUR_FENETRE'])
+    lot['fraction_rebond'][bas] = (regles['HAUTEUR_FENETRE'] - lot['y_precedent'][bas]) / lot['dy'][bas]
+    y[bas] = regles['HAUTEUR_FENETRE']
+    lot['dy'][bas] = -np.abs(lot['dy'][bas])
+    return hors_limites
+
+def temps_impact_coin_lot(ax, ay, ux, uy, coin_x, coin_y, rayon):
+    ex = ax - coin_x
+    ey = ay - coin_y
+    a = ux * ux + uy * uy
+    b = ex * ux + ey * uy
+    c = ex * ex + ey * ey - rayon * rayon
+    discriminant = b * b - a * c
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = (-b - np.sqrt(discriminant)) / a
+    return np.where((b < 0) & (a != 0) & (discriminant >= 0) & (t >= 0) & (t <= 1), t, np.inf)
+
+def calculer_temps_impact_lot(ax, ay, ux, uy, largeur, hauteur, rayon):
+    """Équivalent vectorisé de raquette.calculer_temps_impact (np.inf en l'absence de contact)"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t_gauche = (-rayon - ax) / ux
+        t_droite = (largeur + rayon - ax) / ux
+        t_haut = (-rayon - ay) / uy
+        t_bas = (hauteur + rayon - ay) / uy
+        y_gauche = ay + uy * t_gauche
+        y_droite = ay + uy * t_droite
+        x_haut = ax + ux * t_haut
+        x_bas = ax + ux * t_bas
+
+    t = np.full(ax.shape, np.inf)
+    faces = (
+        ((ux > 0) & (ax < -rayon) & (y_gauche >= 0) & (y_gauche <= hauteur), t_gauche),
+        ((ux < 0) & (ax > largeur + rayon) & (y_droite >= 0) & (y_droite <= hauteur), t_droite),
+        ((uy > 0) & (ay < -rayon) & (x_haut >= 0) & (x_haut <= largeur), t_haut),
+        ((uy < 0) & (ay > hauteur + rayon) & (x_bas >= 0) & (x_bas <= largeur), t_bas)
+    )
+    for valide, t_face in faces:
+        t = np.where(valide & (t_face >= 0) & (t_face <= 1) & (t_face < t), t_face, t)
+    for coin_x, coin_y in ((0, 0), (largeur, 0), (0, hauteur), (largeur, hauteur)):
+        t = np.minimum(t, temps_impact_coin_lot(ax, ay, ux, uy, coin_x, coin_y, rayon))
+
+    distance_x = ax - np.clip(ax, 0, largeur)
+    distance_y = ay - np.clip(ay, 0, hauteur)
+    return np.where(distance_x ** 2 + distance_y ** 2 <= rayon * rayon, 0.0, t)
+
+def detecter_collisions(lot, cote, temps_actuel, candidats):
+    """Équivalent vectorisé de raquette.verifier_collision_balle (test continu sur le pas).
+
+    Retourne les indices des échanges touchés, le centre de la balle au contact poussé
+    hors de la zone le long de la normale, et la position relative de l'impact."""
+    rayon = lot['rayon']
+    largeur = lot['largeur_raquette']
+    hauteur = lot['hauteur_zone']
+    zone_x_debut = lot['raquette_x_precedent'][cote]
+    zone_y_debut = lot['raquette_y_precedent'][cote] + lot['decalage_zone']
+    zone_x = lot['raquette_x'][cote]
+    zone_y = lot['raquette_y'][cote] + lot['decalage_zone']
+    x_debut, y_debut, x, y = lot['x_precedent'], lot['y_precedent'], lot['x'], lot['y']
+
+    proches = (candidats
+               & (temps_actuel - lot['temps_dernier_impact'][cote] >= lot['delai_entre_impacts'])
+               & ~(np.maximum(x_debut, x) + rayon < np.minimum(zone_x_debut, zone_x))
+               & ~(np.minimum(x_debut, x) - rayon > np.maximum(zone_x_debut, zone_x) + largeur)
+               & ~(np.maximum(y_debut, y) + rayon < np.minimum(zone_y_debut, zone_y))
+               & ~(np.minimum(y_debut, y) - rayon > np.maximum(zone_y_debut, zone_y) + hauteur))
+    indices = np.flatnonzero(proches)
+    if len(indices) == 0:
+        return indices, np.empty(0), np.empty(0), np.empty(0)
+
+    zx_debut, zy_debut = zone_x_debut[indices], zone_y_debut[indices]
+    deplacement_zone_x = zone_x[indices] - zx_debut
+    deplacement_zone_y = zone_y[indices] - zy_debut
+    bx_debut, by_debut = x_debut[indices], y_debut[indices]
+    bx, by = x[indices], y[indices]
+    fraction = lot['fraction_rebond'][indices]
+    rebond = ~np.isnan(fraction)
+    fraction = np.where(rebond, fraction, 1.0)
+    x_rebond = np.where(rebond, bx_debut + (bx - bx_debut) * fraction, bx)
+
+    sous_pas = (
+        (np.zeros(len(indices)), fraction, bx_debut, by_debut, x_rebond, by, np.ones(len(indices), dtype=bool)),
+        (fraction, np.ones(len(indices)), x_rebond, by, bx, by, rebond)
+    )
+    touche = np.zeros(len(indices), dtype=bool)
+    centre_x = np.zeros(len(indices))
+    centre_y = np.zeros(len(indices))
+    temps = np.zeros(len(indices))
+    for t_debut, t_fin, sx_debut, sy_debut, sx_fin, sy_fin, actif in sous_pas:
+        ax = sx_debut - (zx_debut + deplacement_zone_x * t_debut)
+        ay = sy_debut - (zy_debut + deplacement_zone_y * t_debut)
+        ux = (sx_fin - (zx_debut + deplacement_zone_x * t_fin)) - ax
+        uy = (sy_fin - (zy_debut + deplacement_zone_y * t_fin)) - ay
+        t = calculer_temps_impact_lot(ax, ay, ux, uy, largeur, hauteur, rayon)
+        nouveau = actif & ~touche & np.isfinite(t)
+        t = np.where(nouveau, t, 0.0)
+        centre_x = np.where(nouveau, sx_debut + (sx_fin - sx_debut) * t, centre_x)
+        centre_y = np.where(nouveau, sy_debut + (sy_fin - sy_debut) * t, centre_y)
+        temps = np.where(nouveau, t_debut + (t_fin - t_debut) * t, temps)
+        touche |= nouveau
+
+    centre_x, centre_y, temps = centre_x[touche], centre_y[touche], temps[touche]
+    zx = zx_debut[touche] + deplacement_zone_x[touche] * temps
+    zy = zy_debut[touche] + deplacement_zone_y[touche] * temps
+    contact_x = np.minimum(np.maximum(centre_x, zx), zx + largeur)
+    contact_y = np.minimum(np.maximum(centre_y, zy), zy + hauteur)
+    distance = np.hypot(centre_x - contact_x, centre_y - contact_y)
+    # Centre déjà dans la zone: sortie par la face côté table
+    dedans = distance == 0
+    sens = 1.0 if cote == GAUCHE else -1.0
+    diviseur = np.where(dedans, 1.0, distance)
+    normale_x = np.where(dedans, sens, (centre_x - contact_x) / diviseur)
+    normale_y = np.where(dedans, 0.0, (centre_y - contact_y) / diviseur)
+    contact_x = np.where(dedans, zx + largeur if cote == GAUCHE else zx, contact_x)
+
+    x = contact_x + normale_x * rayon
+    y = np.clip(contact_y + normale_y * rayon, 0, lot['regles']['HAUTEUR_FENETRE'])
+    return indices[touche], x, y, (contact_y - zy) / hauteur
+
+def renvoyer_balles(lot, cote, indices, x, y, position_impact, temps_actuel):
+    """Équivalent vectorisé de balle.gerer_collision_raquette, la balle étant au contact"""
+    regles = lot['regles']
+    if len(indices) == 0:
+        return
+
+    if cote == GAUCHE:
+        cible_x = regles['TABLE_X'] + regles['LARGEUR_TABLE_PIXELS'] * 3/4
+    else:
+        cible_x = regles['TABLE_X'] + regles['LARGEUR_TABLE_PIXELS'] * 1/4
+    cible_y = tirer_cibles_y(lot, len(indices))
+    angle = np.arctan2(cible_y - y, cible_x - x)
+
+    vitesse_finale = lot['vitesse'][indices] * (1 + np.abs(position_impact - 0.5))
+
+    lot['dx'][indices] = np.cos(angle) * vitesse_finale
+    lot['dy'][indices] = np.sin(angle) * vitesse_finale
+    lot['x'][indices] = x
+    lot['y'][indices] = y
+    lot['coups'][indices] += 1
+    lot['temps_dernier_impact'][cote][indices] = temps_actuel
+
+def avancer_lot(lot, temps_actuel):
+    """Avancer tous les échanges d'une image, dans l'ordre de mettre_a_jour_jeu.
+
+    Retourne le masque des échanges terminés pendant cette image; le gagnant
+    du point est dans lot['gagnant']."""
+    deplacer_raquettes(lot)
+    points = deplacer_balles(lot)
+
+    touches_gauche = detecter_collisions(lot, GAUCHE, temps_actuel, lot['active'])
+    candidats_droite = lot['active'].copy()
+    candidats_droite[touches_gauche[0]] = False
+    touches_droite = detecter_collisions(lot, DROITE, temps_actuel, candidats_droite)
+    renvoyer_balles(lot, GAUCHE, *touches_gauche, temps_actuel)
+    renvoyer_balles(lot, DROITE, *touches_droite, temps_actuel)
+    return points
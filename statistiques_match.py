@@ -0,0 +1,123 @@
+import math
+import logging
+from dataclasses import dataclass, field
+from etats import EtatMutable
+from regles_tennis_table import creer_regles
+
+logger = logging.getLogger('tennis_table')
+
+@dataclass(slots=True, eq=False)
+class StatistiquesMatch(EtatMutable):
+    """Statistiques du match tenues à jour événement par événement (service, frappe, point).
+
+    Chaque événement coûte O(1); les listes à deux cases sont indexées par joueur - 1."""
+    regles: dict = field(repr=False)
+    # Échange en cours
+    en_echange: bool = False
+    serveur_echange: int = None
+    debut_echange: int = 0
+    coups_echange: int = 0
+    vitesse_max_echange: float = 0.0
+    duree_dernier_echange: int = 0
+    # Échanges terminés (durées en ms de temps physique)
+    echanges: int = 0
+    duree_totale_echanges: int = 0
+    duree_max_echange: int = 0
+    coups_totaux: int = 0
+    coups_max_echange: int = 0
+    # Vitesse de la balle au départ de chaque service et de chaque frappe (pixels par pas)
+    vitesse_max: float = 0.0
+    somme_vitesses: float = 0.0
+    nombre_vitesses: int = 0
+    points_gagnes: list = field(default_factory=lambda: [0, 0])
+    points_servis: list = field(default_factory=lambda: [0, 0])
+    points_gagnes_service: list = field(default_factory=lambda: [0, 0])
+    serie_joueur: int = None
+    serie: int = 0
+    plus_longue_serie: list = field(default_factory=lambda: [0, 0])
+
+    CHAMPS_COPIES = ('points_gagnes', 'points_servis', 'points_gagnes_service', 'plus_longue_serie')
+
+def creer_statistiques_match(regles=None):
+    logger.debug("Création des statistiques du match")
+    return StatistiquesMatch(regles=regles or creer_regles())
+
+def enregistrer_vitesse(statistiques, balle):
+    vitesse = math.hypot(balle.dx, balle.dy)
+    statistiques.somme_vitesses += vitesse
+    statistiques.nombre_vitesses += 1
+    if vitesse > statistiques.vitesse_max_echange:
+        statistiques.vitesse_max_echange = vitesse
+    if vitesse > statistiques.vitesse_max:
+        statistiques.vitesse_max = vitesse
+
+def enregistrer_service(statistiques, balle, serveur, temps_actuel):
+    """Début d'un échange: la balle vient d'être servie"""
+    statistiques.en_echange = True
+    statistiques.serveur_echange = serveur
+    statistiques.debut_echange = temps_actuel
+    statistiques.coups_echange = 0
+    statistiques.vitesse_max_echange = 0.0
+    enregistrer_vitesse(statistiques, balle)
+
+def enregistrer_coup(statistiques, balle):
+    """Frappe d'une raquette pendant l'échange"""
+    statistiques.coups_echange += 1
+    enregistrer_vitesse(statistiques, balle)
+
+def enregistrer_point(statistiques, gagnant, temps_actuel):
+    """Fin de l'échange: point pour `gagnant` (1 ou 2)"""
+    if statistiques.en_echange:
+        duree = temps_actuel - statistiques.debut_echange
+        coups = statistiques.coups_echange
+        statistiques.duree_dernier_echange = duree
+        statistiques.echanges += 1
+        statistiques.duree_totale_echanges += duree
+        statistiques.duree_max_echange = max(statistiques.duree_max_echange, duree)
+        statistiques.coups_totaux += coups
+        statistiques.coups_max_echange = max(statistiques.coups_max_echange, coups)
+
+        serveur = statistiques.serveur_echange
+        statistiques.points_servis[serveur - 1] += 1
+        if gagnant == serveur:
+            statistiques.points_gagnes_service[serveur - 1] += 1
+    statistiques.en_echange = False
+    statistiques.points_gagnes[gagnant - 1] += 1
+
+    if gagnant == statistiques.serie_joueur:
+        statistiques.serie += 1
+    else:
+        statistiques.serie_joueur = gagnant
+        statistiques.serie = 1
+    if statistiques.serie > statistiques.plus_longue_serie[gagnant - 1]:
+        statistiques.plus_longue_serie[gagnant - 1] = statistiques.serie
+
+def reinitialiser_statistiques(statistiques):
+    """Nouveau match: remise à zéro sur place"""
+    logger.debug("Réinitialisation des statistiques du match")
+    nouvelles = creer_statistiques_match(statistiques.regles)
+    for nom in statistiques.__slots__:
+        setattr(statistiques, nom, getattr(nouvelles, nom))
+    return statistiques
+
+def obtenir_vue_statistiques(statistiques):
+    """Vue en lecture seule pour l'affichage: moyennes et taux tirés des cumuls, sans
+    reparcourir l'historique du match"""
+    echanges = statistiques.echanges
+    return {
+        'echanges': echanges,
+        'duree_moyenne_echange': statistiques.duree_totale_echanges / echanges if echanges else 0.0,
+        'duree_max_echange': statistiques.duree_max_echange,
+        'coups_moyens_echange': statistiques.coups_totaux / echanges if echanges else 0.0,
+        'coups_max_echange': statistiques.coups_max_echange,
+        'vitesse_max': statistiques.vitesse_max,
+        'vitesse_moyenne': (statistiques.somme_vitesses / statistiques.nombre_vitesses
+                            if statistiques.nombre_vitesses else 0.0),
+        'points_gagnes': tuple(statistiques.points_gagnes),
+        'points_servis': tuple(statistiques.points_servis),
+        'points_gagnes_service': tuple(statistiques.points_gagnes_service),
+        'taux_points_service': tuple(gagnes / servis if servis else 0.0 for gagnes, servis in
+                                     zip(statistiques.points_gagnes_service, statistiques.points_servis)),
+        'plus_longue_serie': tuple(statistiques.plus_longue_serie),
+        'serie_en_cours': (statistiques.serie_joueur, statistiques.serie)
+    }
@@ -1,6 +1,7 @@
 import pygame
 import logging
 from regles_tennis_table import creer_regles
+from cache_texte import rendre_texte
 
 logger = logging.getLogger('tennis_table')
 
@@ -21,10 +22,10 @@ def creer_statut_jeu(largeur_ecran):
                 'alerte': pygame.font.Font(None, regles['TAILLE_POLICE_ALERTE'])
             }
         }
-        logger.debug(f"Statut créé: {statut}")
+        logger.debug("Statut créé: %s", statut)
         return statut
     except Exception as e:
-        logger.error(f"Erreur lors de la création du statut: {e}", exc_info=True)
+        logger.error("Erreur lors de la création du statut: %s", e, exc_info=True)
         raise
 
 def mettre_a_jour(statut, etat_jeu):
@@ -48,7 +49,7 @@ def mettre_a_jour(statut, etat_jeu):
         
         return nouveau_statut
     except Exception as e:
-        logger.error(f"Erreur lors de la mise à jour du statut: {e}", exc_info=True)
+        logger.error("Erreur lors de la mise à jour du statut: %s", e, exc_info=True)
         return statut
 
 def mettre_a_jour_match(statut, etat_match):
@@ -65,19 +66,19 @@ def mettre_a_jour_match(statut, etat_match):
                 'statut_match': f"Jeux : {jeux[0]} - {jeux[1]}"
             }
     except Exception as e:
-        logger.error(f"Erreur lors de la mise à jour du match: {e}", exc_info=True)
+        logger.error("Erreur lors de la mise à jour du match: %s", e, exc_info=True)
         return statut
 
 def afficher_alerte(statut, message):
     try:
-        logger.debug(f"Affichage alerte: {message}")
+        logger.debug("Affichage alerte: %s", message)
         return {
             **statut,
             'message_alerte': message,
             'minuteur_alerte': pygame.time.get_ticks()
         }
     except Exception as e:
-        logger.error(f"Erreur lors de l'affichage de l'alerte: {e}", exc_info=True)
+        logger.error("Erreur lors de l'affichage de l'alerte: %s", e, exc_info=True)
         return statut
 
 def dessiner(statut, ecran):
@@ -85,17 +86,17 @@ def dessiner(statut, ecran):
         elements_a_dessiner = []
         
         if statut['statut_jeu']:
-            texte = statut['polices']['principale'].render(
+            texte = rendre_texte(
+                statut['polices']['principale'],
                 statut['statut_jeu'],
-                True,
                 statut['regles']['BLANC']
             )
             elements_a_dessiner.append((texte, (statut['largeur_ecran'] // 2, 30)))
         
         if statut['statut_match']:
-            texte = statut['polices']['principale'].render(
+            texte = rendre_texte(
+                statut['polices']['principale'],
                 statut['statut_match'],
-                True,
                 statut['regles']['BLANC']
             )
             elements_a_dessiner.append((texte, (statut['largeur_ecran'] // 2, 60)))
@@ -103,9 +104,9 @@ def dessiner(statut, ecran):
         temps_actuel = pygame.time.get_ticks()
         if (statut['message_alerte'] and 
             temps_actuel - statut['minuteur_alerte'] < statut['regles']['DUREE_ALERTE']):
-            texte = statut['polices']['alerte'].render(
+            texte = rendre_texte(
+                statut['polices']['alerte'],
                 statut['message_alerte'],
-                True,
                 statut['regles']['JAUNE']
             )
             elements_a_dessiner.append((texte, (statut['largeur_ecran'] // 2, 100)))
@@ -114,7 +115,7 @@ def dessiner(statut, ecran):
             rect = texte.get_rect(center=position)
             ecran.blit(texte, rect)
     except Exception as e:
-        logger.error(f"Erreur lors du dessin du statut: {e}", exc_info=True)
+        logger.error("Erreur lors du dessin du statut: %s", e, exc_info=True)
 
 def afficher_controles(statut, ecran):
     try:
@@ -130,12 +131,12 @@ def afficher_controles(statut, ecran):
         
         position_y = 150
         for ligne in controles:
-            texte = statut['polices']['principale'].render(ligne, True, statut['regles']['BLANC'])
+            texte = rendre_texte(statut['polices']['principale'], ligne, statut['regles']['BLANC'])
             rect_texte = texte.get_rect(center=(statut['largeur_ecran'] // 2, position_y))
             ecran.blit(texte, rect_texte)
             position_y += 30
     except Exception as e:
-        logger.error(f"Erreur lors de l'affichage des contrôles: {e}", exc_info=True)
+        logger.error("Erreur lors de l'affichage des contrôles: %s", e, exc_info=True)
 
 def afficher_menu_pause(statut, ecran):
     try:
@@ -154,9 +155,9 @@ def afficher_menu_pause(statut, ecran):
         
         position_y = ecran.get_height() // 3
         for message, police, couleur in messages:
-            texte = police.render(message, True, couleur)
+            texte = rendre_texte(police, message, couleur)
             rect_texte = texte.get_rect(center=(statut['largeur_ecran'] // 2, position_y))
             ecran.blit(texte, rect_texte)
             position_y += 50
     except Exception as e:
-        logger.error(f"Erreur lors de l'affichage du menu pause: {e}", exc_info=True)
\ No newline at end of file
+        logger.error("Erreur lors de l'affichage du menu pause: %s", e, exc_info=True)
\ No newline at end of file
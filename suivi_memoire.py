@@ -0,0 +1,130 @@
+import os
+import time
+import logging
+import tracemalloc
+from collections import deque
+
+logger = logging.getLogger('tennis_table')
+
+VARIABLE_SUIVI_MEMOIRE = 'TENNIS_TABLE_SUIVI_MEMOIRE'
+RACINE = os.path.dirname(os.path.abspath(__file__))
+RELEVES_MAX = 240
+NOMBRE_SITES = 10
+# Croissance signalée: mémoire en hausse sur FENETRE_CROISSANCE relevés consécutifs, d'au moins SEUIL_CROISSANCE octets
+FENETRE_CROISSANCE = 5
+SEUIL_CROISSANCE = 256 * 1024
+
+def suivi_memoire_demande():
+    """Intervalle en secondes demandé par TENNIS_TABLE_SUIVI_MEMOIRE (0 ou absent: pas de suivi)"""
+    valeur = os.environ.get(VARIABLE_SUIVI_MEMOIRE)
+    if not valeur:
+        return None
+    try:
+        intervalle = float(valeur)
+        return intervalle if intervalle > 0 else None
+    except ValueError:
+        logger.warning("Intervalle de suivi mémoire invalide: %s", valeur)
+        return None
+
+def creer_suivi_memoire(intervalle, nombre_sites=NOMBRE_SITES, racine=RACINE, horloge=time.monotonic):
+    """Suivi de la mémoire sous tracemalloc: un relevé toutes les `intervalle` secondes
+    (None: relevés à la demande seulement, avec relever_memoire).
+
+    tracemalloc ralentit les allocations: le suivi n'est démarré qu'à la demande."""
+    demarre_ici = not tracemalloc.is_tracing()
+    if demarre_ici:
+        tracemalloc.start()
+    return {
+        'intervalle': intervalle,
+        'nombre_sites': nombre_sites,
+        # Les instantanés et relevés du suivi lui-même ne comptent pas dans la mémoire mesurée
+        'exclusions': [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)],
+        # Seules les allocations faites depuis les modules du jeu sont attribuées aux sites
+        'filtres': [tracemalloc.Filter(True, os.path.join(racine, '*'))],
+        'horloge': horloge,
+        'prochain': horloge() + intervalle if intervalle else None,
+        'releves': deque(maxlen=RELEVES_MAX),
+        'instantane': None,
+        'demarre_ici': demarre_ici,
+        'croissance_signalee': False
+    }
+
+def decrire_site(statistique):
+    trace = statistique.traceback[0]
+    return f"{os.path.relpath(trace.filename, RACINE)}:{trace.lineno}"
+
+def relever_memoire(suivi):
+    """Relevé immédiat: mémoire courante et pic depuis le relevé précédent, principaux
+    sites d'allocation du jeu et leur variation"""
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    instantane = tracemalloc.take_snapshot().filter_traces(suivi['exclusions'])
+    courant = sum(statistique.size for statistique in instantane.statistics('filename'))
+    instantane = instantane.filter_traces(suivi['filtres'])
+    nombre_sites = suivi['nombre_sites']
+
+    sites = [(decrire_site(statistique), statistique.size, statistique.count)
+             for statistique in instantane.statistics('lineno')[:nombre_sites]]
+    variations = []
+    if suivi['instantane'] is not None:
+        variations = [(decrire_site(statistique), statistique.size_diff, statistique.count_diff)
+                      for statistique in instantane.compare_to(suivi['instantane'], 'lineno')[:nombre_sites]
+                      if statistique.size_diff]
+    suivi['instantane'] = instantane
+
+    precedent = suivi['releves'][-1] if suivi['releves'] else None
+    releve = {
+        'instant': suivi['horloge'](),
+        'courant': courant,
+        'pic': pic,
+        'delta': courant - precedent['courant'] if precedent else 0,
+        'sites': sites,
+        'variations': variations
+    }
+    suivi['releves'].append(releve)
+    logger.debug("Mémoire: %.1f Ko (pic %.1f Ko, %+.1f Ko)", courant / 1024, pic / 1024, releve['delta'] / 1024)
+    verifier_croissance(suivi)
+    return releve
+
+def en_croissance(releves, fenetre=FENETRE_CROISSANCE, seuil=SEUIL_CROISSANCE):
+    """Vrai si la mémoire a augmenté à chacun des `fenetre` derniers relevés, d'au moins `seuil` au total"""
+    if len(releves) <= fenetre:
+        return False
+    derniers = list(releves)[-fenetre - 1:]
+    hausses = all(suivant['courant'] > releve['courant'] for releve, suivant in zip(derniers, derniers[1:]))
+    return hausses and derniers[-1]['courant'] - derniers[0]['courant'] >= seuil
+
+def verifier_croissance(suivi):
+    releves = suivi['releves']
+    if not en_croissance(releves):
+        suivi['croissance_signalee'] = False
+        return
+    if suivi['croissance_signalee']:
+        return
+    suivi['croissance_signalee'] = True
+    debut = releves[-FENETRE_CROISSANCE - 1]
+    variations = "; ".join(f"{site} {taille / 1024:+.1f} Ko" for site, taille, _ in releves[-1]['variations'][:5])
+    logger.warning("Mémoire en hausse continue sur %s relevés: %.1f Ko -> %.1f Ko en %.0f s (%s)",
+                   FENETRE_CROISSANCE, debut['courant'] / 1024, releves[-1]['courant'] / 1024,
+                   releves[-1]['instant'] - debut['instant'], variations or "aucun site du jeu")
+
+def verifier_suivi_memoire(suivi):
+    """À appeler à chaque image: relevé si l'intervalle est écoulé"""
+    if suivi['prochain'] is not None and suivi['horloge']() >= suivi['prochain']:
+        suivi['prochain'] += suivi['intervalle']
+        relever_memoire(suivi)
+
+def arreter_suivi_memoire(suivi):
+    """Dernier relevé, résumé dans les logs, puis arrêt de tracemalloc s'il a été démarré par le suivi"""
+    try:
+        releve = relever_memoire(suivi)
+        premier = suivi['releves'][0]
+        logger.info("Suivi mémoire: %s relevés, %.1f Ko -> %.1f Ko, pic %.1f Ko; principaux sites: %s",
+                    len(suivi['releves']), premier['courant'] / 1024, releve['courant'] / 1024,
+                    max(r['pic'] for r in suivi['releves']) / 1024,
+                    "; ".join(f"{site} {taille / 1024:.1f} Ko" for site, taille, _ in releve['sites'][:5]))
+        return releve
+    finally:
+        suivi['instantane'] = None
+        if suivi['demarre_ici']:
+            tracemalloc.stop()
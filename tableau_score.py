@@ -1,13 +1,15 @@
 import pygame
 import logging
 from regles_tennis_table import creer_regles
+from cache_texte import rendre_texte, prerendre_scores, SEPARATEUR_SCORE
+from statistiques_match import obtenir_vue_statistiques
 
 logger = logging.getLogger('tennis_table')
 
-def creer_tableau_score(largeur_ecran):
+def creer_tableau_score(largeur_ecran, regles=None):
     try:
         logger.debug("Création du tableau de score")
-        regles = creer_regles()
+        regles = regles or creer_regles()
         
         tableau = {
             'regles': regles,
@@ -17,30 +19,37 @@ def creer_tableau_score(largeur_ecran):
                 'secondaire': pygame.font.Font(None, regles['TAILLE_POLICE_SECONDAIRE'])
             }
         }
-        logger.debug(f"Tableau de score créé: {tableau}")
+        prerendre_scores(tableau['polices']['principale'], regles['BLANC'])
+        logger.debug("Tableau de score créé: %s", tableau)
         return tableau
     except Exception as e:
-        logger.error(f"Erreur lors de la création du tableau de score: {e}", exc_info=True)
+        logger.error("Erreur lors de la création du tableau de score: %s", e, exc_info=True)
         raise
 
 def dessiner(tableau, ecran, donnees_jeu):
+    """Dessiner le tableau de score et retourner les zones touchées"""
+    zones = []
     try:
         elements_a_dessiner = []
         centre_x = tableau['largeur_ecran'] // 2
         
         try:
-            texte_score = f"{donnees_jeu['score_joueur1']} - {donnees_jeu['score_joueur2']}"
-            surface_score = tableau['polices']['principale'].render(
-                texte_score,
-                True,
-                tableau['regles']['BLANC']
-            )
-            elements_a_dessiner.append((surface_score, (centre_x, tableau['regles']['TABLE_Y'] - 80)))
+            # Score assemblé à partir des nombres prérendus plutôt que rendu en entier
+            morceaux_score = [
+                rendre_texte(tableau['polices']['principale'], texte, tableau['regles']['BLANC'])
+                for texte in (str(donnees_jeu['score_joueur1']), SEPARATEUR_SCORE, str(donnees_jeu['score_joueur2']))
+            ]
+            x_morceau = centre_x - sum(morceau.get_width() for morceau in morceaux_score) // 2
+            for morceau in morceaux_score:
+                elements_a_dessiner.append(
+                    (morceau, (x_morceau + morceau.get_width() // 2, tableau['regles']['TABLE_Y'] - 80))
+                )
+                x_morceau += morceau.get_width()
 
             texte_jeux = f"Jeux : {donnees_jeu['jeux_joueur1']} - {donnees_jeu['jeux_joueur2']}"
-            surface_jeux = tableau['polices']['secondaire'].render(
+            surface_jeux = rendre_texte(
+                tableau['polices']['secondaire'],
                 texte_jeux,
-                True,
                 tableau['regles']['GRIS']
             )
             elements_a_dessiner.append((surface_jeux, (centre_x, tableau['regles']['TABLE_Y'] - 120)))
@@ -48,34 +57,45 @@ def dessiner(tableau, ecran, donnees_jeu):
             if donnees_jeu.get('message_statut') == tableau['regles']['ETATS_JEU']['MATCH_TERMINE']:
                 gagnant = "1" if donnees_jeu['jeux_joueur1'] > donnees_jeu['jeux_joueur2'] else "2"
                 texte_fin = f"Gagnant Joueur {gagnant} (appuyez sur r pour recommencer, q pour quitter)"
-                surface_fin = tableau['polices']['secondaire'].render(
+                surface_fin = rendre_texte(
+                    tableau['polices']['secondaire'],
                     texte_fin,
-                    True,
                     tableau['regles']['JAUNE']
                 )
                 elements_a_dessiner.append((surface_fin, (centre_x, tableau['regles']['TABLE_Y'] - 40)))
+                if donnees_jeu.get('statistiques'):
+                    surface_statistiques = rendre_texte(
+                        tableau['polices']['secondaire'],
+                        construire_texte_statistiques(obtenir_vue_statistiques(donnees_jeu['statistiques'])),
+                        tableau['regles']['GRIS']
+                    )
+                    elements_a_dessiner.append((surface_statistiques, (
+                        centre_x,
+                        tableau['regles']['TABLE_Y'] + tableau['regles']['HAUTEUR_TABLE'] + 40
+                    )))
             elif donnees_jeu.get('serveur_actuel'):
                 texte_serveur = f"Joueur {donnees_jeu['serveur_actuel']} au service"
                 if donnees_jeu.get('en_service'):
                     touches = pygame.key.name(tableau['regles']['CONTROLES']['SERVICE'])
                     texte_serveur += f" (Appuyez sur {touches})"
                 
-                surface_serveur = tableau['polices']['secondaire'].render(
+                surface_serveur = rendre_texte(
+                    tableau['polices']['secondaire'],
                     texte_serveur,
-                    True,
                     tableau['regles']['JAUNE']
                 )
                 elements_a_dessiner.append((surface_serveur, (centre_x, tableau['regles']['TABLE_Y'] - 40)))
 
             for surface, position in elements_a_dessiner:
                 rect = surface.get_rect(center=position)
-                ecran.blit(surface, rect)
+                zones.append(ecran.blit(surface, rect))
                 
         except Exception as e:
-            logger.error(f"Erreur lors du rendu des éléments: {e}")
+            logger.error("Erreur lors du rendu des éléments: %s", e)
             
     except Exception as e:
-        logger.error(f"Erreur lors du dessin du tableau de score: {e}", exc_info=True)
+        logger.error("Erreur lors du dessin du tableau de score: %s", e, exc_info=True)
+    return zones
         
 def construire_texte_score(donnees_jeu):
     try:
@@ -85,9 +105,19 @@ def construire_texte_score(donnees_jeu):
             return "Égalité"
         return f"{donnees_jeu['score_joueur1']} - {donnees_jeu['score_joueur2']}"
     except Exception as e:
-        logger.error(f"Erreur lors de la construction du texte score: {e}", exc_info=True)
+        logger.error("Erreur lors de la construction du texte score: %s", e, exc_info=True)
         return "0 - 0"
 
+def construire_texte_statistiques(vue):
+    """Résumé de fin de match tiré de la vue des statistiques"""
+    try:
+        return (f"Plus long échange : {vue['coups_max_echange']} coups - "
+                f"séries {vue['plus_longue_serie'][0]}/{vue['plus_longue_serie'][1]} - "
+                f"au service {vue['taux_points_service'][0]:.0%}/{vue['taux_points_service'][1]:.0%}")
+    except Exception as e:
+        logger.error("Erreur lors de la construction du texte des statistiques: %s", e, exc_info=True)
+        return ""
+
 def construire_texte_service(donnees_jeu, regles):
     try:
         texte = f"Joueur {donnees_jeu['serveur_actuel']} au service"
@@ -98,14 +128,14 @@ def construire_texte_service(donnees_jeu, regles):
             texte += f" - {donnees_jeu['services_restants']} service(s) restant(s)"
         return texte
     except Exception as e:
-        logger.error(f"Erreur lors de la construction du texte service: {e}", exc_info=True)
+        logger.error("Erreur lors de la construction du texte service: %s", e, exc_info=True)
         return "Service"
 
 def formater_message_statut(message):
     try:
         return message.replace('_', ' ').title()
     except Exception as e:
-        logger.error(f"Erreur lors du formatage du message: {e}", exc_info=True)
+        logger.error("Erreur lors du formatage du message: %s", e, exc_info=True)
         return message
 
 def obtenir_couleur_statut(statut, regles):
@@ -118,7 +148,7 @@ def obtenir_couleur_statut(statut, regles):
         }
         return couleurs_statut.get(statut, regles['BLANC'])
     except Exception as e:
-        logger.error(f"Erreur lors de l'obtention de la couleur du statut: {e}", exc_info=True)
+        logger.error("Erreur lors de l'obtention de la couleur du statut: %s", e, exc_info=True)
         return regles['BLANC']
 
 def dessiner_animation_point(tableau, ecran, donnees_jeu):
@@ -126,16 +156,16 @@ def dessiner_animation_point(tableau, ecran, donnees_jeu):
         temps_actuel = pygame.time.get_ticks()
         if temps_actuel - donnees_jeu.get('temps_point_marque', 0) < 1000:
             alpha = int(255 * (1 - (temps_actuel - donnees_jeu['temps_point_marque']) / 1000))
-            surface_point = tableau['polices']['principale'].render(
+            surface_point = rendre_texte(
+                tableau['polices']['principale'],
                 "Point !",
-                True,
                 tableau['regles']['JAUNE']
-            )
+            ).copy()
             surface_point.set_alpha(alpha)
             rect_point = surface_point.get_rect(center=(tableau['largeur_ecran'] // 2, 200))
             ecran.blit(surface_point, rect_point)
     except Exception as e:
-        logger.error(f"Erreur lors du dessin de l'animation de point: {e}", exc_info=True)
+        logger.error("Erreur lors du dessin de l'animation de point: %s", e, exc_info=True)
         
 def dessiner_fin_jeu(tableau, ecran, gagnant, match_termine=False):
     try:
@@ -143,9 +173,9 @@ def dessiner_fin_jeu(tableau, ecran, gagnant, match_termine=False):
         
         message = f"Le joueur {gagnant} gagne le {'match' if match_termine else 'jeu'} !"
         
-        surface_texte = tableau['polices']['principale'].render(
+        surface_texte = rendre_texte(
+            tableau['polices']['principale'],
             message,
-            True,
             tableau['regles']['JAUNE']
         )
         elements_a_dessiner.append(
@@ -153,9 +183,9 @@ def dessiner_fin_jeu(tableau, ecran, gagnant, match_termine=False):
         )
         
         texte_redemarrer = f"Appuyez sur {pygame.key.name(tableau['regles']['CONTROLES']['REINITIALISER'])} pour redémarrer"
-        surface_redemarrer = tableau['polices']['secondaire'].render(
+        surface_redemarrer = rendre_texte(
+            tableau['polices']['secondaire'],
             texte_redemarrer,
-            True,
             tableau['regles']['BLANC']
         )
         elements_a_dessiner.append(
@@ -167,4 +197,4 @@ def dessiner_fin_jeu(tableau, ecran, gagnant, match_termine=False):
             ecran.blit(surface, rect)
             
     except Exception as e:
-        logger.error(f"Erreur lors du dessin de fin de jeu: {e}", exc_info=True)
\ No newline at end of file
+        logger.error("Erreur lors du dessin de fin de jeu: %s", e, exc_info=True)
\ No newline at end of file
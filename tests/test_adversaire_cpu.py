@@ -0,0 +1,44 @@
+import pytest
+from balle import creer_balle, deplacer
+from raquette import creer_raquette
+from adversaire_cpu import creer_adversaire_cpu, position_y_apres, piloter
+from simulation import creer_source_service_seul, simuler_match
+
+@pytest.mark.parametrize('y, dy', [(300, 7.5), (20, -11.25), (599, 3.0), (150, -18.0)])
+def test_position_forme_close_identique_a_deplacer(regles, y, dy):
+    balle = creer_balle(10, regles)
+    balle.y, balle.dx, balle.dy, balle.x = y, 0.001, dy, 400
+    balle.au_service = False
+
+    for images in range(1, 400):
+        deplacer(balle)
+        assert position_y_apres(y, dy, images, regles['HAUTEUR_FENETRE']) == pytest.approx(balle.y)
+
+def test_prediction_calculee_une_fois_par_trajectoire(regles):
+    adversaire = creer_adversaire_cpu(regles, 5)
+    raquette = creer_raquette(650, 250, regles['VITESSE_RAQUETTE'], regles=regles)
+    balle = creer_balle(10, regles)
+    balle.au_service = False
+    balle.dx, balle.dy = 10, 4
+
+    for temps in range(0, 1000, 16):
+        piloter(adversaire, raquette, balle, 1, temps)
+    assert adversaire.predictions == 1
+
+    balle.trajectoire += 1
+    piloter(adversaire, raquette, balle, 1, 1000)
+    assert adversaire.predictions == 2
+
+def test_cpu_gagne_contre_joueur_immobile(regles):
+    regles_un_jeu = {**regles, 'JEUX_POUR_GAGNER_MATCH': 1}
+    resultat = simuler_match(
+        creer_source_service_seul(regles_un_jeu),
+        graine=3,
+        regles=regles_un_jeu,
+        mode=regles['MODES_JEU']['CONTRE_CPU'],
+        niveau=regles['DIFFICULTE_MAX'],
+        images_max=200_000
+    )
+
+    assert resultat['etat_jeu']['gestionnaire_match']['gagnant_match'] == 2
+    assert any(point['coups'] > 0 for point in resultat['points'])
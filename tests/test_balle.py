@@ -19,9 +19,35 @@ def test_deplacer(mock_random, regles):
     balle['dx'] = 5
     balle['dy'] = 5
     balle['au_service'] = False
+    x, y = balle['x'], balle['y']
     
     nouvelle_balle, point_marque = deplacer(balle)
     
-    assert nouvelle_balle['x'] == balle['x'] + 5
-    assert nouvelle_balle['y'] == balle['y'] + 5
+    assert nouvelle_balle['x'] == x + 5
+    assert nouvelle_balle['y'] == y + 5
+    assert nouvelle_balle['x_precedent'] == x
     assert not point_marque
+
+def test_renvoi_depuis_le_point_de_contact(regles):
+    import math
+    from raquette import creer_raquette
+    raquette = creer_raquette(100, 200, 12)
+    zone = raquette['zone_collision']
+    balle = creer_balle(10)
+    balle['au_service'] = False
+
+    contact = (zone.right, zone.top + zone.height * 0.25)
+    gerer_collision_raquette(balle, raquette, {'point_contact': contact, 'normale': (1.0, 0.0),
+                                              'position_impact': 0.25})
+
+    assert balle['x'] == pytest.approx(zone.right + balle['rayon'])
+    assert balle['y'] == pytest.approx(contact[1])
+    assert math.hypot(balle['dx'], balle['dy']) == pytest.approx(10 * 1.25)
+
+    contact = (zone.centerx, zone.top)
+    gerer_collision_raquette(balle, raquette, {'point_contact': contact, 'normale': (0.0, -1.0),
+                                              'position_impact': 0.0})
+
+    assert balle['x'] == pytest.approx(zone.centerx)
+    assert balle['y'] == pytest.approx(zone.top - balle['rayon'])
+    assert math.hypot(balle['dx'], balle['dy']) == pytest.approx(10 * 1.5)
@@ -0,0 +1,28 @@
+import os
+import pygame
+from cache_ressources import charger_image
+
+CHEMIN_RAQUETTE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'images', 'raquette_bleue.png')
+
+def test_image_relue_depuis_le_cache(tmp_path):
+    statistiques = {'succes': 0, 'echecs': 0}
+    froide = charger_image('raquette', CHEMIN_RAQUETTE, (60, 100), retourner=True, alpha=True,
+                           dossier=str(tmp_path), statistiques=statistiques)
+    chaude = charger_image('raquette', CHEMIN_RAQUETTE, (60, 100), retourner=True, alpha=True,
+                           dossier=str(tmp_path), statistiques=statistiques)
+
+    assert statistiques == {'succes': 1, 'echecs': 1}
+    assert chaude.get_size() == (60, 100)
+    assert pygame.image.tobytes(chaude, 'RGBA') == pygame.image.tobytes(froide, 'RGBA')
+
+def test_changement_de_taille_remplace_l_entree(tmp_path):
+    charger_image('raquette', CHEMIN_RAQUETTE, (60, 100), alpha=True, dossier=str(tmp_path))
+    charger_image('raquette', CHEMIN_RAQUETTE, (30, 50), alpha=True, dossier=str(tmp_path))
+
+    entrees = os.listdir(tmp_path)
+    assert len(entrees) == 1
+    statistiques = {'succes': 0, 'echecs': 0}
+    image = charger_image('raquette', CHEMIN_RAQUETTE, (30, 50), alpha=True,
+                          dossier=str(tmp_path), statistiques=statistiques)
+    assert statistiques['succes'] == 1 and image.get_size() == (30, 50)
@@ -0,0 +1,28 @@
+import pygame
+from cache_texte import creer_cache_texte, rendre_texte, obtenir_statistiques_cache, CACHE_TEXTE
+from tableau_score import creer_tableau_score, dessiner
+
+def test_cache_lru():
+    police = pygame.font.Font(None, 24)
+    cache = creer_cache_texte(capacite=2)
+    premiere = rendre_texte(police, "a", (255, 255, 255), cache=cache)
+    rendre_texte(police, "b", (255, 255, 255), cache=cache)
+    assert rendre_texte(police, "a", (255, 255, 255), cache=cache) is premiere
+    rendre_texte(police, "c", (255, 255, 255), cache=cache)
+    rendre_texte(police, "b", (255, 255, 255), cache=cache)
+
+    statistiques = obtenir_statistiques_cache(cache)
+    assert (statistiques['succes'], statistiques['echecs'], statistiques['evictions']) == (1, 4, 2)
+    assert statistiques['taille'] == 2
+
+def test_aucun_rendu_de_police_en_cours_de_jeu(regles):
+    ecran = pygame.Surface((regles['LARGEUR_FENETRE'], regles['HAUTEUR_FENETRE']))
+    tableau = creer_tableau_score(regles['LARGEUR_FENETRE'], regles)
+    donnees = {'score_joueur1': 0, 'score_joueur2': 0, 'jeux_joueur1': 1, 'jeux_joueur2': 2,
+               'serveur_actuel': 1, 'en_service': False}
+    dessiner(tableau, ecran, donnees)
+    echecs = CACHE_TEXTE['echecs']
+
+    for score in range(1, 31):
+        dessiner(tableau, ecran, {**donnees, 'score_joueur1': score, 'score_joueur2': 30 - score})
+    assert CACHE_TEXTE['echecs'] == echecs
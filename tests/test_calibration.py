@@ -0,0 +1,38 @@
+from calibration import construire_grille, executer_balayage
+
+def test_construire_grille():
+    cellules = construire_grille([1, 10], {'VITESSE_RAQUETTE': [8, 12], 'HAUTEUR_RAQUETTE': [100]})
+
+    assert len(cellules) == 4
+    assert {'niveau': 10, 'regles': {'HAUTEUR_RAQUETTE': 100, 'VITESSE_RAQUETTE': 12}} in cellules
+
+def test_balayage_avec_cache(tmp_path):
+    fichier_cache = str(tmp_path / 'calibration.json')
+    cellules = construire_grille([5], {'VITESSE_RAQUETTE': [10]})
+
+    premier = executer_balayage(cellules, matchs=2, joueurs='service', taille_tranche=1,
+                                processus=1, fichier_cache=fichier_cache)
+    second = executer_balayage(cellules, matchs=2, joueurs='service', taille_tranche=1,
+                               processus=1, fichier_cache=fichier_cache)
+
+    assert premier['cellules_calculees'] == 1
+    assert second['cellules_calculees'] == 0
+    assert second['resultats'] == premier['resultats']
+    assert second['resultats'][0]['matchs'] == 2
+    assert second['resultats'][0]['points'] > 0
+
+def test_cache_distingue_graine_et_joueurs_cpu(tmp_path):
+    fichier_cache = str(tmp_path / 'calibration.json')
+    cellules = construire_grille([5])
+
+    premier = executer_balayage(cellules, matchs=1, joueurs='service', processus=1,
+                                fichier_cache=fichier_cache, graine_base=1)
+    autre_graine = executer_balayage(cellules, matchs=1, joueurs='service', processus=1,
+                                     fichier_cache=fichier_cache, graine_base=2)
+    cpu = executer_balayage(cellules, matchs=1, joueurs='cpu', processus=1,
+                            fichier_cache=fichier_cache, graine_base=1)
+
+    assert premier['cellules_calculees'] == 1
+    assert autre_graine['cellules_calculees'] == 1
+    assert cpu['cellules_calculees'] == 1
+    assert cpu['resultats'][0]['matchs'] == 1
@@ -0,0 +1,39 @@
+import time
+from capture_profil import creer_capture, demarrer_capture, arreter_capture, verifier_duree_capture, \
+    MODE_CPROFILE, MODE_ECHANTILLONNAGE
+
+def travailler(duree):
+    fin = time.perf_counter() + duree
+    total = 0
+    while time.perf_counter() < fin:
+        total += sum(range(100))
+    return total
+
+def lire_piles(chemin):
+    with open(chemin, encoding='utf-8') as fichier:
+        return [ligne.rsplit(' ', 1) for ligne in fichier.read().splitlines()]
+
+def test_capture_cprofile_ecrit_pstats_et_piles(regles, tmp_path):
+    capture = creer_capture(regles, dossier=str(tmp_path))
+    demarrer_capture(capture, MODE_CPROFILE)
+    travailler(0.05)
+    fichiers = arreter_capture(capture, "test")
+
+    assert [fichier.rsplit('.', 1)[-1] for fichier in fichiers] == ['pstats', 'txt']
+    piles = lire_piles(fichiers[1])
+    assert any('test_capture_profil.py:travailler' in pile for pile, _ in piles)
+    assert all(int(valeur) > 0 for _, valeur in piles)
+    assert capture['mode'] is None and arreter_capture(capture, "test") == []
+
+def test_echantillonnage_borne_dans_le_temps(regles, tmp_path):
+    capture = creer_capture({**regles, 'DUREE_CAPTURE_PROFIL': 0.1}, dossier=str(tmp_path))
+    demarrer_capture(capture, MODE_ECHANTILLONNAGE)
+    travailler(0.15)
+    verifier_duree_capture(capture)
+
+    assert capture['mode'] is None
+    fichiers = list(tmp_path.iterdir())
+    assert len(fichiers) == 1
+    piles = lire_piles(fichiers[0])
+    assert sum(int(valeur) for _, valeur in piles) > 0
+    assert any(pile.endswith('test_capture_profil.py:travailler') for pile, _ in piles)
@@ -0,0 +1,45 @@
+import logging
+from main import initialiser_objets_jeu
+from enregistreur_vol import (
+    creer_enregistreur_vol,
+    enregistrer_releve,
+    obtenir_releves,
+    attendre_vidage,
+    GestionnaireEnregistreurVol
+)
+
+def test_tampon_circulaire(regles):
+    etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MIN'], {'sons': {}, 'images': {}}, regles, graine=1)
+    enregistreur = creer_enregistreur_vol(regles, secondes=1)
+    for numero_pas in range(regles['IPS_PHYSIQUE'] + 10):
+        etat_jeu['balle'].x = numero_pas
+        enregistrer_releve(enregistreur, numero_pas, etat_jeu, numero_pas % 512)
+
+    releves = obtenir_releves(enregistreur)
+    assert len(releves) == regles['IPS_PHYSIQUE']
+    assert [releve[0] for releve in releves] == list(range(10, regles['IPS_PHYSIQUE'] + 10))
+    assert releves[-1][1] == regles['IPS_PHYSIQUE'] + 9
+    assert releves[-1][5:9] == tuple(etat_jeu['raquette_rouge'].rect)
+
+def test_vidage_sur_erreur(regles, tmp_path):
+    etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MIN'], {'sons': {}, 'images': {}}, regles, graine=1)
+    enregistreur = creer_enregistreur_vol(regles, secondes=1, dossier=str(tmp_path))
+    for numero_pas in range(5):
+        enregistrer_releve(enregistreur, numero_pas, etat_jeu, 0)
+
+    logger = logging.getLogger('tennis_table')
+    gestionnaire = GestionnaireEnregistreurVol(enregistreur)
+    logger.addHandler(gestionnaire)
+    try:
+        logger.warning("Avertissement sans vidage")
+        logger.error("Première erreur")
+        logger.error("Erreur répétée aussitôt")
+    finally:
+        logger.removeHandler(gestionnaire)
+    attendre_vidage(enregistreur)
+
+    fichiers = list(tmp_path.glob('enregistreur_vol_*.csv'))
+    assert len(fichiers) == 1
+    lignes = fichiers[0].read_text(encoding='utf-8').splitlines()
+    assert lignes[0] == "# ERROR: Première erreur"
+    assert len(lignes) == 2 + 5
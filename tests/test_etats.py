@@ -0,0 +1,27 @@
+import pytest
+from etats import copier_etat_jeu
+from raquette import creer_raquette, deplacer as deplacer_raquette
+from score import creer_score, incrementer_joueur1
+
+def test_acces_par_cle_et_attribut(regles):
+    score = creer_score(regles)
+    score['score_joueur1'] = 3
+
+    assert score.score_joueur1 == 3
+    assert 'gagnant_jeu' in score
+    with pytest.raises(KeyError):
+        score['inconnu'] = 1
+
+def test_copie_independante(regles):
+    raquette = creer_raquette(100, 200, 12, regles=regles)
+    raquette['dy'] = 5
+    etat_jeu = {'raquette_rouge': raquette, 'score': creer_score(regles), 'regles': regles}
+
+    instantane = copier_etat_jeu(etat_jeu)
+    deplacer_raquette(raquette)
+    incrementer_joueur1(etat_jeu['score'])
+
+    assert raquette['rect'].y == 205
+    assert instantane['raquette_rouge']['rect'].y == 200
+    assert instantane['score']['score_joueur1'] == 0
+    assert instantane['regles'] is regles
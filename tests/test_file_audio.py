@@ -0,0 +1,43 @@
+import os
+import pytest
+import pygame
+from balle import creer_balle, definir_file_audio, emettre_son
+from file_audio import creer_file_audio, distribuer_sons, calculer_panoramique, obtenir_taille_tampon_audio
+
+@pytest.fixture
+def file_audio(regles):
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        pytest.skip("pas de mixer audio disponible")
+    son = pygame.mixer.Sound(buffer=bytes(4096))
+    return creer_file_audio(regles, {'coup_gauche': son, 'coup_droit': son, 'service': son})
+
+def test_sons_de_la_meme_image_fusionnes(regles, file_audio):
+    balle = definir_file_audio(creer_balle(regles=regles), file_audio)
+    for _ in range(3):
+        emettre_son(balle, 'coup_gauche')
+    emettre_son(balle, 'coup_droit')
+
+    distribuer_sons(file_audio)
+    assert file_audio['evenements'] == [] and balle.evenements_audio is file_audio['evenements']
+    assert (file_audio['joues'], file_audio['fusionnes']) == (2, 2)
+    assert file_audio['canaux']['coup_gauche'].get_busy()
+
+    emettre_son(balle, 'coup_gauche')
+    distribuer_sons(file_audio)
+    assert (file_audio['joues'], file_audio['fusionnes']) == (2, 3)
+
+def test_balle_muette_sans_file_audio(regles):
+    assert creer_file_audio(regles, {}) is None
+    balle = definir_file_audio(creer_balle(regles=regles), None)
+    emettre_son(balle, 'service')
+    assert balle.evenements_audio is None
+
+def test_panoramique_et_tampon(regles):
+    gauche, droite = calculer_panoramique(0, regles['LARGEUR_FENETRE'])
+    assert gauche > droite
+    assert calculer_panoramique(regles['LARGEUR_FENETRE'] / 2, regles['LARGEUR_FENETRE'])[0] == pytest.approx(2 ** -0.5)
+    assert obtenir_taille_tampon_audio(regles, ['--tampon-audio', '256']) == 256
+    assert obtenir_taille_tampon_audio(regles, ['--tampon-audio', 'abc']) == regles['TAMPON_AUDIO']
@@ -0,0 +1,68 @@
+from main import initialiser_objets_jeu
+from simulation import creer_horloge_simulation, creer_rendu_nul, creer_source_suiveuse, executer_simulation
+from historique_matchs import (ouvrir_historique, commencer_match, fermer_historique, ouvrir_lecture,
+                               derniers_matchs, face_a_face, taux_victoire_par_niveau,
+                               connecter, initialiser_base, EcrivainHistorique)
+
+def jouer_match(regles, historique, graine, mode, niveau):
+    etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MIN'], {'sons': {}, 'images': {}}, regles, mode, niveau, graine)
+    etat_jeu['historique'] = historique
+    commencer_match(historique, graine, mode, niveau, regles['VITESSE_BALLE_MIN'])
+    etat_jeu, _, _ = executer_simulation(etat_jeu, creer_source_suiveuse(regles),
+                                         creer_horloge_simulation(regles['IPS_PHYSIQUE']), creer_rendu_nul())
+    return etat_jeu
+
+def test_matchs_ecrits_et_interroges(regles, tmp_path, monkeypatch):
+    regles_courtes = {**regles, 'POINTS_POUR_GAGNER': 3, 'DIFFERENCE_POINTS_MIN': 1, 'JEUX_POUR_GAGNER_MATCH': 2}
+    chemin = str(tmp_path / 'historique.sqlite3')
+    monkeypatch.setenv('TENNIS_TABLE_HISTORIQUE', chemin)
+    historique = ouvrir_historique()
+    simple, contre_cpu = regles['MODES_JEU']['SIMPLE'], regles['MODES_JEU']['CONTRE_CPU']
+    etats = [jouer_match(regles_courtes, historique, graine, mode, niveau)
+             for graine, mode, niveau in ((1, simple, 1), (2, contre_cpu, 3), (3, contre_cpu, 3))]
+    fermer_historique(historique)
+    assert not historique['ecrivain'].is_alive()
+
+    connexion = ouvrir_lecture()
+    matchs = derniers_matchs(connexion, 2)
+    assert [match['graine'] for match in matchs] == [3, 2]
+    assert matchs[0]['gagnant'] == etats[2]['gestionnaire_match'].gagnant_match
+
+    nombre_points = connexion.execute("SELECT COUNT(*) FROM points").fetchone()[0]
+    assert nombre_points == sum(etat['statistiques'].echanges for etat in etats)
+    assert connexion.execute("SELECT COUNT(*) FROM echanges").fetchone()[0] == nombre_points
+    assert connexion.execute("SELECT SUM(coups) FROM echanges").fetchone()[0] == \
+        sum(etat['statistiques'].coups_totaux for etat in etats)
+    jeux = connexion.execute("SELECT score_joueur1, score_joueur2 FROM jeux ORDER BY rowid").fetchall()
+    assert [tuple(jeu) for jeu in jeux] == [jeu for etat in etats for jeu in etat['gestionnaire_match'].historique_jeux]
+
+    bilan = face_a_face(connexion, mode=contre_cpu)
+    assert bilan['matchs'] == 2 and bilan['victoires_joueur1'] + bilan['victoires_joueur2'] == 2
+    assert [ligne['niveau'] for ligne in taux_victoire_par_niveau(connexion)] == [1, 3]
+    connexion.close()
+
+def test_historique_desactive(monkeypatch):
+    monkeypatch.setenv('TENNIS_TABLE_HISTORIQUE', '0')
+    assert ouvrir_historique() is None
+    assert ouvrir_lecture() is None
+    fermer_historique(None)
+
+def test_lot_refuse_reecrit_un_par_un(tmp_path):
+    chemin = str(tmp_path / 'historique.sqlite3')
+    connexion = connecter(chemin)
+    initialiser_base(connexion)
+    ecrivain = EcrivainHistorique(chemin, None)
+    lot = [
+        ('match', ('m1', 1.0, 7, 'simple', 1, 5.0)),
+        ('point', ('m1', 1, 1, 1, 1, 1, 0, 100)),
+        ('point', ('m1', 1, 1, 2, 1, 1, 1, 200)),
+        ('point', ('m1', 2, 1, 2, 1, 1, 1, 300)),
+        ('fin', (2.0, 1, 1, 0, 'm1'))
+    ]
+
+    ecrivain.ecrire_lot(connexion, lot)
+
+    assert ecrivain.enregistrements == 4
+    assert connexion.execute("SELECT COUNT(*) FROM points").fetchone()[0] == 2
+    assert connexion.execute("SELECT gagnant FROM matchs WHERE id = 'm1'").fetchone()[0] == 1
+    connexion.close()
@@ -0,0 +1,35 @@
+import pytest
+from main import initialiser_objets_jeu, mettre_a_jour_jeu
+from simulation import creer_source_suiveuse
+from instantane import capturer_instantane, restaurer_instantane, TAILLE
+
+def avancer(etat_jeu, source, debut, pas):
+    pas_ms = 1000 / etat_jeu['regles']['IPS_PHYSIQUE']
+    for numero in range(debut, debut + pas):
+        etat_jeu = mettre_a_jour_jeu(etat_jeu, source(etat_jeu, numero), round(numero * pas_ms))
+    return etat_jeu
+
+@pytest.mark.parametrize('mode', ['simple', 'contre_cpu'])
+def test_retour_en_arriere_exact(regles, mode):
+    etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MIN'], {'sons': {}, 'images': {}}, regles,
+                                      mode=mode, graine=5)
+    source = creer_source_suiveuse(regles)
+    etat_jeu = avancer(etat_jeu, source, 0, 3000)
+
+    instantane = capturer_instantane(etat_jeu)
+    etat_generateur = etat_jeu['generateur'].getstate()
+    etat_jeu = avancer(etat_jeu, source, 3000, 2000)
+    attendu = capturer_instantane(etat_jeu)
+
+    restaurer_instantane(etat_jeu, instantane)
+    etat_jeu['generateur'].setstate(etat_generateur)
+    assert capturer_instantane(etat_jeu) == instantane
+    assert capturer_instantane(avancer(etat_jeu, source, 3000, 2000)) == attendu
+
+def test_taille_fixe(regles):
+    etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MIN'], {'sons': {}, 'images': {}}, regles, graine=1)
+    etat_jeu['gestionnaire_match'].historique_jeux.extend([(11, 4), (9, 11)])
+
+    instantane = capturer_instantane(etat_jeu)
+    assert len(instantane) == TAILLE < 128
+    assert restaurer_instantane(etat_jeu, instantane)['gestionnaire_match'].historique_jeux == [(11, 4), (9, 11)]
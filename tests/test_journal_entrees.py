@@ -0,0 +1,51 @@
+from simulation import creer_touches, creer_source_suiveuse, simuler_match
+from journal_entrees import (
+    creer_journal,
+    enregistrer_pas,
+    enregistrer_evenement,
+    iterer_pas,
+    encoder_touches,
+    sauvegarder_journal,
+    charger_journal,
+    rejouer,
+    EVENEMENT_REINITIALISATION
+)
+
+def test_encodage_par_plages(regles):
+    controles = regles['CONTROLES']
+    journal = creer_journal(regles, graine=3, vitesse_balle=5)
+    entrees = [creer_touches()] * 300 + [creer_touches([controles['SERVICE']])] + \
+              [creer_touches([controles['JOUEUR1']['HAUT'], controles['JOUEUR2']['BAS']])] * 20
+    for touches in entrees[:100]:
+        enregistrer_pas(journal, touches)
+    enregistrer_evenement(journal, EVENEMENT_REINITIALISATION)
+    for touches in entrees[100:]:
+        enregistrer_pas(journal, touches)
+
+    pas = list(iterer_pas(journal))
+    masques = [encoder_touches(touches, journal['touches_journalisees']) for touches in entrees]
+    assert [masque for masque, _ in pas] == masques
+    assert [numero for numero, (_, evenements) in enumerate(pas) if evenements] == [100]
+    # 127 pas par mot au plus: 300 pas constants tiennent en quelques mots
+    assert len(journal['mots']) <= 2 * 7
+
+def test_relecture_identique_au_match(regles, tmp_path):
+    regles_un_jeu = {**regles, 'JEUX_POUR_GAGNER_MATCH': 1}
+    journal = creer_journal(regles_un_jeu, graine=21, vitesse_balle=regles['VITESSE_BALLE_MIN'])
+    source = creer_source_suiveuse(regles_un_jeu)
+
+    def source_enregistree(etat_jeu, numero_pas):
+        touches = source(etat_jeu, numero_pas)
+        enregistrer_pas(journal, touches)
+        return touches
+
+    original = simuler_match(source_enregistree, graine=21, regles=regles_un_jeu)['etat_jeu']
+    chemin = sauvegarder_journal(journal, str(tmp_path / 'match.ttj'))
+    relu = charger_journal(chemin, regles_un_jeu)
+    rejoue = rejouer(relu)['etat_jeu']
+
+    assert relu['pas'] == journal['pas']
+    assert rejoue['gestionnaire_match']['match_termine']
+    assert rejoue['gestionnaire_match']['gagnant_match'] == original['gestionnaire_match']['gagnant_match']
+    assert (rejoue['balle']['x'], rejoue['balle']['y']) == (original['balle']['x'], original['balle']['y'])
+    assert rejoue['raquette_rouge']['rect'] == original['raquette_rouge']['rect']
@@ -0,0 +1,63 @@
+import queue
+import logging
+from logging_config import obtenir_niveau_log, GestionnaireFile, FiltreErreurs, VARIABLE_NIVEAU_LOG
+
+def test_niveau_log(monkeypatch):
+    monkeypatch.delenv(VARIABLE_NIVEAU_LOG, raising=False)
+    assert obtenir_niveau_log([]) == logging.INFO
+
+    monkeypatch.setenv(VARIABLE_NIVEAU_LOG, 'debug')
+    assert obtenir_niveau_log([]) == logging.DEBUG
+    assert obtenir_niveau_log(['--log', 'WARNING']) == logging.WARNING
+    assert obtenir_niveau_log(['--log', 'inconnu']) == logging.INFO
+
+def test_message_fige_avant_mise_en_file():
+    file_logs = queue.SimpleQueue()
+    logger = logging.getLogger('test_logging_config')
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(GestionnaireFile(file_logs))
+
+    position = [1, 2]
+    logger.debug("Position %s", position)
+    position[0] = 5
+
+    assert file_logs.get_nowait().getMessage() == "Position [1, 2]"
+
+def test_erreurs_dedupliquees_et_budget():
+    temps = [0.0]
+    logger = logging.getLogger('test_filtre_erreurs')
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    file_logs = queue.SimpleQueue()
+    logger.addHandler(GestionnaireFile(file_logs))
+    filtre = FiltreErreurs(logger, budget_par_seconde=2, intervalle_resume=10, horloge=lambda: temps[0])
+    logger.addFilter(filtre)
+
+    for _ in range(60):
+        try:
+            1 / 0
+        except ZeroDivisionError as e:
+            logger.error("Erreur lors du calcul: %s", e, exc_info=True)
+    for message in ("autre", "encore", "de trop"):
+        logger.error(message)
+
+    ecrits = []
+    while not file_logs.empty():
+        ecrits.append(file_logs.get_nowait())
+    assert [record.getMessage() for record in ecrits] == ["Erreur lors du calcul: division by zero", "autre"]
+    assert ecrits[0].exc_info is not None
+
+    temps[0] = 5.0
+    filtre.publier_resume()
+    assert file_logs.empty()
+
+    temps[0] = 12.0
+    filtre.publier_resume()
+    resume = file_logs.get_nowait().getMessage()
+    assert "ZeroDivisionError" in resume and "x59" in resume
+    assert "2 rapports hors budget" in resume
+    assert not filtre.vues
+
+    logger.error("autre")
+    assert file_logs.get_nowait().getMessage() == "autre"
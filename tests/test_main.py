@@ -0,0 +1,52 @@
+import pygame
+from concurrent.futures import Future
+from main import (initialiser_objets_jeu, mettre_a_jour_jeu, dessiner_jeu, creer_rendu_partiel, dessiner_jeu_partiel,
+                  attendre_ressources, terminer_chargement_ressources)
+from simulation import creer_source_suiveuse
+
+def creer_fond(regles):
+    fond = pygame.Surface((regles['LARGEUR_FENETRE'], regles['HAUTEUR_FENETRE']))
+    for y in range(0, regles['HAUTEUR_FENETRE'], 10):
+        pygame.draw.line(fond, (y % 256, 40, 255 - y % 256), (0, y), (regles['LARGEUR_FENETRE'], y), 10)
+    return fond
+
+def test_rendu_partiel_identique_au_rendu_complet(regles):
+    ressources = {'sons': {}, 'images': {'arriere_plan': creer_fond(regles)}}
+    etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MIN'], ressources, regles, graine=3)
+    source = creer_source_suiveuse(regles)
+    taille = (regles['LARGEUR_FENETRE'], regles['HAUTEUR_FENETRE'])
+    ecran_complet, ecran_partiel = pygame.Surface(taille), pygame.Surface(taille)
+    rendu = creer_rendu_partiel()
+
+    zones = dessiner_jeu_partiel(ecran_partiel, etat_jeu, ressources, rendu)
+    assert zones[0] == ecran_partiel.get_rect()
+
+    for numero_pas in range(300):
+        etat_jeu = mettre_a_jour_jeu(etat_jeu, source(etat_jeu, numero_pas), numero_pas * 1000 // 60)
+        zones = dessiner_jeu_partiel(ecran_partiel, etat_jeu, ressources, rendu)
+        if numero_pas % 50 == 0:
+            dessiner_jeu(ecran_complet, etat_jeu, ressources)
+            assert pygame.image.tobytes(ecran_partiel, 'RGB') == pygame.image.tobytes(ecran_complet, 'RGB')
+
+    assert sum(zone.width * zone.height for zone in zones) < taille[0] * taille[1] // 4
+
+def test_initialisation_attend_les_ressources_en_cours_de_chargement(regles):
+    image = pygame.Surface((regles['LARGEUR_RAQUETTE'], regles['HAUTEUR_RAQUETTE']))
+    ressources = {'sons': {}, 'images': {'raquette_rouge': image}}
+    assert attendre_ressources(ressources) is ressources
+
+    chargement = Future()
+    chargement.set_result(ressources)
+    etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MIN'], chargement, regles, graine=1)
+    assert etat_jeu['raquette_rouge'].image is image
+
+def test_fermeture_annule_ou_attend_le_chargement():
+    en_attente = Future()
+    assert terminer_chargement_ressources(en_attente) is None
+    assert en_attente.cancelled()
+
+    ressources = {'sons': {}, 'images': {}}
+    en_cours = Future()
+    en_cours.set_running_or_notify_cancel()
+    en_cours.set_result(ressources)
+    assert terminer_chargement_ressources(en_cours) is ressources
@@ -0,0 +1,55 @@
+import pytest
+from pas_fixe import (creer_accumulateur, accumuler, avancer_pas, facteur_interpolation, capturer_positions,
+                      creer_dessin, interpoler_etat)
+from main import initialiser_objets_jeu
+from simulation import creer_source_suiveuse, simuler_match
+
+def test_accumuler():
+    accumulateur = creer_accumulateur(60, pas_max_par_image=5)
+    accumulateur, nombre_pas = accumuler(accumulateur, 40)
+    for _ in range(nombre_pas):
+        accumulateur = avancer_pas(accumulateur)
+
+    assert nombre_pas == 2
+    assert facteur_interpolation(accumulateur) == pytest.approx(0.4)
+
+    suivant, nombre_pas = accumuler(accumulateur, 1000)
+    assert nombre_pas == 5
+    assert suivant is accumulateur
+
+def test_etat_dessin_reutilise(regles):
+    etat_jeu = initialiser_objets_jeu(regles['VITESSE_BALLE_MIN'], {'sons': {}, 'images': {}}, regles, graine=1)
+    etat_jeu['balle'].au_service = False
+    precedent = capturer_positions(etat_jeu)
+    etat_jeu['balle'].x += 10
+    etat_jeu['raquette_rouge'].rect.y += 8
+    dessin = creer_dessin()
+
+    premier = interpoler_etat(precedent, etat_jeu, 0.5, dessin)
+    balle_dessinee, raquette_dessinee = premier['balle'], premier['raquette_rouge']
+    assert balle_dessinee.x == etat_jeu['balle'].x - 5
+    assert raquette_dessinee.rect.y == etat_jeu['raquette_rouge'].rect.y - 4
+    assert raquette_dessinee.rect is not etat_jeu['raquette_rouge'].rect
+
+    second = interpoler_etat(precedent, etat_jeu, 1.0, dessin)
+    assert second is premier
+    assert second['balle'] is balle_dessinee and second['raquette_rouge'] is raquette_dessinee
+    assert balle_dessinee.x == etat_jeu['balle'].x
+    assert raquette_dessinee.rect.y == etat_jeu['raquette_rouge'].rect.y
+
+def simuler_a_cadence(regles, ips_rendu):
+    return simuler_match(creer_source_suiveuse(regles), graine=7, regles=regles, ips_rendu=ips_rendu)
+
+def test_resultat_independant_de_la_cadence_affichage(regles):
+    regles_un_jeu = {**regles, 'JEUX_POUR_GAGNER_MATCH': 1}
+    resultats = [simuler_a_cadence(regles_un_jeu, ips_rendu) for ips_rendu in (30, 60, 120, 240)]
+    reference = resultats[0]
+
+    for resultat in resultats:
+        assert resultat['pas_physiques'] == reference['pas_physiques']
+        assert resultat['points'] == reference['points']
+        assert (resultat['etat_jeu']['gestionnaire_match']['historique_jeux'] ==
+                reference['etat_jeu']['gestionnaire_match']['historique_jeux'])
+        assert resultat['etat_jeu']['balle']['x'] == reference['etat_jeu']['balle']['x']
+        assert resultat['etat_jeu']['balle']['y'] == reference['etat_jeu']['balle']['y']
+    assert resultats[-1]['images'] == pytest.approx(8 * reference['images'], rel=0.01)
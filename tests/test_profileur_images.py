@@ -0,0 +1,28 @@
+import pygame
+from array import array
+from profileur_images import (creer_profileur, marquer, terminer_image, centile, index_case,
+                              dessiner_hud, obtenir_resume, NOMBRE_CASES, RAISON_CASES, PHASES)
+
+def test_centiles_de_l_histogramme():
+    histogramme = array('Q', bytes(8 * NOMBRE_CASES))
+    for microsecondes in range(1, 101):
+        histogramme[index_case(microsecondes / 1e6)] += 1
+    assert 48e-6 <= centile(histogramme, 0.5) <= 50e-6 * RAISON_CASES ** 2
+    assert 98e-6 <= centile(histogramme, 0.99) <= 99e-6 * RAISON_CASES ** 2
+    assert index_case(1e6) == NOMBRE_CASES - 1
+
+def test_phases_rangees_a_chaque_image(regles):
+    profileur = creer_profileur(regles)
+    for _ in range(10):
+        marquer(profileur, 'evenements')
+        marquer(profileur, 'entree')
+        terminer_image(profileur)
+
+    assert profileur['images'] == 10
+    assert all(sum(profileur['histogrammes'][phase]) == 10 for phase in PHASES)
+    assert set(obtenir_resume(profileur)) == set(PHASES) | {'image'}
+
+    ecran = pygame.Surface((regles['LARGEUR_FENETRE'], regles['HAUTEUR_FENETRE']))
+    assert dessiner_hud(profileur, ecran) is None
+    profileur['affiche'] = True
+    assert dessiner_hud(profileur, ecran).topleft == (0, 0)
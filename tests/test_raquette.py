@@ -1,5 +1,6 @@
 import pytest
 from raquette import creer_raquette, deplacer as deplacer_raquette, definir_velocite
+from balle import creer_balle
 
 def test_creer_raquette(regles):
     x, y = 100, 200
@@ -18,4 +19,74 @@ def test_deplacer_raquette(regles):
     nouvelle_raquette = deplacer_raquette(raquette)
     
     assert nouvelle_raquette['rect'].x == 105
-    assert nouvelle_raquette['rect'].y == 205
\ No newline at end of file
+    assert nouvelle_raquette['rect'].y == 205
+
+def test_collision_balle_rapide_ne_traverse_pas(regles):
+    from raquette import verifier_collision_balle
+    raquette = creer_raquette(100, 200, 12)
+    zone = raquette['zone_collision']
+    balle = creer_balle(10).copier(
+        x=zone.right + 100,
+        y=zone.centery,
+        x_precedent=zone.left - 100,
+        y_precedent=zone.centery
+    )
+
+    collision, impact = verifier_collision_balle(raquette, balle, 10_000)
+
+    assert collision
+    assert impact['x'] == pytest.approx(zone.left - balle['rayon'])
+    assert impact['position_impact'] == pytest.approx(0.5, abs=0.02)
+
+def test_collision_balle_eloignee(regles):
+    from raquette import verifier_collision_balle
+    raquette = creer_raquette(100, 200, 12)
+    balle = creer_balle(10).copier(x=400, y=100, x_precedent=380, y_precedent=100)
+
+    assert verifier_collision_balle(raquette, balle, 10_000) == (False, None)
+
+def test_raquette_immobile_meme_temps_que_le_calcul_general(regles):
+    import random
+    from raquette import verifier_collision_balle, calculer_temps_impact
+    raquette = creer_raquette(100, 200, 12)
+    zone = raquette['zone_collision']
+    generateur = random.Random(0)
+    touches = 0
+    for _ in range(500):
+        x_debut = generateur.uniform(zone.left - 60, zone.right + 60)
+        y_debut = generateur.uniform(zone.top - 60, zone.bottom + 60)
+        balle = creer_balle(10).copier(
+            x=x_debut + generateur.uniform(-40, 40),
+            y=y_debut + generateur.uniform(-40, 40),
+            x_precedent=x_debut,
+            y_precedent=y_debut
+        )
+        ax, ay = x_debut - zone.x, y_debut - zone.y
+        attendu = calculer_temps_impact(ax, ay, balle['x'] - x_debut, balle['y'] - y_debut,
+                                        zone.width, zone.height, balle['rayon'])
+
+        collision, impact = verifier_collision_balle(raquette, balle, 10_000)
+
+        assert collision == (attendu is not None)
+        if collision:
+            touches += 1
+            assert impact['temps'] == pytest.approx(attendu)
+    assert touches > 50
+
+def test_repli_par_sous_pas_sans_solution_analytique(regles):
+    from raquette import verifier_collision_balle
+    raquette = creer_raquette(100, 200, 12)
+    zone = raquette['zone_collision']
+    # Instant de rebond hors du pas: le trajet ne se découpe pas en segments linéaires
+    balle = creer_balle(10).copier(
+        x=zone.left - 60,
+        y=zone.centery,
+        x_precedent=zone.right + 60,
+        y_precedent=zone.centery,
+        fraction_rebond=-0.5
+    )
+
+    collision, impact = verifier_collision_balle(raquette, balle, 10_000)
+
+    assert collision
+    assert zone.right <= impact['x'] <= zone.right + balle['rayon']
@@ -0,0 +1,33 @@
+import pygame
+from selecteur_difficulte import creer_selecteur_difficulte, gerer_evenement, obtenir_etat_affiche, dessiner
+
+def deplacer_poignee(selecteur, x):
+    selecteur = gerer_evenement(selecteur, pygame.event.Event(
+        pygame.MOUSEBUTTONDOWN, button=1, pos=(selecteur['poignee_x'], selecteur['poignee_y'])))
+    selecteur = gerer_evenement(selecteur, pygame.event.Event(
+        pygame.MOUSEMOTION, pos=(x, selecteur['poignee_y']), rel=(0, 0), buttons=(1, 0, 0)))
+    return gerer_evenement(selecteur, pygame.event.Event(
+        pygame.MOUSEBUTTONUP, button=1, pos=(x, selecteur['poignee_y'])))
+
+def test_redessin_partiel_identique_au_dessin_complet(regles):
+    taille = (regles['LARGEUR_FENETRE'], regles['HAUTEUR_FENETRE'])
+    selecteur = creer_selecteur_difficulte(*taille)
+    ecran = pygame.Surface(taille)
+    assert dessiner(selecteur, ecran) == [ecran.get_rect()]
+
+    affiche = obtenir_etat_affiche(selecteur)
+    selecteur = deplacer_poignee(selecteur, selecteur['curseur_x'] + selecteur['largeur_curseur'] * 2 // 3)
+    selecteur = gerer_evenement(selecteur, pygame.event.Event(pygame.KEYDOWN, key=pygame.K_TAB))
+    assert obtenir_etat_affiche(selecteur) != affiche
+    assert dessiner(selecteur, ecran) == [selecteur['zone_dynamique']]
+
+    reference = pygame.Surface(taille)
+    dessiner({**selecteur, 'cle_statique': None}, reference)
+    assert pygame.image.tobytes(ecran, 'RGB') == pygame.image.tobytes(reference, 'RGB')
+
+def test_etat_affiche_inchange_sans_effet(regles):
+    selecteur = creer_selecteur_difficulte(regles['LARGEUR_FENETRE'], regles['HAUTEUR_FENETRE'])
+    affiche = obtenir_etat_affiche(selecteur)
+    selecteur = gerer_evenement(selecteur, pygame.event.Event(
+        pygame.MOUSEMOTION, pos=(10, 10), rel=(0, 0), buttons=(0, 0, 0)))
+    assert obtenir_etat_affiche(selecteur) == affiche
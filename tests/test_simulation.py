@@ -0,0 +1,36 @@
+from simulation import (
+    creer_horloge_simulation,
+    avancer_horloge,
+    obtenir_temps,
+    creer_source_service_seul,
+    creer_source_suiveuse,
+    simuler_match
+)
+
+def test_horloge_simulation():
+    horloge = creer_horloge_simulation(60)
+    for _ in range(60):
+        horloge = avancer_horloge(horloge)
+
+    assert horloge['images'] == 60
+    assert obtenir_temps(horloge) == 1000
+
+def test_simuler_match(regles):
+    resultat = simuler_match(creer_source_service_seul(regles), graine=42)
+    gestionnaire_match = resultat['etat_jeu']['gestionnaire_match']
+
+    assert gestionnaire_match['match_termine']
+    assert gestionnaire_match['gagnant_match'] in (1, 2)
+    assert resultat['images'] > 0
+    assert resultat['images_par_seconde'] > regles['IPS']
+
+def test_match_rejouable_depuis_sa_graine(regles):
+    regles_un_jeu = {**regles, 'JEUX_POUR_GAGNER_MATCH': 1}
+    premier, second, autre = (
+        simuler_match(creer_source_suiveuse(regles_un_jeu), graine=graine, regles=regles_un_jeu)
+        for graine in (11, 11, 12)
+    )
+
+    assert premier['points'] == second['points']
+    assert premier['etat_jeu']['balle']['x'] == second['etat_jeu']['balle']['x']
+    assert premier['points'] != autre['points']
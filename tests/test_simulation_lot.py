@@ -0,0 +1,85 @@
+import math
+import numpy as np
+import pytest
+from balle import creer_balle
+from raquette import creer_raquette, definir_velocite, deplacer as deplacer_raquette
+from main import gerer_balle
+from simulation_lot import creer_lot, servir_lot, avancer_lot, GAUCHE, DROITE
+
+TIRAGE = 0.25
+
+class GenerateurFixe:
+    def random(self, nombre):
+        return np.full(nombre, TIRAGE)
+
+    def uniform(self, bas, haut):
+        return bas + (haut - bas) * TIRAGE
+
+def creer_echanges(regles, nombre, graine):
+    generateur = np.random.default_rng(graine)
+    angles = generateur.uniform(-math.pi, math.pi, nombre)
+    vitesses = generateur.uniform(regles['VITESSE_BALLE_MIN'], regles['VITESSE_BALLE_MAX'], nombre)
+    return {
+        'x': generateur.uniform(100, 700, nombre),
+        'y': generateur.uniform(0, regles['HAUTEUR_FENETRE'], nombre),
+        'dx': np.cos(angles) * vitesses,
+        'dy': np.sin(angles) * vitesses,
+        'vitesse': vitesses,
+        'raquette_y': generateur.integers(0, regles['HAUTEUR_FENETRE'] - regles['HAUTEUR_RAQUETTE'], (2, nombre)),
+        'direction_x': generateur.integers(-1, 2, (2, nombre)),
+        'direction_y': generateur.integers(-1, 2, (2, nombre))
+    }
+
+def test_equivalence_avec_chemin_scalaire(regles):
+    nombre, images = 48, 240
+    echanges = creer_echanges(regles, nombre, graine=3)
+
+    lot = creer_lot(nombre, regles=regles)
+    lot['generateur'] = GenerateurFixe()
+    for cle in ('x', 'y', 'dx', 'dy', 'vitesse', 'raquette_y'):
+        lot[cle][...] = echanges[cle]
+    lot['raquette_dx'][...] = echanges['direction_x'] * regles['VITESSE_RAQUETTE']
+    lot['raquette_dy'][...] = echanges['direction_y'] * regles['VITESSE_RAQUETTE']
+    lot['active'][...] = True
+
+    for i in range(nombre):
+        balle = creer_balle(echanges['vitesse'][i], generateur=GenerateurFixe())
+        balle.update({'x': echanges['x'][i], 'y': echanges['y'][i],
+                      'dx': echanges['dx'][i], 'dy': echanges['dy'][i], 'au_service': False})
+        raquettes = []
+        for cote in (GAUCHE, DROITE):
+            raquette = creer_raquette(int(lot['raquette_x'][cote][i]), int(echanges['raquette_y'][cote][i]),
+                                      regles['VITESSE_RAQUETTE'])
+            raquettes.append(definir_velocite(raquette, echanges['direction_x'][cote][i],
+                                              echanges['direction_y'][cote][i]))
+        echanges.setdefault('scalaires', []).append([balle, *raquettes])
+
+    for image in range(images):
+        temps_actuel = image * 1000 / regles['IPS']
+        avancer_lot(lot, temps_actuel)
+        for i, (balle, raquette_rouge, raquette_bleue) in enumerate(echanges['scalaires']):
+            if not balle['active']:
+                continue
+            balle, point_marque, raquette_rouge, raquette_bleue = gerer_balle(
+                balle, deplacer_raquette(raquette_rouge), deplacer_raquette(raquette_bleue),
+                False, temps_actuel, None)
+            echanges['scalaires'][i] = [balle, raquette_rouge, raquette_bleue]
+
+            assert lot['active'][i] == (not point_marque)
+            assert lot['x'][i] == pytest.approx(balle['x'], abs=1e-9)
+            assert lot['y'][i] == pytest.approx(balle['y'], abs=1e-9)
+            assert lot['dx'][i] == pytest.approx(balle['dx'], abs=1e-9)
+            assert lot['dy'][i] == pytest.approx(balle['dy'], abs=1e-9)
+            assert lot['raquette_y'][GAUCHE][i] == raquette_rouge['rect'].y
+            assert lot['raquette_x'][DROITE][i] == raquette_bleue['rect'].x
+
+    assert lot['coups'].sum() > 0
+    assert not lot['active'].all()
+
+def test_lot_de_cent_mille_echanges(regles):
+    lot = servir_lot(creer_lot(100_000, regles=regles, graine=1), serveurs=1)
+    for image in range(10):
+        avancer_lot(lot, image * 1000 / regles['IPS'])
+
+    assert lot['active'].all()
+    assert np.all((lot['y'] >= 0) & (lot['y'] <= regles['HAUTEUR_FENETRE']))
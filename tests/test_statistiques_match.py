@@ -0,0 +1,43 @@
+from statistiques_match import (creer_statistiques_match, enregistrer_service, enregistrer_coup, enregistrer_point,
+                                reinitialiser_statistiques, obtenir_vue_statistiques)
+from balle import creer_balle
+from simulation import simuler_match, creer_source_suiveuse
+
+def test_echange_et_series(regles):
+    statistiques = creer_statistiques_match(regles)
+    balle = creer_balle(regles=regles)
+    balle.dx, balle.dy = 3.0, 4.0
+
+    enregistrer_service(statistiques, balle, 1, 1000)
+    balle.dx = 6.0
+    enregistrer_coup(statistiques, balle)
+    enregistrer_coup(statistiques, balle)
+    enregistrer_point(statistiques, 1, 4000)
+    enregistrer_service(statistiques, balle, 1, 5000)
+    enregistrer_point(statistiques, 2, 6000)
+
+    vue = obtenir_vue_statistiques(statistiques)
+    assert vue['echanges'] == 2
+    assert vue['duree_max_echange'] == 3000 and vue['duree_moyenne_echange'] == 2000
+    assert vue['coups_max_echange'] == 2 and vue['coups_moyens_echange'] == 1
+    assert vue['vitesse_max'] == (6.0 ** 2 + 4.0 ** 2) ** 0.5
+    assert vue['points_servis'] == (2, 0) and vue['points_gagnes_service'] == (1, 0)
+    assert vue['taux_points_service'] == (0.5, 0.0)
+    assert vue['plus_longue_serie'] == (1, 1) and vue['serie_en_cours'] == (2, 1)
+
+    reinitialiser_statistiques(statistiques)
+    assert obtenir_vue_statistiques(statistiques)['echanges'] == 0
+    assert statistiques.points_gagnes == [0, 0]
+
+def test_statistiques_coherentes_avec_le_releve_du_match(regles):
+    resultat = simuler_match(creer_source_suiveuse(regles), graine=3, regles=regles)
+    statistiques = resultat['etat_jeu']['statistiques']
+    vue = obtenir_vue_statistiques(statistiques)
+    points = resultat['points']
+
+    assert vue['echanges'] == len(points)
+    assert vue['coups_max_echange'] == max(point['coups'] for point in points)
+    assert statistiques.coups_totaux == sum(point['coups'] for point in points)
+    assert vue['points_gagnes'] == tuple(sum(point['gagnant'] == joueur for point in points) for joueur in (1, 2))
+    assert sum(vue['points_servis']) == len(points)
+    assert vue['points_gagnes_service'][0] == sum(point['gagnant'] == point['serveur'] == 1 for point in points)
@@ -0,0 +1,32 @@
+import tracemalloc
+from suivi_memoire import creer_suivi_memoire, verifier_suivi_memoire, arreter_suivi_memoire, FENETRE_CROISSANCE
+from endurance import executer_endurance
+
+def test_croissance_continue_signalee_avec_son_site():
+    instant = [0.0]
+    suivi = creer_suivi_memoire(10.0, horloge=lambda: instant[0])
+    retenus = []
+    try:
+        verifier_suivi_memoire(suivi)
+        assert not suivi['releves']
+        for _ in range(FENETRE_CROISSANCE + 1):
+            retenus.append(bytearray(100 * 1024))
+            instant[0] += 10.0
+            verifier_suivi_memoire(suivi)
+
+        assert len(suivi['releves']) == FENETRE_CROISSANCE + 1
+        assert suivi['croissance_signalee']
+        assert all(releve['delta'] >= 90 * 1024 for releve in list(suivi['releves'])[1:])
+        site, taille, _ = suivi['releves'][-1]['variations'][0]
+        assert 'test_suivi_memoire.py' in site and taille >= 100 * 1024
+    finally:
+        arreter_suivi_memoire(suivi)
+    assert not tracemalloc.is_tracing()
+
+def test_endurance_memoire_bornee(regles):
+    regles_courtes = {**regles, 'POINTS_POUR_GAGNER': 3, 'DIFFERENCE_POINTS_MIN': 1, 'JEUX_POUR_GAGNER_MATCH': 1}
+    resultat = executer_endurance(60, regles=regles_courtes, matchs_max=6)
+
+    assert resultat['matchs'] == 6
+    assert resultat['bornee']
+    assert len(resultat['releves']) == 6